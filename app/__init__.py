@@ -7,8 +7,6 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_mail import Mail
 from flask_wtf.csrf import CSRFProtect
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from flask_talisman import Talisman
 from dotenv import load_dotenv
 import os
@@ -21,73 +19,137 @@ db = SQLAlchemy()
 login_manager = LoginManager()
 mail = Mail()
 csrf = CSRFProtect()
-limiter = None  # Disable rate limiting
 talisman = Talisman()
 
 
 def create_app():
-    """Create and configure the Flask application."""
-    app = Flask(__name__)
-    
-    # Load secure configuration
-    from app.config import Config
-    app.config.from_object(Config)
-    
-    # Initialize extensions with app
-    db.init_app(app)
-    login_manager.init_app(app)
-    login_manager.login_view = 'auth.login'
-    login_manager.session_protection = 'strong'  # Enhanced session protection
-    mail.init_app(app)
-    csrf.init_app(app)
-    # limiter.init_app(app)  # Disabled rate limiting
+    """
+    Create and configure the Flask application.
 
-    # Make csrf_token available in all templates for manual forms
-    @app.context_processor
-    def inject_csrf_token():
-        from flask_wtf.csrf import generate_csrf
-        return dict(csrf_token=generate_csrf)
-    
-    # Initialize Talisman with security headers
-    if app.config.get('TALISMAN_FORCE_HTTPS'):
-        talisman.init_app(
-            app,
-            force_https=True,
-            strict_transport_security=True,
-            strict_transport_security_max_age=31536000,
-            content_security_policy=app.config.get('TALISMAN_CONTENT_SECURITY_POLICY'),
-            content_security_policy_nonce_in=['script-src'],
-            feature_policy={
-                'geolocation': "'none'",
-                'camera': "'none'",
-                'microphone': "'none'"
-            }
-        )
-    
-    # Register blueprints
-    from app.routes.auth import auth_bp
-    from app.routes.main import main_bp
-    from app.routes.grants import grants_bp
-    from app.routes.admin import admin_bp
-    from app.routes.settings import settings_bp
-    from app.routes.prices import prices_bp
-    
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(main_bp)
-    app.register_blueprint(grants_bp)
-    app.register_blueprint(admin_bp)
-    app.register_blueprint(settings_bp)
-    app.register_blueprint(prices_bp)
-    
-    # Register error handlers
-    register_error_handlers(app)
-    
-    # Create database tables
+    Safe to call once in a pre-forking parent (gunicorn --preload): connection
+    pools and log pipeline threads are re-created in each worker after fork.
+    With BOOTSTRAP_ON_STARTUP=False the schema and admin user are left to
+    ``flask bootstrap``, so booting a worker does no database writes.
+    """
+    from app.utils.startup import StartupTimer
+    timer = StartupTimer()
+    
+    with timer.phase('config'):
+        app = Flask(__name__)
+        
+        # Load secure configuration
+        from app.config import Config
+        app.config.from_object(Config)
+        
+        # Pool sizing and pre-ping strategy from the DB_POOL_* settings
+        from app.utils.db_pool import engine_options, instrument_engine
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+        
+        # Behind a reverse proxy (Heroku router, nginx) take the client IP and
+        # scheme from the trusted X-Forwarded-* hops, so rate limits, audit
+        # logs and the metrics allow-list see real clients
+        if app.config.get('PROXY_FIX_X_FOR') or app.config.get('PROXY_FIX_X_PROTO'):
+            from werkzeug.middleware.proxy_fix import ProxyFix
+            app.wsgi_app = ProxyFix(app.wsgi_app,
+                                    x_for=app.config.get('PROXY_FIX_X_FOR', 0),
+                                    x_proto=app.config.get('PROXY_FIX_X_PROTO', 0))
+    
+    with timer.phase('extensions'):
+        # Initialize extensions with app
+        db.init_app(app)
+        login_manager.init_app(app)
+        login_manager.login_view = 'auth.login'
+        login_manager.session_protection = 'strong'  # Enhanced session protection
+        mail.init_app(app)
+        csrf.init_app(app)
+
+        # Make csrf_token available in all templates for manual forms
+        @app.context_processor
+        def inject_csrf_token():
+            from flask_wtf.csrf import generate_csrf
+            return dict(csrf_token=generate_csrf)
+        
+        # Initialize Talisman with security headers
+        if app.config.get('TALISMAN_FORCE_HTTPS'):
+            talisman.init_app(
+                app,
+                force_https=True,
+                strict_transport_security=True,
+                strict_transport_security_max_age=31536000,
+                content_security_policy=app.config.get('TALISMAN_CONTENT_SECURITY_POLICY'),
+                content_security_policy_nonce_in=['script-src'],
+                feature_policy={
+                    'geolocation': "'none'",
+                    'camera': "'none'",
+                    'microphone': "'none'"
+                }
+            )
+    
+        # Registered before every other after_request hook so it runs last
+        from app.utils.compression import init_compression
+        init_compression(app)
+    
+    with timer.phase('blueprints'):
+        # Register blueprints
+        from app.routes.auth import auth_bp
+        from app.routes.main import main_bp
+        from app.routes.grants import grants_bp
+        from app.routes.admin import admin_bp
+        from app.routes.settings import settings_bp
+        from app.routes.prices import prices_bp
+        from app.routes.api import api_bp
+        from app.routes.assets import assets_bp
+        
+        app.register_blueprint(auth_bp)
+        app.register_blueprint(main_bp)
+        app.register_blueprint(grants_bp)
+        app.register_blueprint(admin_bp)
+        app.register_blueprint(settings_bp)
+        app.register_blueprint(prices_bp)
+        app.register_blueprint(api_bp)
+        app.register_blueprint(assets_bp)
+        
+        # asset_url() for fingerprinted CSS/JS (flask build-assets)
+        from app.utils.assets import init_assets
+        init_assets(app)
+    
+    with timer.phase('logging'):
+        # Audit/security log files behind a non-blocking queue
+        from app.utils.audit_log import init_audit_logging
+        init_audit_logging(app)
+        
+        # Register error handlers
+        register_error_handlers(app)
+    
+    with timer.phase('cli and model events'):
+        # Maintenance CLI commands (flask bootstrap, flask migrate-indexes, ...)
+        from app.cli import register_commands
+        register_commands(app)
+        
+        # Invalidate per-user caches when grants, vest events or tax profiles change
+        from app.utils.cache import register_model_events
+        register_model_events()
+    
     with app.app_context():
-        db.create_all()
-        from app.models.user import User
-        from app.utils.init_db import init_admin_user
-        init_admin_user()
+        with timer.phase('database engine'):
+            from app.utils.sqlite_tuning import configure_sqlite_engine
+            from app.utils.db_pool import dispose_after_fork
+            configure_sqlite_engine(app, db.engine)
+            instrument_engine(app.config, db.engine)
+            dispose_after_fork(db.engine)
+            from app.utils.request_profiler import init_request_profiling
+            init_request_profiling(app, db.engine)
+            from app.utils.metrics import init_metrics
+            init_metrics(app, db.engine)
+        
+        if app.config.get('BOOTSTRAP_ON_STARTUP'):
+            with timer.phase('schema and admin user'):
+                from app.utils.init_db import bootstrap_database
+                bootstrap_database()
+    
+    app.extensions['startup_timing'] = timer.as_dict()
+    if app.config.get('STARTUP_REPORT'):
+        timer.print_report()
     
     return app
 
@@ -114,12 +176,30 @@ def register_error_handlers(app):
     @app.errorhandler(429)
     def rate_limit_exceeded(e):
         AuditLogger.log_security_event('RATE_LIMIT_EXCEEDED', {'error': str(e)})
-        return render_template('errors/429.html'), 429
+        response = app.make_response((render_template('errors/429.html'), 429))
+        if getattr(e, 'retry_after', None) is not None:
+            response.headers['Retry-After'] = str(e.retry_after)
+        return response
+    
+    from app.utils.hashing import HashingOverloaded
+    
+    @app.errorhandler(HashingOverloaded)
+    def hashing_overloaded(e):
+        AuditLogger.log_security_event('PASSWORD_HASHING_OVERLOADED', {'reason': e.reason})
+        response = app.make_response((render_template('errors/503.html'), 503))
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
 
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user by ID for Flask-Login."""
+    """Load user by ID for Flask-Login (hot fields cached per worker when USER_CACHE_TTL > 0)."""
+    from flask import current_app
     from app.models.user import User
+    
+    ttl = current_app.config.get('USER_CACHE_TTL', 0)
+    if ttl > 0:
+        from app.utils.user_cache import load_cached_user
+        return load_cached_user(int(user_id), ttl)
     return User.query.get(int(user_id))
 
@@ -0,0 +1,173 @@
+"""
+Flask CLI commands for maintenance tasks.
+
+Usage:
+    flask --app main bootstrap
+    flask --app main build-assets
+    flask --app main migrate-indexes
+    flask --app main migrate-vest-event-user-id
+    flask --app main migrate-vest-event-updated-at
+    flask --app main explain-queries [--user admin] [--allow stock_prices]
+    flask --app main import-grants grants.csv [--user alice]
+"""
+
+import sys
+
+import click
+
+
+def register_commands(app):
+    """Attach maintenance commands to ``app.cli``."""
+
+    @app.cli.command('bootstrap')
+    def bootstrap_command():
+        """Create missing tables and the admin user (run once per deploy)."""
+        from app.utils.init_db import bootstrap_database
+
+        result = bootstrap_database()
+        for name in result['tables_created']:
+            click.echo(f"✓ Created table {name}")
+        if not result['tables_created']:
+            click.echo("✓ All tables already exist")
+        for name in result['columns_added']:
+            click.echo(f"✓ Added column {name}")
+        click.echo("✓ Created admin user" if result['admin_created'] else "✓ Admin user already exists")
+
+    @app.cli.command('build-assets')
+    def build_assets_command():
+        """Write fingerprinted, precompressed CSS/JS and the asset manifest."""
+        from app.utils.assets import brotli, build_assets, build_dir_for
+
+        build_dir = build_dir_for(app)
+        built = build_assets(app.static_folder, build_dir)
+        for source, info in built.items():
+            sizes = f"{info['bytes']:,} B, gzip {info['gzip_bytes']:,} B"
+            if info['br_bytes'] is not None:
+                sizes += f", br {info['br_bytes']:,} B"
+            click.echo(f"✓ {source} -> {info['file']} ({sizes})")
+        if brotli is None:
+            click.echo("  (brotli not installed: .br files skipped)")
+        click.echo(f"✓ Wrote manifest to {build_dir}")
+
+    @app.cli.command('startup-report')
+    def startup_report_command():
+        """Print how long each create_app phase took in this process."""
+        timing = app.extensions.get('startup_timing', {})
+        for phase in timing.get('phases', []):
+            click.echo(f"{phase['phase']:<24} {phase['seconds'] * 1000:8.1f} ms")
+        click.echo(f"{'total':<24} {timing.get('total_seconds', 0) * 1000:8.1f} ms")
+
+    @app.cli.command('migrate-indexes')
+    def migrate_indexes_command():
+        """Create composite indexes missing from an existing database."""
+        from app.utils.migrate_indexes import upgrade_indexes
+
+        created = upgrade_indexes()
+        for name in created:
+            click.echo(f"✓ Created index {name}")
+        if not created:
+            click.echo("✓ All indexes already exist")
+
+    @app.cli.command('migrate-vest-event-user-id')
+    def migrate_vest_event_user_id_command():
+        """Add and backfill the denormalized vest_events.user_id column."""
+        from app.utils.migrate_vest_event_user_id import upgrade_vest_event_user_id
+
+        result = upgrade_vest_event_user_id()
+        if result['column_added']:
+            click.echo("✓ Added vest_events.user_id column")
+        click.echo(f"✓ Backfilled user_id on {result['rows_backfilled']} vest events")
+        for name in result['indexes_created']:
+            click.echo(f"✓ Created index {name}")
+
+    @app.cli.command('migrate-vest-event-updated-at')
+    def migrate_vest_event_updated_at_command():
+        """Add and backfill the vest_events.updated_at row version."""
+        from app.utils.migrate_vest_event_updated_at import upgrade_vest_event_updated_at
+
+        result = upgrade_vest_event_updated_at()
+        if result['column_added']:
+            click.echo("✓ Added vest_events.updated_at column")
+        click.echo(f"✓ Backfilled updated_at on {result['rows_backfilled']} vest events")
+
+    @app.cli.command('explain-queries')
+    @click.option('--user', 'username', default=None,
+                  help='User to replay routes as (defaults to ADMIN_USERNAME).')
+    @click.option('--endpoint', 'endpoints', multiple=True,
+                  help='Only audit these endpoints (repeatable).')
+    @click.option('--allow', 'allowed', multiple=True,
+                  help='Table allowed to be scanned in full (repeatable).')
+    @click.option('--verbose', '-v', is_flag=True, help='Print every statement and plan.')
+    def explain_queries_command(username, endpoints, allowed, verbose):
+        """Run EXPLAIN on the queries issued by each route and flag full scans.
+
+        Exits with status 1 when a route scans a table that is not allowed,
+        so it can gate a deploy.
+        """
+        import os
+        from app.models.user import User
+        from app.utils.query_audit import audit_routes, flagged_scans
+
+        username = username or os.getenv('ADMIN_USERNAME', 'admin')
+        user = User.query.filter_by(username=username).first()
+        if not user:
+            raise click.ClickException(f'User {username!r} not found')
+
+        report = audit_routes(app, user, endpoints)
+        allowed = set(allowed)
+
+        for route in report:
+            scans = [t for s in route['statements'] for t in s['full_scans'] if t not in allowed]
+            marker = '⚠️ ' if scans else '✓ '
+            click.echo(f"{marker}{route['endpoint']:<32} {route['url']:<40} "
+                       f"HTTP {route['status']}  {route['query_count']} queries")
+            for statement in route['statements']:
+                scanned = [t for t in statement['full_scans'] if t not in allowed]
+                if not (verbose or scanned):
+                    continue
+                sql = ' '.join(statement['sql'].split())
+                click.echo(f"    {sql[:160]}{'...' if len(sql) > 160 else ''}")
+                for line in statement['plan']:
+                    click.echo(f"        {line}")
+
+        flagged = flagged_scans(report, allowed)
+        click.echo('')
+        if flagged:
+            tables = sorted({table for _, table, _ in flagged})
+            click.echo(f"⚠️  {len(flagged)} full scan(s) on: {', '.join(tables)}")
+            sys.exit(1)
+        click.echo(f"✓ No unexpected full scans across {len(report)} routes")
+
+    @app.cli.command('import-grants')
+    @click.argument('csv_file', type=click.File('r', encoding='utf-8-sig'))
+    @click.option('--user', 'username', default=None,
+                  help='Owner of every grant (default: each row\'s username column).')
+    @click.option('--chunk-size', default=1000, show_default=True,
+                  help='Grants inserted per transaction.')
+    def import_grants_command(csv_file, username, chunk_size):
+        """Bulk import grants and their vest schedules from a CSV file."""
+        from app.models.user import User
+        from app.utils.audit_log import AuditLogger
+        from app.utils.grant_import import RowError, import_grants
+
+        user_id = None
+        if username:
+            user = User.query.filter_by(username=username).first()
+            if not user:
+                raise click.ClickException(f'User {username!r} not found')
+            user_id = user.id
+
+        try:
+            report = import_grants(csv_file, user_id=user_id, chunk_size=chunk_size)
+        except RowError as e:
+            raise click.ClickException(str(e))
+        AuditLogger.log_grants_imported(user_id, report['grants_imported'], report['rejected_count'])
+
+        click.echo(f"✓ Imported {report['grants_imported']} grants, "
+                   f"{report['vest_events_created']} vest events in {report['chunks']} chunk(s)")
+        click.echo(f"  {report['rows_read']} rows in {report['seconds']:.2f}s "
+                   f"({report['rows_per_second']:,.0f} rows/s, {report['distinct_schedules']} distinct schedules)")
+        if report['rejected_count']:
+            click.echo(f"⚠️  {report['rejected_count']} row(s) rejected:")
+            for item in report['rejected']:
+                click.echo(f"    line {item['line']}: {item['error']}")
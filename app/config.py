@@ -28,16 +28,36 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///stonks.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,  # Verify connections before using
-        'pool_recycle': 300,     # Recycle connections every 5 minutes
-    }
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # Built from the DB_POOL_* settings in create_app
+    
+    # Connection pool, per gunicorn worker (see app/utils/db_pool.py)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))    # whole seconds to wait for a connection
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 300))   # recycle connections every 5 minutes
+    DB_PRE_PING = os.getenv('DB_PRE_PING', 'always')           # always, idle or never
+    DB_PRE_PING_IDLE = float(os.getenv('DB_PRE_PING_IDLE', 30))  # seconds idle before an 'idle' ping
+    
+    # SQLite connection profile: 'default' or 'concurrent' (WAL + tuned pragmas
+    # for several workers sharing one file, see app/utils/sqlite_tuning.py)
+    SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'default')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -64000))  # negative = KiB
+    SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))  # milliseconds
+    
+    # Shared cache version counters (defaults to <instance>/versions)
+    CACHE_VERSION_DIR = os.getenv('CACHE_VERSION_DIR')
+    
+    # Sale planner request budget, counted from the start of the request; once spent
+    # the best plan found so far is returned as truncated (0 = unlimited)
+    SALE_PLANNER_BUDGET_MS = float(os.getenv('SALE_PLANNER_BUDGET_MS', 250))
     
     # Session Security
     SESSION_COOKIE_SECURE = os.getenv('FLASK_ENV') == 'production'  # HTTPS only in prod
     SESSION_COOKIE_HTTPONLY = True  # Prevent JavaScript access
     SESSION_COOKIE_SAMESITE = 'Lax'  # CSRF protection
     PERMANENT_SESSION_LIFETIME = 3600  # 1 hour session timeout
+    USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', 30))  # seconds a worker reuses a session user's row (0 = query every request)
     
     # Remember Me Cookie Security
     REMEMBER_COOKIE_SECURE = os.getenv('FLASK_ENV') == 'production'
@@ -49,11 +69,19 @@ class Config:
     WTF_CSRF_TIME_LIMIT = 3600  # 1 hour
     WTF_CSRF_SSL_STRICT = os.getenv('FLASK_ENV') == 'production'
     
-    # Rate Limiting
-    RATELIMIT_ENABLED = True
-    RATELIMIT_STORAGE_URL = os.getenv('REDIS_URL', 'memory://')
-    RATELIMIT_STRATEGY = 'fixed-window'
-    RATELIMIT_HEADERS_ENABLED = True
+    # Reverse proxy: number of trusted proxy hops setting X-Forwarded-For/-Proto
+    # (1 on Heroku or behind a single nginx; 0 when gunicorn faces clients directly)
+    PROXY_FIX_X_FOR = int(os.getenv('PROXY_FIX_X_FOR', 0))
+    PROXY_FIX_X_PROTO = int(os.getenv('PROXY_FIX_X_PROTO', os.getenv('PROXY_FIX_X_FOR', 0)))
+    
+    # Rate Limiting (token buckets shared by all workers, see app/utils/rate_limit.py)
+    RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'True') == 'True'
+    RATELIMIT_DB_PATH = os.getenv('RATELIMIT_DB_PATH')  # defaults to <instance>/ratelimit.db
+    RATELIMIT_HEADERS_ENABLED = True  # X-RateLimit-Limit/Remaining on limited routes
+    RATELIMIT_LOGIN = os.getenv('RATELIMIT_LOGIN', '10 per minute')  # login/register/reset POSTs per client IP
+    RATELIMIT_HEAVY_USER = os.getenv('RATELIMIT_HEAVY_USER', '30 per minute')  # planners/deep dive per user
+    RATELIMIT_HEAVY_IP = os.getenv('RATELIMIT_HEAVY_IP', '60 per minute')  # planners/deep dive per client IP
+    RATELIMIT_PREVIEW = os.getenv('RATELIMIT_PREVIEW', '120 per minute')  # tax rate previews per user
     
     # Security Headers (Flask-Talisman)
     TALISMAN_FORCE_HTTPS = os.getenv('FLASK_ENV') == 'production'
@@ -61,8 +89,8 @@ class Config:
     TALISMAN_STRICT_TRANSPORT_SECURITY_MAX_AGE = 31536000  # 1 year
     TALISMAN_CONTENT_SECURITY_POLICY = {
         'default-src': "'self'",
-        'script-src': ["'self'", "'unsafe-inline'"],  # TODO: Remove unsafe-inline
-        'style-src': ["'self'", "'unsafe-inline'"],   # TODO: Remove unsafe-inline
+        'script-src': ["'self'", 'https://cdn.jsdelivr.net'],  # page scripts are /assets/ bundles; Chart.js from CDN
+        'style-src': ["'self'", "'unsafe-inline'"],   # TODO: Remove unsafe-inline (style="" attributes remain)
         'img-src': ["'self'", 'data:', 'https:'],
         'font-src': ["'self'", 'data:'],
         'connect-src': "'self'",
@@ -87,6 +115,15 @@ class Config:
     PASSWORD_REQUIRE_SPECIAL = True
     PASSWORD_MAX_LENGTH = 128
     
+    # Password hashing pool (see app/utils/hashing.py)
+    HASH_MAX_CONCURRENCY = int(os.getenv('HASH_MAX_CONCURRENCY', 2))  # hashes running at once per worker
+    HASH_QUEUE_DEPTH = int(os.getenv('HASH_QUEUE_DEPTH', 8))  # waiting hashes per worker before 503
+    HASH_TIMEOUT = float(os.getenv('HASH_TIMEOUT', 10))  # seconds before a queued hash gives up
+    # Hashes at once across all workers (0 = no limit). Sync workers hash one
+    # password at a time, so only this cap keeps a login burst off every worker
+    HASH_GLOBAL_SLOTS = int(os.getenv('HASH_GLOBAL_SLOTS', max(1, int(os.getenv('WEB_CONCURRENCY', 4)) // 2)))
+    HASH_SLOT_DIR = os.getenv('HASH_SLOT_DIR')  # defaults to <instance>/hash_slots
+    
     # File Upload Security (if needed in future)
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload
     ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg'}
@@ -94,6 +131,47 @@ class Config:
     # Audit Logging
     AUDIT_LOG_FILE = os.getenv('AUDIT_LOG_FILE', 'logs/audit.log')
     SECURITY_LOG_FILE = os.getenv('SECURITY_LOG_FILE', 'logs/security.log')
+    AUDIT_LOG_MAX_BYTES = int(os.getenv('AUDIT_LOG_MAX_BYTES', 50 * 1024 * 1024))  # rotate at 50 MB
+    AUDIT_LOG_BACKUP_COUNT = int(os.getenv('AUDIT_LOG_BACKUP_COUNT', 10))
+    AUDIT_LOG_QUEUE_SIZE = int(os.getenv('AUDIT_LOG_QUEUE_SIZE', 10000))  # records buffered per logger
+    AUDIT_LOG_OVERFLOW = os.getenv('AUDIT_LOG_OVERFLOW', 'drop_new')  # drop_new or drop_oldest when full
+    AUDIT_LOG_BATCH_SIZE = int(os.getenv('AUDIT_LOG_BATCH_SIZE', 256))  # records per write
+    AUDIT_DB_ENABLED = os.getenv('AUDIT_DB_ENABLED', 'True') == 'True'  # searchable event store
+    AUDIT_DB_PATH = os.getenv('AUDIT_DB_PATH')  # defaults to <instance>/audit.db
+    
+    # Request profiling (SQL/template timing, Server-Timing header, /admin/slow-routes)
+    PROFILE_REQUESTS = os.getenv('PROFILE_REQUESTS', 'False') == 'True'
+    PROFILE_SLOW_REQUESTS = int(os.getenv('PROFILE_SLOW_REQUESTS', 50))  # slowest requests kept per worker
+    
+    # Prometheus metrics at /metrics, aggregated across workers through METRICS_DIR
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+    METRICS_DIR = os.getenv('METRICS_DIR')  # defaults to <instance>/metrics
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))  # seconds between worker snapshots
+    # Client IPs allowed to scrape (empty = any, token required). Behind a same-host
+    # proxy every client looks like 127.0.0.1, so set METRICS_TOKEN there
+    METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()]
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # bearer token required from scrapers when set
+    
+    # Static assets: fingerprinted, precompressed bundles served from /assets/
+    ASSETS_BUILD_DIR = os.getenv('ASSETS_BUILD_DIR')  # defaults to app/static/dist (flask build-assets)
+    ASSETS_MAX_AGE = int(os.getenv('ASSETS_MAX_AGE', 31536000))  # 1 year; URLs change with content
+    
+    # Private HTTP caching of per-user pages (ETag/304, see app/utils/http_cache.py)
+    APP_RELEASE = os.getenv('APP_RELEASE')  # deploy id in page ETags; defaults to a template/static fingerprint
+    
+    # Response compression for HTML/JSON (see app/utils/compression.py)
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True') == 'True'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 500))  # bytes; smaller bodies go out as-is
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))  # gzip level 1-9
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', 4))  # brotli quality 0-11 (needs the brotli package)
+    COMPRESS_BROTLI = os.getenv('COMPRESS_BROTLI', 'True') == 'True'
+    COMPRESS_MIMETYPES = ['text/html', 'text/plain', 'text/css', 'text/javascript',
+                          'application/javascript', 'application/json', 'image/svg+xml']
+    
+    # Startup: create tables and the admin user in create_app (set False and run
+    # `flask bootstrap` once per deploy when workers are preloaded/recycled)
+    BOOTSTRAP_ON_STARTUP = os.getenv('BOOTSTRAP_ON_STARTUP', 'True') == 'True'
+    STARTUP_REPORT = os.getenv('STARTUP_REPORT', 'False') == 'True'  # print phase timings to stderr
     
     # Development/Production Flags
     DEBUG = os.getenv('FLASK_ENV') != 'production'
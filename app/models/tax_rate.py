@@ -10,6 +10,10 @@ class TaxBracket(db.Model):
     """Tax bracket information for federal and state taxes."""
     
     __tablename__ = 'tax_brackets'
+    __table_args__ = (
+        # Matches the bracket lookup: one schedule, ordered by income floor
+        db.Index('ix_tax_brackets_schedule', 'jurisdiction', 'tax_year', 'filing_status', 'tax_type', 'income_min'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -101,19 +105,8 @@ class UserTaxProfile(db.Model):
         }
     
     def _get_rate_for_income(self, jurisdiction: str, tax_type: str, tax_year: int) -> float:
-        """Find the tax rate for the given income level."""
-        bracket = TaxBracket.query.filter_by(
-            jurisdiction=jurisdiction,
-            tax_year=tax_year,
-            filing_status=self.filing_status,
-            tax_type=tax_type
-        ).filter(
-            TaxBracket.income_min <= self.annual_income
-        ).filter(
-            db.or_(
-                TaxBracket.income_max >= self.annual_income,
-                TaxBracket.income_max.is_(None)
-            )
-        ).first()
+        """Find the marginal tax rate for the given income level."""
+        from app.utils.tax_tables import get_bracket_table
         
-        return bracket.rate if bracket else 0.0
+        table = get_bracket_table(jurisdiction, tax_year, self.filing_status, tax_type)
+        return table.marginal_rate(self.annual_income) if table else 0.0
@@ -4,6 +4,7 @@ Enhanced with security features for account protection.
 """
 
 from app import db
+from app.utils.hashing import run_hash
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
@@ -58,12 +59,12 @@ class User(UserMixin, db.Model):
         Hash and set the user's password.
         Also updates last_password_change timestamp.
         """
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256:600000')
+        self.password_hash = run_hash('hash', generate_password_hash, password, 'pbkdf2:sha256:600000')
         self.last_password_change = datetime.utcnow()
     
     def check_password(self, password: str) -> bool:
         """Check if provided password matches the hash."""
-        return check_password_hash(self.password_hash, password)
+        return run_hash('check', check_password_hash, self.password_hash, password)
     
     def is_account_locked(self) -> bool:
         """Check if account is currently locked."""
@@ -83,26 +84,26 @@ class User(UserMixin, db.Model):
     def generate_password_reset_token(self) -> str:
         """Generate a secure password reset token."""
         token = secrets.token_urlsafe(32)
-        self.password_reset_token = generate_password_hash(token)
+        self.password_reset_token = run_hash('hash', generate_password_hash, token)
         return token
     
     def verify_password_reset_token(self, token: str) -> bool:
         """Verify password reset token."""
         if not self.password_reset_token:
             return False
-        return check_password_hash(self.password_reset_token, token)
+        return run_hash('check', check_password_hash, self.password_reset_token, token)
     
     def generate_email_verification_token(self) -> str:
         """Generate a secure email verification token."""
         token = secrets.token_urlsafe(32)
-        self.email_verification_token = generate_password_hash(token)
+        self.email_verification_token = run_hash('hash', generate_password_hash, token)
         return token
     
     def verify_email_token(self, token: str) -> bool:
         """Verify email verification token."""
         if not self.email_verification_token:
             return False
-        return check_password_hash(self.email_verification_token, token)
+        return run_hash('check', check_password_hash, self.email_verification_token, token)
     
     def generate_totp_secret(self) -> str:
         """Generate TOTP secret for 2FA."""
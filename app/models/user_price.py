@@ -4,6 +4,9 @@ from datetime import datetime
 
 class UserPrice(db.Model):
     __tablename__ = 'user_prices'
+    __table_args__ = (
+        db.Index('ix_user_prices_user_id_valuation_date', 'user_id', 'valuation_date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
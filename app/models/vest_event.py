@@ -4,15 +4,25 @@ Vest event model for tracking individual vesting events.
 
 from app import db
 from datetime import datetime, date
+from sqlalchemy import event
 
 
 class VestEvent(db.Model):
     """Individual vesting event for a grant."""
     
     __tablename__ = 'vest_events'
+    __table_args__ = (
+        # Per-grant schedules are always read in vest_date order
+        db.Index('ix_vest_events_grant_id_vest_date', 'grant_id', 'vest_date'),
+        # Per-user schedules: single-table range scan already in vest_date order
+        db.Index('ix_vest_events_user_id_vest_date', 'user_id', 'vest_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     grant_id = db.Column(db.Integer, db.ForeignKey('grants.id'), nullable=False, index=True)
+    # Denormalized from grants.user_id so per-user queries skip the join.
+    # Set automatically on insert (see _set_user_id below).
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     
     # Vest details
     vest_date = db.Column(db.Date, nullable=False)
@@ -37,6 +47,9 @@ class VestEvent(db.Model):
     vested_at = db.Column(db.DateTime, nullable=True)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Row version for cached table rows (grants.render_vest_rows); add to
+    # existing databases with `flask migrate-vest-event-updated-at`
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def __repr__(self) -> str:
         return f'<VestEvent {self.vest_date} - {self.shares_vested} shares>'
@@ -213,3 +226,13 @@ class VestEvent(db.Model):
             'is_estimated': True,
             'tax_rate': estimated_rate
         }
+
+
+@event.listens_for(VestEvent, 'before_insert')
+def _set_user_id(mapper, connection, target):
+    """Copy the owning grant's user_id onto new vest events that lack one."""
+    if target.user_id is None and target.grant_id is not None:
+        from app.models.grant import Grant
+        target.user_id = connection.scalar(
+            db.select(Grant.user_id).where(Grant.id == target.grant_id)
+        )
@@ -4,10 +4,12 @@ Admin routes - manage stock prices, view users.
 
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
-from functools import wraps
+from functools import partial, wraps
 from app import db
 from app.models.stock_price import StockPrice
 from app.models.user import User
+from app.utils.init_db import invalidate_stock_prices
+from app.utils.audit_log import AuditLogger
 from datetime import datetime
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -69,6 +71,7 @@ def add_stock_price():
         
         db.session.add(stock_price)
         db.session.commit()
+        invalidate_stock_prices()
         flash('Stock price added successfully', 'success')
         
     except Exception as e:
@@ -78,6 +81,56 @@ def add_stock_price():
     return redirect(url_for('admin.stock_prices'))
 
 
+@admin_bp.route('/stock-prices/import', methods=['POST'])
+@admin_required
+def import_stock_prices():
+    """
+    Bulk upsert stock prices from an uploaded CSV/JSON file or a JSON body.
+
+    JSON requests get the import report as JSON; form uploads are redirected
+    back to the price page with a summary.
+    """
+    from app.utils.price_import import import_stock_prices as upsert_prices
+
+    if request.is_json:
+        text, fmt = request.get_data(as_text=True), 'json'
+    else:
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash('Choose a CSV or JSON file to import', 'error')
+            return redirect(url_for('admin.stock_prices'))
+        fmt = 'json' if upload.filename.lower().endswith('.json') else 'csv'
+        try:
+            text = upload.read().decode('utf-8-sig')
+        except UnicodeDecodeError:
+            flash('File must be UTF-8 encoded', 'error')
+            return redirect(url_for('admin.stock_prices'))
+
+    try:
+        report = upsert_prices(text, fmt, user_id=current_user.id)
+    except ValueError as e:
+        if request.is_json:
+            return jsonify({'error': str(e)}), 400
+        flash(f'Could not import prices: {e}', 'error')
+        return redirect(url_for('admin.stock_prices'))
+
+    AuditLogger.log_admin_action('STOCK_PRICES_IMPORTED', {
+        'inserted': report['inserted'],
+        'updated': report['updated'],
+        'rejected_count': report['rejected_count']
+    })
+
+    if request.is_json:
+        return jsonify(report)
+
+    flash(f"Imported prices: {report['inserted']} added, {report['updated']} updated, "
+          f"{report['rejected_count']} rejected",
+          'success' if not report['rejected_count'] else 'warning')
+    for item in report['rejected'][:10]:
+        flash(f"Row {item['row']}: {item['error']}", 'error')
+    return redirect(url_for('admin.stock_prices'))
+
+
 @admin_bp.route('/stock-prices/<int:price_id>/delete', methods=['POST'])
 @admin_required
 def delete_stock_price(price_id):
@@ -85,6 +138,7 @@ def delete_stock_price(price_id):
     price = StockPrice.query.get_or_404(price_id)
     db.session.delete(price)
     db.session.commit()
+    invalidate_stock_prices()
     flash('Stock price deleted', 'success')
     return redirect(url_for('admin.stock_prices'))
 
@@ -109,3 +163,123 @@ def users():
     """View all users."""
     all_users = User.query.order_by(User.created_at.desc()).all()
     return render_template('admin/users.html', users=all_users)
+
+
+@admin_bp.route('/pool-stats')
+@admin_required
+def pool_stats():
+    """Connection pool state and metrics for the worker serving this request."""
+    import os
+    from app.utils.db_pool import pool_stats as get_pool_stats
+
+    stats = get_pool_stats(db.engine)
+    stats['worker_pid'] = os.getpid()
+    return jsonify(stats)
+
+
+@admin_bp.route('/export/<string:kind>')
+@admin_required
+def export_all(kind):
+    """Stream every user's vest schedule or deep dive rows as CSV or NDJSON."""
+    from datetime import date
+    from app.utils.export import (ADMIN_FIELDS, DEEP_DIVE_FIELDS, EXPORT_FORMATS, SCHEDULE_FIELDS,
+                                  deep_dive_row, export_response, iter_vest_events, schedule_row)
+
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    today = date.today()
+    if kind == 'schedule':
+        fields = ADMIN_FIELDS + SCHEDULE_FIELDS
+        make_row = partial(schedule_row, today=today)
+    elif kind == 'finance-deep-dive':
+        fields = ADMIN_FIELDS + DEEP_DIVE_FIELDS
+        make_row = partial(deep_dive_row, today=today, latest_stock_price=0.0)
+    else:
+        return jsonify({'error': 'kind must be schedule or finance-deep-dive'}), 404
+
+    usernames = dict(db.session.query(User.id, User.username).all())
+
+    def rows():
+        for ve in iter_vest_events():
+            row = make_row(ve)
+            row['user_id'] = ve.user_id
+            row['username'] = usernames.get(ve.user_id)
+            yield row
+
+    AuditLogger.log_admin_action('EXPORT_ALL_VEST_EVENTS', {'kind': kind, 'format': fmt})
+    return export_response(rows(), fields, fmt, f'all_users_{kind.replace("-", "_")}')
+
+
+@admin_bp.route('/log-stats')
+@admin_required
+def log_stats():
+    """Audit/security log pipeline counters for the worker serving this request."""
+    import os
+    from app.utils.log_pipeline import pipeline_stats
+
+    return jsonify({'worker_pid': os.getpid(), 'pipelines': pipeline_stats()})
+
+
+@admin_bp.route('/slow-routes')
+@admin_required
+def slow_routes():
+    """Slowest routes and requests recorded by the request profiler (this worker)."""
+    import os
+    from flask import current_app
+    from app.utils.request_profiler import route_stats
+
+    report = route_stats.report(limit=request.args.get('limit', 20, type=int))
+    report['worker_pid'] = os.getpid()
+    report['enabled'] = current_app.config.get('PROFILE_REQUESTS', False)
+
+    if request.args.get('format') == 'json':
+        return jsonify(report)
+    return render_template('admin/slow_routes.html', **report)
+
+
+@admin_bp.route('/audit')
+@admin_required
+def audit_events():
+    """Search the audit event store, newest first, with keyset pagination."""
+    from flask import current_app
+    from app.utils.audit_store import DEFAULT_PAGE_SIZE, audit_db_path, event_types, search_events
+
+    path = audit_db_path(current_app)
+    filters = {
+        'event_type': request.args.get('event_type', '').strip(),
+        'username': request.args.get('username', '').strip(),
+        'ip_address': request.args.get('ip_address', '').strip(),
+        'since': request.args.get('since', '').strip(),
+        'until': request.args.get('until', '').strip()
+    }
+
+    # Match the account's id as well as the username: events logged before
+    # login (failed logins, lockouts) only record the username
+    user_id = None
+    if filters['username']:
+        user = User.query.filter_by(username=filters['username']).first()
+        user_id = user.id if user else None
+
+    page = search_events(
+        path,
+        event_type=filters['event_type'] or None,
+        user_id=user_id,
+        username=filters['username'] or None,
+        ip_address=filters['ip_address'] or None,
+        since=filters['since'] or None,
+        until=filters['until'] or None,
+        before_id=request.args.get('before', type=int),
+        limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    )
+
+    if request.args.get('format') == 'json':
+        return jsonify(page)
+
+    return render_template('admin/audit.html',
+                         events=page['events'],
+                         next_before_id=page['next_before_id'],
+                         filters=filters,
+                         event_types=event_types(path),
+                         enabled=current_app.config.get('AUDIT_DB_ENABLED'))
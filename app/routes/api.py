@@ -0,0 +1,30 @@
+"""
+Versioned JSON API - dashboard data for the web page, scripts and mobile clients.
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+from flask_login import login_required, current_user
+from app.utils.dashboard import API_VERSION, SECTIONS, get_dashboard_json
+from app.utils.decorators import private_etag
+
+api_bp = Blueprint('api', __name__, url_prefix=f'/api/v{API_VERSION}')
+
+
+@api_bp.route('/dashboard')
+@login_required
+@private_etag
+def dashboard():
+    """
+    Dashboard summary, upcoming vests and timeline.
+
+    ?include=summary,upcoming_vests,timeline selects sections (default: all).
+    """
+    include = request.args.get('include')
+    sections = [s.strip() for s in include.split(',')] if include else list(SECTIONS)
+    unknown = [s for s in sections if s not in SECTIONS]
+    if unknown:
+        return jsonify({'error': f"unknown section(s): {', '.join(unknown)}",
+                        'sections': list(SECTIONS)}), 400
+
+    return current_app.response_class(get_dashboard_json(current_user.id, sections),
+                                      mimetype='application/json')
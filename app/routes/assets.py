@@ -0,0 +1,27 @@
+"""
+Fingerprinted static assets (see app/utils/assets.py).
+"""
+
+from flask import Blueprint, abort, current_app, request, send_file
+from app.utils.assets import get_manifest, mimetype_for, pick_encoding
+
+assets_bp = Blueprint('assets', __name__, url_prefix='/assets')
+
+
+@assets_bp.route('/<path:filename>')
+def asset(filename):
+    """Serve a fingerprinted asset, precompressed when the client accepts it."""
+    path = get_manifest().resolve(filename)
+    if path is None:
+        abort(404)
+    
+    send_path, encoding = pick_encoding(path, request.accept_encodings)
+    response = send_file(send_path, mimetype=mimetype_for(filename), conditional=True,
+                         max_age=current_app.config.get('ASSETS_MAX_AGE', 31536000))
+    # The URL changes with the content, so the file never needs revalidating
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
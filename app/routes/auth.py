@@ -9,6 +9,7 @@ from app import db
 from app.models.user import User
 from app.utils.password_security import validate_password
 from app.utils.audit_log import AuditLogger
+from app.utils.decorators import rate_limit_user
 from werkzeug.security import generate_password_hash
 import secrets
 from datetime import datetime, timedelta
@@ -18,6 +19,7 @@ auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
+@rate_limit_user('RATELIMIT_LOGIN', scope='auth', methods=('POST',))
 def login():
     """User login page with security hardening."""
     if current_user.is_authenticated:
@@ -80,6 +82,7 @@ def login():
 
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
+@rate_limit_user('RATELIMIT_LOGIN', scope='auth', methods=('POST',))
 def register():
     """User registration page with enhanced validation."""
     if current_user.is_authenticated:
@@ -202,6 +205,7 @@ def forgot_password():
 
 
 @auth_bp.route('/reset-password/<token>', methods=['GET', 'POST'])
+@rate_limit_user('RATELIMIT_LOGIN', scope='auth', methods=('POST',))
 def reset_password(token):
     """Password reset confirmation page."""
     if current_user.is_authenticated:
@@ -2,7 +2,7 @@
 Grant management routes - view, add, edit, delete grants.
 """
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app
 from flask_login import login_required, current_user
 from app import db
 from app.models.grant import Grant, GrantType, ShareType
@@ -10,16 +10,70 @@ from app.models.vest_event import VestEvent
 from app.models.stock_price import StockPrice
 from app.utils.vest_calculator import calculate_vest_schedule, get_grant_configuration
 from app.models.tax_rate import UserTaxProfile
+from app.utils.init_db import get_latest_stock_price
+from app.utils.sale_planner import collect_sale_lots, build_tax_function, plan_sale
+from app.utils.iso_planner import DEFAULT_CURVE_POINTS, ExercisePlanner, collect_iso_lots
+from app.utils.tax_projection import project_taxes
+from app.utils.cache import STOCK_PRICES_VERSION, VersionedCache, get_version, user_stamp
+from app.utils.audit_log import AuditLogger
+from app.utils.decorators import private_etag, rate_limit_user
+from app.utils.grant_import import RowError, import_grants
+from app.utils.export import (DEEP_DIVE_FIELDS, EXPORT_FORMATS, SCHEDULE_FIELDS, deep_dive_row,
+                              export_response, iter_vest_events, schedule_row, vest_event_analysis)
 from datetime import datetime, date, timedelta
+import io
 import logging
+import time
 
 logging.basicConfig(level=logging.DEBUG)
 
 grants_bp = Blueprint('grants', __name__, url_prefix='/grants')
 
+# Per-user ISO planner inputs, reused across slider round-trips until the
+# user's grants, tax profile or stock prices change
+iso_planner_cache = VersionedCache('iso_planner', maxsize=512)
+
+# Per-user multi-year tax projections, invalidated the same way
+tax_projection_cache = VersionedCache('tax_projection', maxsize=512)
+
+# Rendered vest-event table rows (grants/_vest_row.html, grants/_schedule_row.html)
+vest_row_cache = VersionedCache('vest_rows', maxsize=20000)
+
+
+def render_vest_rows(template_name, vest_events):
+    """
+    Render one row template per vest event, reusing cached fragments.
+
+    A row depends on its vest event, its grant, the stock price index and
+    today's date (vested/pending). Each row is keyed on its own version
+    (VestEvent.updated_at, bumped on every update; editing a grant recreates
+    its vest events), so saving one event re-renders only that row. The
+    price version and date are part of the stamp so every row refreshes when
+    prices change and status badges roll over at midnight.
+
+    Returns:
+        list: Markup fragments in ``vest_events`` order
+    """
+    from markupsafe import Markup
+
+    stamp = (get_version(STOCK_PRICES_VERSION), date.today())
+    template = None
+    rows = []
+    for vest in vest_events:
+        key = (template_name, vest.id, vest.updated_at)
+        html = vest_row_cache.get(key, stamp)
+        if html is None:
+            if template is None:
+                template = current_app.jinja_env.get_template(template_name)
+            html = Markup(template.render(vest=vest))
+            vest_row_cache.set(key, stamp, html)
+        rows.append(html)
+    return rows
+
 
 @grants_bp.route('/')
 @login_required
+@private_etag
 def list_grants():
     """List all user grants."""
     grants = Grant.query.filter_by(user_id=current_user.id).order_by(Grant.grant_date.desc()).all()
@@ -82,6 +136,7 @@ def add_grant():
             for vest in vest_schedule:
                 vest_event = VestEvent(
                     grant_id=grant.id,
+                    user_id=grant.user_id,
                     vest_date=vest['vest_date'],
                     shares_vested=vest['shares']
                 )
@@ -100,6 +155,36 @@ def add_grant():
                          share_types=ShareType)
 
 
+@grants_bp.route('/import', methods=['GET', 'POST'])
+@login_required
+def import_grants_csv():
+    """Bulk import grants from an uploaded CSV file."""
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash('Choose a CSV file to import', 'error')
+            return redirect(url_for('grants.import_grants_csv'))
+
+        lines = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        try:
+            report = import_grants(lines, user_id=current_user.id)
+        except (RowError, UnicodeDecodeError) as e:
+            flash(f'Could not import file: {e}', 'error')
+            return redirect(url_for('grants.import_grants_csv'))
+        except Exception as e:
+            current_app.logger.exception('Grant import failed')
+            flash(f'Error importing grants: {str(e)}', 'error')
+            return redirect(url_for('grants.import_grants_csv'))
+
+        AuditLogger.log_grants_imported(current_user.id, report['grants_imported'], report['rejected_count'])
+        flash(f"Imported {report['grants_imported']} grants "
+              f"({report['rejected_count']} rows rejected)",
+              'success' if report['grants_imported'] else 'warning')
+
+    return render_template('grants/import.html', report=report)
+
+
 @grants_bp.route('/<int:grant_id>')
 @login_required
 def view_grant(grant_id):
@@ -112,8 +197,9 @@ def view_grant(grant_id):
         return redirect(url_for('grants.list_grants'))
     
     vest_events = VestEvent.query.filter_by(grant_id=grant.id).order_by(VestEvent.vest_date).all()
+    vest_rows = render_vest_rows('grants/_vest_row.html', vest_events)
     
-    return render_template('grants/view.html', grant=grant, vest_events=vest_events)
+    return render_template('grants/view.html', grant=grant, vest_events=vest_events, vest_rows=vest_rows)
 
 
 @grants_bp.route('/<int:grant_id>/delete', methods=['POST'])
@@ -194,6 +280,7 @@ def edit_grant(grant_id):
             for vest in vest_schedule:
                 vest_event = VestEvent(
                     grant_id=grant.id,
+                    user_id=grant.user_id,
                     vest_date=vest['vest_date'],
                     shares_vested=vest['shares']
                 )
@@ -259,13 +346,48 @@ def update_vest_event(event_id):
 
 @grants_bp.route('/schedule')
 @login_required
+@private_etag
 def vest_schedule():
     """View complete vesting schedule."""
-    vest_events = VestEvent.query.join(Grant).filter(
-        Grant.user_id == current_user.id
+    vest_events = VestEvent.query.filter(
+        VestEvent.user_id == current_user.id
     ).order_by(VestEvent.vest_date).all()
+    vest_rows = render_vest_rows('grants/_schedule_row.html', vest_events)
     
-    return render_template('grants/schedule.html', vest_events=vest_events)
+    return render_template('grants/schedule.html', vest_events=vest_events, vest_rows=vest_rows)
+
+
+def _export_format():
+    """Requested export format (?format=csv|ndjson), or None if unsupported."""
+    fmt = request.args.get('format', 'csv').lower()
+    return fmt if fmt in EXPORT_FORMATS else None
+
+
+@grants_bp.route('/export/schedule')
+@login_required
+def export_schedule():
+    """Stream the full vest schedule as CSV or NDJSON."""
+    fmt = _export_format()
+    if not fmt:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    today = date.today()
+    rows = (schedule_row(ve, today) for ve in iter_vest_events(current_user.id))
+    return export_response(rows, SCHEDULE_FIELDS, fmt, 'vest_schedule')
+
+
+@grants_bp.route('/export/finance-deep-dive')
+@login_required
+def export_finance_deep_dive():
+    """Stream the finance deep dive rows (one per vest event) as CSV or NDJSON."""
+    fmt = _export_format()
+    if not fmt:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    today = date.today()
+    latest_stock_price = 0.0  # Same placeholder as the finance deep dive page
+    rows = (deep_dive_row(ve, today, latest_stock_price) for ve in iter_vest_events(current_user.id))
+    return export_response(rows, DEEP_DIVE_FIELDS, fmt, 'finance_deep_dive')
 
 
 @grants_bp.route('/rules')
@@ -277,12 +399,14 @@ def rules():
 
 @grants_bp.route('/finance-deep-dive')
 @login_required
+@private_etag
+@rate_limit_user('RATELIMIT_HEAVY_USER', ip_limit='RATELIMIT_HEAVY_IP')
 def finance_deep_dive():
     """Comprehensive tax and capital gains analysis."""
     # Get all grants and vest events for the user
     grants = Grant.query.filter_by(user_id=current_user.id).all()
-    all_vest_events = VestEvent.query.join(Grant).filter(
-        Grant.user_id == current_user.id
+    all_vest_events = VestEvent.query.filter(
+        VestEvent.user_id == current_user.id
     ).order_by(VestEvent.vest_date).all()
     
     # Get latest stock price for current value estimation
@@ -317,46 +441,15 @@ def finance_deep_dive():
         
         # Enrich vest event data
         enriched_vest_events = []
-        is_cash_grant = grant.share_type == 'cash'
         
         for ve in vest_events:
-            has_vested = ve.vest_date <= today
-            
-            # Calculate estimated or actual taxes
-            tax_info = ve.estimate_tax_withholding(latest_stock_price)
-            
-            # For cash grants, shares_vested/shares_received represent USD amounts
-            if is_cash_grant:
-                shares_held = ve.shares_received if has_vested else ve.shares_vested
-                cost_basis_per_share = 1.0  # $1 per $1 for cash
-                cost_basis = shares_held  # USD amount
-                current_value = shares_held  # Cash value doesn't change
-                unrealized_gain = 0.0  # No gain/loss on cash
-            else:
-                # Stock grants
-                shares_held = ve.shares_received if has_vested else ve.shares_vested
-                cost_basis_per_share = ve.share_price_at_vest
-                cost_basis = shares_held * cost_basis_per_share
-                current_value = shares_held * latest_stock_price
-                unrealized_gain = current_value - cost_basis
-            
-            days_held = (today - ve.vest_date).days if has_vested else 0
-            is_long_term = days_held >= 365
-            
-            ve_data = {
-                'vest_event': ve,
-                'has_vested': has_vested,
-                'shares_held': shares_held,
-                'cost_basis_per_share': cost_basis_per_share,
-                'cost_basis': cost_basis,
-                'current_value': current_value,
-                'unrealized_gain': unrealized_gain,
-                'days_held': days_held,
-                'is_long_term': is_long_term,
-                'tax_amount': tax_info['tax_amount'],
-                'tax_is_estimated': tax_info['is_estimated'],
-                'tax_rate': tax_info['tax_rate']
-            }
+            ve_data = {'vest_event': ve}
+            ve_data.update(vest_event_analysis(ve, today, latest_stock_price))
+            has_vested = ve_data['has_vested']
+            shares_held = ve_data['shares_held']
+            cost_basis = ve_data['cost_basis']
+            current_value = ve_data['current_value']
+            unrealized_gain = ve_data['unrealized_gain']
             enriched_vest_events.append(ve_data)
             
             # Add to grant totals
@@ -418,3 +511,129 @@ def finance_deep_dive():
                            total_unrealized_gain_all=total_unrealized_gain_all,
                            tax_rates=tax_rates,
                            use_manual_rates=use_manual_rates)
+
+
+@grants_bp.route('/sale-planner', methods=['POST'])
+@login_required
+@rate_limit_user('RATELIMIT_HEAVY_USER', ip_limit='RATELIMIT_HEAVY_IP')
+def sale_planner():
+    """
+    AJAX endpoint to plan a tax-minimizing share sale.
+    
+    Accepts JSON {"target_cash": 50000, "price": 185.0} (price defaults to the
+    latest stock price) and returns which vested lots to sell.
+    
+    SALE_PLANNER_BUDGET_MS bounds the whole request: loading the lots counts
+    against it, and the lot search stops (``truncated``) once it is spent.
+    """
+    started = time.perf_counter()
+    budget_ms = current_app.config.get('SALE_PLANNER_BUDGET_MS')
+    deadline = started + budget_ms / 1000 if budget_ms else None
+    try:
+        data = request.get_json() or {}
+        target_cash = float(data.get('target_cash') or 0)
+        price = float(data.get('price') or get_latest_stock_price() or 0)
+        if target_cash <= 0:
+            return jsonify({'error': 'target_cash must be positive'}), 400
+        if price <= 0:
+            return jsonify({'error': 'No stock price available'}), 400
+        
+        vest_events = VestEvent.query.filter(
+            VestEvent.user_id == current_user.id,
+            VestEvent.vest_date <= date.today()
+        ).all()
+        lots = collect_sale_lots(vest_events)
+        
+        tax_profile = UserTaxProfile.query.filter_by(user_id=current_user.id).first()
+        plan = plan_sale(lots, target_cash, price, build_tax_function(tax_profile),
+                         deadline=deadline)
+        
+        for lot in plan['lots']:
+            lot['vest_date'] = lot['vest_date'].isoformat()
+        plan['lots_considered'] = len(lots)
+        plan['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return jsonify(plan)
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+def _build_iso_planner(user_id: int, price: float) -> ExercisePlanner:
+    """Load one user's ISO lots and tax profile into an ExercisePlanner."""
+    vest_events = VestEvent.query.join(Grant).filter(
+        VestEvent.user_id == user_id,
+        Grant.share_type.in_([ShareType.ISO_5Y.value, ShareType.ISO_6Y.value]),
+        VestEvent.vest_date <= date.today()
+    ).all()
+    tax_profile = UserTaxProfile.query.filter_by(user_id=user_id).first()
+    return ExercisePlanner(
+        collect_iso_lots(vest_events),
+        price,
+        income=tax_profile.annual_income if tax_profile else 0.0,
+        filing_status=tax_profile.filing_status if tax_profile else 'single'
+    )
+
+
+@grants_bp.route('/iso-planner', methods=['POST'])
+@login_required
+@rate_limit_user('RATELIMIT_HEAVY_USER', ip_limit='RATELIMIT_HEAVY_IP')
+def iso_planner():
+    """
+    AJAX endpoint for the ISO exercise / AMT crossover calculator.
+    
+    Accepts JSON {"shares": 1200, "price": 185.0, "points": 41}; every field is
+    optional. Returns the largest AMT-free exercise, the regular-tax vs. AMT
+    curve and, when "shares" is given, the figures for that exercise.
+    """
+    started = time.perf_counter()
+    try:
+        data = request.get_json() or {}
+        price = float(data.get('price') or get_latest_stock_price() or 0)
+        if price <= 0:
+            return jsonify({'error': 'No stock price available'}), 400
+        points = min(int(data.get('points') or DEFAULT_CURVE_POINTS), 201)
+        
+        planner = iso_planner_cache.get_or_compute(
+            (current_user.id, price),
+            user_stamp(current_user.id),
+            lambda: _build_iso_planner(current_user.id, price)
+        )
+        
+        result = planner.summary()
+        result['curve'] = planner.curve(points)
+        if data.get('shares') is not None:
+            result['selected'] = planner.evaluate([int(data['shares'])])[0]
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return jsonify(result)
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+def _build_tax_projection(user_id: int, today: date) -> str:
+    """Project one user's vest income and tax by calendar year (serialized JSON)."""
+    vest_events = VestEvent.query.filter(
+        VestEvent.user_id == user_id
+    ).order_by(VestEvent.vest_date).all()
+    tax_profile = UserTaxProfile.query.filter_by(user_id=user_id).first()
+    projection = project_taxes(
+        vest_events,
+        tax_profile,
+        latest_price=get_latest_stock_price() or 0.0,
+        today=today
+    )
+    return current_app.json.dumps(projection)
+
+
+@grants_bp.route('/tax-projection')
+@login_required
+@rate_limit_user('RATELIMIT_HEAVY_USER', ip_limit='RATELIMIT_HEAVY_IP')
+def tax_projection():
+    """Ordinary-income tax on all past and future vests, grouped by tax year."""
+    today = date.today()
+    body = tax_projection_cache.get_or_compute(
+        (current_user.id, today),
+        user_stamp(current_user.id),
+        lambda: _build_tax_projection(current_user.id, today)
+    )
+    return current_app.response_class(body, mimetype='application/json')
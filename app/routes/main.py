@@ -2,12 +2,11 @@
 Main application routes - dashboard, home page.
 """
 
-from flask import Blueprint, render_template, redirect, url_for, jsonify
+from flask import Blueprint, render_template, redirect, url_for, jsonify, request, abort, current_app
 from flask_login import login_required, current_user
-from app.models.grant import Grant
-from app.models.vest_event import VestEvent
+from app import talisman
 from app.models.stock_price import StockPrice
-from datetime import date
+from app.utils.decorators import private_etag
 
 main_bp = Blueprint('main', __name__)
 
@@ -22,145 +21,15 @@ def index():
 
 @main_bp.route('/dashboard')
 @login_required
+@private_etag
 def dashboard():
-    """User dashboard showing grant summary."""
-    # Get user's grants
-    grants = Grant.query.filter_by(user_id=current_user.id).all()
-    
-    # Calculate totals - use grant.current_value which handles ISOs correctly
-    total_grants = len(grants)
-    total_shares = sum(g.share_quantity for g in grants)
-    current_price = 0  # Placeholder, update with per-user price logic if needed
-    # For total value, sum up each grant's current_value (which handles ISO spread correctly)
-    total_value = sum(g.current_value for g in grants)
-    
-    # Get upcoming vests (vest_date in the future)
-    upcoming_vests = VestEvent.query.join(Grant).filter(
-        Grant.user_id == current_user.id,
-        VestEvent.vest_date >= date.today()
-    ).order_by(VestEvent.vest_date).limit(5).all()
-    
-    # Get ALL vest events and filter by has_vested property (vest_date in the past)
-    all_vest_events = VestEvent.query.join(Grant).filter(
-        Grant.user_id == current_user.id
-    ).order_by(VestEvent.vest_date).all()
-    
-    # Filter vested events using the has_vested property
-    vested_events = [v for v in all_vest_events if v.has_vested]
-    vested_shares_gross = sum(v.shares_vested for v in vested_events)
-    vested_shares_net = sum(v.shares_received for v in vested_events)
-    vested_value_gross = vested_shares_gross * current_price
-    vested_value_net = vested_shares_net * current_price
-    
-    # Build comprehensive timeline with ALL state changes (stock price updates + vest events)
-    all_stock_prices = StockPrice.query.order_by(StockPrice.valuation_date).all()
-    
-    # Create a timeline of all significant dates (vest events + price changes)
-    timeline_events = []
-    
-    # Add all vest events
-    for vest in all_vest_events:
-        timeline_events.append({
-            'date': vest.vest_date,
-            'type': 'vest',
-            'vest': vest
-        })
-    
-    # Add all stock price updates
-    for price in all_stock_prices:
-        timeline_events.append({
-            'date': price.valuation_date,
-            'type': 'price_update',
-            'price': price.price_per_share
-        })
-    
-    # Sort all events by date
-    timeline_events.sort(key=lambda x: x['date'])
-    
-    # Pre-build a dict for O(1) price lookups
-    price_dict = {p.valuation_date: p.price_per_share for p in all_stock_prices}
-    
-    # Calculate cumulative values efficiently with O(n) complexity
-    vesting_timeline = []
-    cumulative_vested_value = 0
-    cumulative_total_value = 0
-    cumulative_vested_shares = 0
-    cumulative_total_shares = 0
-    current_price = 0
-    
-    for event in timeline_events:
-        event_date = event['date']
-        
-        # Update price if this is a price update
-        if event['type'] == 'price_update':
-            # Recalculate all cumulative values with new price
-            # This is necessary because ISOs use spread (price - strike)
-            current_price = event['price']
-            
-            # Recalculate from scratch when price changes
-            cumulative_vested_value = 0
-            cumulative_total_value = 0
-            
-            for vest in all_vest_events:
-                if vest.vest_date <= event_date:
-                    grant = vest.grant
-                    shares = vest.shares_vested
-                    
-                    if grant.share_type in ['iso_5y', 'iso_6y']:
-                        value = shares * (current_price - grant.share_price_at_grant)
-                    else:
-                        value = shares * current_price
-                    
-                    cumulative_total_value += value
-                    if vest.has_vested:
-                        cumulative_vested_value += value
-        
-        # Process vest event
-        elif event['type'] == 'vest':
-            vest = event['vest']
-            grant = vest.grant
-            shares = vest.shares_vested
-            
-            # Use most recent price
-            if not current_price:
-                continue
-            
-            if grant.share_type in ['iso_5y', 'iso_6y']:
-                value = shares * (current_price - grant.share_price_at_grant)
-            else:
-                value = shares * current_price
-            
-            cumulative_total_value += value
-            cumulative_total_shares += shares
-            
-            if vest.has_vested:
-                cumulative_vested_value += value
-                cumulative_vested_shares += shares
-        
-        # Only add timeline point if we have data
-        if current_price > 0 and cumulative_total_shares > 0:
-            vesting_timeline.append({
-                'date': event_date.strftime('%Y-%m-%d'),
-                'vested_shares': cumulative_vested_shares,
-                'total_shares': cumulative_total_shares,
-                'vested_value': cumulative_vested_value,
-                'total_value': cumulative_total_value,
-                'is_vested': event_date <= date.today(),
-                'price_at_date': current_price,
-                'event_type': event['type']
-            })
-    
+    """User dashboard showing grant summary (the timeline chart loads from /api/v1/dashboard)."""
+    from app.utils.dashboard import get_dashboard
+
+    data = get_dashboard(current_user.id)
     return render_template('main/dashboard.html',
-                         total_grants=total_grants,
-                         total_shares=total_shares,
-                         total_value=total_value,
-                         vested_shares_gross=vested_shares_gross,
-                         vested_shares_net=vested_shares_net,
-                         vested_value_gross=vested_value_gross,
-                         vested_value_net=vested_value_net,
-                         upcoming_vests=upcoming_vests,
-                         current_price=current_price,
-                         vesting_timeline=vesting_timeline)
+                         upcoming_vests=data['upcoming_vests'],
+                         **data['summary'])
 
 
 @main_bp.route('/stock-price-chart-data')
@@ -175,3 +44,33 @@ def stock_price_chart_data():
     }
     
     return jsonify(data)
+
+
+@main_bp.route('/metrics')
+@talisman(force_https=False)  # scraped over plain HTTP from localhost
+def metrics():
+    """
+    Prometheus metrics for all workers.
+
+    With METRICS_TOKEN set, scrapers must send ``Authorization: Bearer <token>``.
+    Without it only direct connections from METRICS_ALLOWED_IPS are served:
+    proxied requests (X-Forwarded-For/Forwarded) are refused, because behind a
+    same-host reverse proxy every client appears to come from 127.0.0.1.
+    """
+    import hmac
+    from app.utils.metrics import metrics_text
+
+    config = current_app.config
+    if not config.get('METRICS_ENABLED'):
+        abort(404)
+    allowed_ips = config.get('METRICS_ALLOWED_IPS', [])
+    if allowed_ips and request.remote_addr not in allowed_ips:
+        abort(403)
+    token = config.get('METRICS_TOKEN')
+    if token:
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+            abort(403)
+    elif not allowed_ips or 'X-Forwarded-For' in request.headers or 'Forwarded' in request.headers:
+        abort(403)
+    return current_app.response_class(metrics_text(), mimetype='text/plain; version=0.0.4')
@@ -5,13 +5,19 @@ User settings routes - tax configuration, preferences.
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
 from app import db
-from app.models.tax_rate import UserTaxProfile, TaxBracket
+from app.models.tax_rate import UserTaxProfile
+from app.utils.decorators import private_etag, rate_limit_user
+from app.utils.tax_tables import get_available_states, preview_rates
+
+# Upper bound on items accepted by the batch preview endpoint
+MAX_PREVIEW_BATCH = 500
 
 settings_bp = Blueprint('settings', __name__, url_prefix='/settings')
 
 
 @settings_bp.route('/tax', methods=['GET', 'POST'])
 @login_required
+@private_etag
 def tax_settings():
     """Tax configuration settings."""
     # Get or create tax profile
@@ -51,23 +57,20 @@ def tax_settings():
     # Get calculated rates for display
     rates = tax_profile.get_tax_rates()
     
-    # Get list of states with tax brackets
-    states_with_data = db.session.query(TaxBracket.jurisdiction).filter(
-        TaxBracket.tax_year == 2025,
-        TaxBracket.jurisdiction != 'federal'
-    ).distinct().all()
-    available_states = [s[0] for s in states_with_data]
+    # Get list of states with tax brackets (served from the in-memory bracket cache)
+    available_states = get_available_states(2025)
     
     return render_template(
         'settings/tax.html',
         tax_profile=tax_profile,
         calculated_rates=rates,
-        available_states=sorted(available_states)
+        available_states=available_states
     )
 
 
 @settings_bp.route('/tax/calculate-rates', methods=['POST'])
 @login_required
+@rate_limit_user('RATELIMIT_PREVIEW', scope='tax_preview')
 def calculate_rates_preview():
     """AJAX endpoint to preview tax rates without saving."""
     try:
@@ -98,3 +101,47 @@ def calculate_rates_preview():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 400
+
+
+@settings_bp.route('/tax/calculate-rates/batch', methods=['POST'])
+@login_required
+@rate_limit_user('RATELIMIT_PREVIEW', scope='tax_preview')
+def calculate_rates_preview_batch():
+    """
+    AJAX endpoint to preview tax rates for many scenarios in one call.
+    
+    Accepts JSON {"items": [{"state": "CA", "filing_status": "single", "annual_income": 150000}, ...]}
+    (or [state, filing_status, annual_income] arrays) and returns one result per item, in order.
+    """
+    try:
+        data = request.get_json() or {}
+        items = data.get('items')
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'items must be a non-empty list'}), 400
+        if len(items) > MAX_PREVIEW_BATCH:
+            return jsonify({'error': f'At most {MAX_PREVIEW_BATCH} items per request'}), 400
+        
+        scenarios = []
+        for item in items:
+            if isinstance(item, dict):
+                state, filing_status, annual_income = item.get('state'), item.get('filing_status'), item.get('annual_income')
+            else:
+                state, filing_status, annual_income = item
+            annual_income = float(annual_income) if annual_income else None
+            if not annual_income:
+                return jsonify({'error': 'Annual income required for every item'}), 400
+            scenarios.append(((state or '').upper() or None, filing_status or 'single', annual_income))
+        
+        results = [
+            {
+                'federal': round(rates['federal'] * 100, 2),
+                'state': round(rates['state'] * 100, 2),
+                'ltcg': round(rates['ltcg'] * 100, 2)
+            }
+            for rates in preview_rates(scenarios)
+        ]
+        
+        return jsonify({'results': results})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
@@ -0,0 +1,35 @@
+/**
+ * Page behaviours shared by every template.
+ *
+ * Templates declare behaviour with data attributes instead of inline event
+ * handlers, so the Content-Security-Policy needs no 'unsafe-inline':
+ *   <form data-confirm="Message">  asks for confirmation before submitting
+ *   <tr data-href="/url">          navigates when the row is clicked
+ *   <button class="alert-close">   dismisses its flash message
+ *   <a data-action="back">         goes back in history (href is the fallback)
+ */
+
+document.addEventListener('submit', (e) => {
+    const message = e.target.dataset.confirm;
+    if (message && !confirm(message)) {
+        e.preventDefault();
+    }
+});
+
+document.addEventListener('click', (e) => {
+    const closeButton = e.target.closest('.alert-close');
+    if (closeButton) {
+        closeButton.parentElement.remove();
+        return;
+    }
+    const backLink = e.target.closest('[data-action="back"]');
+    if (backLink && window.history.length > 1) {
+        e.preventDefault();
+        window.history.back();
+        return;
+    }
+    const row = e.target.closest('[data-href]');
+    if (row && !e.target.closest('a, button, input, select, textarea')) {
+        window.location.href = row.dataset.href;
+    }
+});
@@ -0,0 +1,318 @@
+// Vesting timeline, loaded from the dashboard API below
+let vestingData = [];
+const dashboardEl = document.querySelector('.dashboard');
+const currentPrice = parseFloat(dashboardEl.dataset.currentPrice);
+
+console.log('Current price:', currentPrice);
+
+let currentView = 'value'; // 'value' or 'shares'
+let chartInstance = null;
+
+// Index where vested transitions to unvested (set once the timeline loads)
+let transitionIndex = -1;
+
+function createChart(view) {
+    const ctx = document.getElementById('vestingChart');
+    if (!ctx) {
+        console.error('Canvas element not found');
+        return;
+    }
+    
+    if (!vestingData || vestingData.length === 0) {
+        console.warn('No vesting data available');
+        ctx.getContext('2d').fillStyle = '#9ca3af';
+        ctx.getContext('2d').font = '16px sans-serif';
+        ctx.getContext('2d').fillText('No vesting data available', 50, 200);
+        return;
+    }
+    
+    console.log('Creating chart with view:', view);
+    
+    // Parse dates to Date objects for proper time scale
+    const dates = vestingData.map(d => new Date(d.date));
+    // Use pre-calculated values from backend (already includes historical prices)
+    const totalData = vestingData.map(d => view === 'value' ? d.total_value : d.total_shares);
+    
+    // Split data into past (vested) and future (unvested) portions for styling
+    const vestedDates = dates.slice(0, transitionIndex >= 0 ? transitionIndex : dates.length);
+    const unvestedDates = transitionIndex >= 0 ? dates.slice(transitionIndex - 1) : [];
+    
+    const vestedValues = totalData.slice(0, transitionIndex >= 0 ? transitionIndex : totalData.length);
+    const unvestedValues = transitionIndex >= 0 ? totalData.slice(transitionIndex - 1) : [];
+    
+    if (chartInstance) {
+        chartInstance.destroy();
+    }
+    
+    chartInstance = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: dates,
+            datasets: [
+                {
+                    label: 'Vested (Past)',
+                    data: vestedDates.map((date, idx) => ({x: date, y: vestedValues[idx]})),
+                    borderColor: '#10b981',
+                    backgroundColor: 'rgba(16, 185, 129, 0.1)',
+                    borderWidth: 3,
+                    fill: true,
+                    tension: 0.3,
+                    pointRadius: 4,
+                    pointHoverRadius: 6
+                },
+                {
+                    label: 'Unvested (Future)',
+                    data: unvestedDates.map((date, idx) => ({x: date, y: unvestedValues[idx]})),
+                    borderColor: '#9ca3af',
+                    backgroundColor: 'rgba(156, 163, 175, 0.05)',
+                    borderWidth: 3,
+                    borderDash: [10, 5],
+                    fill: true,
+                    tension: 0.3,
+                    pointRadius: 4,
+                    pointHoverRadius: 6,
+                    pointStyle: 'circle',
+                    pointBorderColor: '#9ca3af'
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            interaction: {
+                intersect: false,
+                mode: 'index'
+            },
+            plugins: {
+                legend: {
+                    display: false
+                },
+                tooltip: {
+                    backgroundColor: 'rgba(10, 14, 20, 0.95)',
+                    titleColor: '#e6e9f0',
+                    bodyColor: '#e6e9f0',
+                    borderColor: '#00d4ff',
+                    borderWidth: 1,
+                    padding: 12,
+                    displayColors: false,
+                    callbacks: {
+                        title: function(items) {
+                            // Use parsed x value which is a timestamp
+                            const date = new Date(items[0].parsed.x);
+                            return date.toLocaleDateString('en-US', {
+                                year: 'numeric',
+                                month: 'short',
+                                day: 'numeric'
+                            });
+                        },
+                        label: function(context) {
+                            const value = context.parsed.y;
+                            if (view === 'value') {
+                                return '$' + value.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+                            } else {
+                                return value.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2}) + ' shares';
+                            }
+                        }
+                    }
+                }
+            },
+            scales: {
+                x: {
+                    type: 'time',
+                    time: {
+                        unit: 'month',
+                        displayFormats: {
+                            month: 'MMM yyyy'
+                        }
+                    },
+                    grid: {
+                        color: 'rgba(45, 55, 72, 0.5)',
+                        drawBorder: false
+                    },
+                    ticks: {
+                        color: '#9ca3af'
+                    }
+                },
+                y: {
+                    beginAtZero: true,
+                    grid: {
+                        color: 'rgba(45, 55, 72, 0.5)',
+                        drawBorder: false
+                    },
+                    ticks: {
+                        color: '#9ca3af',
+                        callback: function(value) {
+                            if (view === 'value') {
+                                return '$' + value.toLocaleString('en-US', {minimumFractionDigits: 0, maximumFractionDigits: 0});
+                            } else {
+                                return value.toLocaleString('en-US', {minimumFractionDigits: 0, maximumFractionDigits: 0});
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Toggle button handlers
+document.querySelectorAll('.toggle-btn').forEach(btn => {
+    btn.addEventListener('click', function() {
+        document.querySelectorAll('.toggle-btn').forEach(b => b.classList.remove('active'));
+        this.classList.add('active');
+        currentView = this.dataset.view;
+        try {
+            createChart(currentView);
+        } catch (error) {
+            console.error('Error creating chart:', error);
+        }
+    });
+});
+
+// Zoom controls
+let xZoomValue = 1;
+let yZoomValue = 1;
+
+document.getElementById('xZoom').addEventListener('input', function(e) {
+    xZoomValue = parseFloat(e.target.value);
+    document.getElementById('xZoomLabel').textContent = Math.round(xZoomValue * 100) + '%';
+    updateChartZoom();
+});
+
+document.getElementById('yZoom').addEventListener('input', function(e) {
+    yZoomValue = parseFloat(e.target.value);
+    document.getElementById('yZoomLabel').textContent = Math.round(yZoomValue * 100) + '%';
+    updateChartZoom();
+});
+
+document.getElementById('resetZoom').addEventListener('click', function() {
+    xZoomValue = 1;
+    yZoomValue = 1;
+    document.getElementById('xZoom').value = 1;
+    document.getElementById('yZoom').value = 1;
+    document.getElementById('xZoomLabel').textContent = '100%';
+    document.getElementById('yZoomLabel').textContent = '100%';
+    updateChartZoom();
+});
+
+function updateChartZoom() {
+    if (!chartInstance || !vestingData || vestingData.length === 0) return;
+    
+    const dates = vestingData.map(d => new Date(d.date));
+    const values = vestingData.map(d => currentView === 'value' ? d.total_value : d.total_shares);
+    
+    // Calculate date range
+    const minDate = dates[0];
+    const maxDate = dates[dates.length - 1];
+    const dateRange = maxDate - minDate;
+    const zoomedDateRange = dateRange * xZoomValue;
+    const newMaxDate = new Date(minDate.getTime() + zoomedDateRange);
+    
+    // Calculate value range
+    const maxValue = Math.max(...values);
+    const zoomedMaxValue = maxValue * yZoomValue;
+    
+    // Update chart scales
+    chartInstance.options.scales.x.max = newMaxDate;
+    chartInstance.options.scales.y.max = zoomedMaxValue;
+    chartInstance.update();
+}
+
+// Expand the API's columnar timeline ({field: [values]}) into one object per point
+function expandTimeline(columns) {
+    const fields = Object.keys(columns);
+    const length = fields.length ? columns[fields[0]].length : 0;
+    const points = [];
+    for (let i = 0; i < length; i++) {
+        const point = {};
+        fields.forEach(field => { point[field] = columns[field][i]; });
+        points.push(point);
+    }
+    return points;
+}
+
+// Load the timeline and create the chart
+fetch(dashboardEl.dataset.timelineUrl, {credentials: 'same-origin'})
+    .then(response => response.json())
+    .then(data => {
+        vestingData = expandTimeline(data.timeline);
+        transitionIndex = vestingData.findIndex(d => !d.is_vested);
+        console.log('Vesting data points:', vestingData.length, 'transition index:', transitionIndex);
+        if (typeof Chart !== 'undefined') {
+            createChart(currentView);
+        } else {
+            console.error('Chart.js not loaded');
+        }
+    })
+    .catch(error => console.error('Error initializing chart:', error));
+
+// Stock Price Mini Chart
+fetch(dashboardEl.dataset.priceChartUrl)
+    .then(response => response.json())
+    .then(data => {
+        const ctx = document.getElementById('stockPriceChart').getContext('2d');
+        new Chart(ctx, {
+            type: 'line',
+            data: {
+                labels: data.dates,
+                datasets: [{
+                    label: 'Stock Price',
+                    data: data.prices,
+                    borderColor: '#00d4ff',
+                    backgroundColor: 'rgba(0, 212, 255, 0.1)',
+                    borderWidth: 2,
+                    tension: 0.3,
+                    fill: true,
+                    pointRadius: 0,
+                    pointHoverRadius: 4,
+                    pointBackgroundColor: '#00d4ff',
+                    pointBorderColor: '#fff',
+                    pointBorderWidth: 2
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: { display: false },
+                    title: { display: false },
+                    tooltip: {
+                        backgroundColor: 'rgba(0, 0, 0, 0.8)',
+                        padding: 8,
+                        titleColor: '#00d4ff',
+                        bodyColor: '#fff',
+                        displayColors: false,
+                        callbacks: {
+                            label: function(context) {
+                                return '$' + context.parsed.y.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+                            }
+                        }
+                    }
+                },
+                scales: {
+                    y: {
+                        beginAtZero: false,
+                        grid: {
+                            color: 'rgba(45, 55, 72, 0.5)',
+                            drawBorder: false
+                        },
+                        ticks: { 
+                            color: '#9ca3af',
+                            callback: function(value) {
+                                return '$' + value.toLocaleString('en-US', {minimumFractionDigits: 0, maximumFractionDigits: 0});
+                            },
+                            maxTicksLimit: 4
+                        }
+                    },
+                    x: {
+                        display: false
+                    }
+                },
+                interaction: {
+                    intersect: false,
+                    mode: 'index'
+                }
+            }
+        });
+    })
+    .catch(error => console.error('Error loading stock price chart:', error));
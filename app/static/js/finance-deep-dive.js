@@ -0,0 +1,392 @@
+// Tax calculation logic
+const federalSlider = document.getElementById('federalTaxRate');
+const stateSlider = document.getElementById('stateTaxRate');
+const capitalGainsSlider = document.getElementById('capitalGainsTaxRate');
+const showAllToggle = document.getElementById('showAllToggle');
+const toggleLabel = document.getElementById('toggleLabel');
+
+const federalValue = document.getElementById('federalTaxValue');
+const stateValue = document.getElementById('stateTaxValue');
+const capitalGainsValue = document.getElementById('capitalGainsValue');
+const ficaSlider = document.getElementById('ficaTaxRate');
+const ficaValue = document.getElementById('ficaValue');
+
+// Toggle between vested and all shares
+showAllToggle.addEventListener('change', (e) => {
+    const showAll = e.target.checked;
+    toggleLabel.textContent = showAll ? 'All Shares (Including Future)' : 'Vested Only';
+    document.querySelectorAll('.data-unvested').forEach(el => {
+        if (showAll) {
+            el.style.display = 'flex';  // Use flex to maintain column layout
+        } else {
+            el.style.display = 'none';
+        }
+    });
+    
+    // Recalculate taxes
+    calculateTaxes();
+});
+
+// Update slider display values
+federalSlider.addEventListener('input', (e) => {
+    federalValue.textContent = e.target.value;
+    calculateTaxes();
+});
+
+stateSlider.addEventListener('input', (e) => {
+    stateValue.textContent = e.target.value;
+    calculateTaxes();
+});
+
+capitalGainsSlider.addEventListener('input', (e) => {
+    capitalGainsValue.textContent = e.target.value;
+    calculateTaxes();
+});
+
+ficaSlider.addEventListener('input', (e) => {
+    ficaValue.textContent = parseFloat(e.target.value).toFixed(2);
+    calculateTaxes();
+});
+
+function calculateTaxes() {
+    const federalRate = parseFloat(federalSlider.value) / 100;
+    const stateRate = parseFloat(stateSlider.value) / 100;
+    const capitalGainsRate = parseFloat(capitalGainsSlider.value) / 100;
+    const showAll = showAllToggle.checked;
+    const ficaRate = 0.0765; // 7.65% FICA (Social Security + Medicare)
+    
+    // Calculate total tax across all grants and vest events
+    document.querySelectorAll('.grant-analysis-card').forEach(card => {
+        const sharesHeldVested = parseFloat(card.dataset.sharesHeldVested);
+        const sharesHeldAll = parseFloat(card.dataset.sharesHeldAll);
+        const costBasisVested = parseFloat(card.dataset.costBasisVested);
+        const costBasisAll = parseFloat(card.dataset.costBasisAll);
+        const currentValueVested = parseFloat(card.dataset.currentValueVested);
+        const currentValueAll = parseFloat(card.dataset.currentValueAll);
+        const unrealizedGainVested = parseFloat(card.dataset.unrealizedGainVested);
+        const unrealizedGainAll = parseFloat(card.dataset.unrealizedGainAll);
+        
+        let grantTax = 0;
+        let totalTax = 0;
+        let totalCurrentValue = 0;
+        
+        // Calculate per-event taxes
+        card.querySelectorAll('.vest-event-row').forEach(row => {
+            const hasVested = row.dataset.hasVested === 'true';
+            
+            // Skip unvested events if showing vested only
+            if (!showAll && !hasVested) return;
+            
+            const eventUnrealizedGain = parseFloat(row.dataset.unrealizedGain);
+            const sharesHeld = parseFloat(row.dataset.sharesHeld);
+            const isLongTerm = row.dataset.isLongTerm === 'true';
+            const taxIsEstimated = row.dataset.taxIsEstimated === 'true';
+            
+            // Update "Tax Paid at Vest" for estimated taxes
+            if (taxIsEstimated) {
+                const sharesVested = parseFloat(row.dataset.sharesVested);
+                const currentPrice = parseFloat(row.dataset.currentPrice);
+                
+                // Calculate estimated vest tax using ordinary income rates (federal + state + FICA from slider)
+                const estimatedVestValue = sharesVested * currentPrice;
+                const estimatedVestTax = estimatedVestValue * (federalRate + stateRate + ficaRate);
+                
+                // Update the "Tax Paid at Vest" cell
+                const taxPaidSpan = row.querySelector('.event-tax-paid .estimated-tax');
+                if (taxPaidSpan) {
+                    taxPaidSpan.textContent = '$' + estimatedVestTax.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2}) + '*';
+                }
+            }
+            
+            // Calculate withholding tax estimate for future vests (for "Tax Paid at Vest" column)
+            if (taxIsEstimated && !hasVested) {
+                const sharesVested = parseFloat(row.dataset.sharesVested);
+                const currentPrice = parseFloat(row.dataset.currentPrice);
+                const shareType = row.dataset.shareType;
+                const grantType = row.dataset.grantType;
+                const esppDiscount = parseFloat(row.dataset.esppDiscount) || 0;
+                const strikePrice = parseFloat(row.dataset.strikePrice) || 0;
+                
+                let vestValue = 0;
+                
+                // Calculate taxable value at vest based on grant type
+                if (shareType === 'cash') {
+                    // Cash grants: simple USD amount
+                    vestValue = sharesVested;
+                } else if (shareType === 'iso_5y' || shareType === 'iso_6y') {
+                    // ISOs: tax on spread (current_price - strike_price)
+                    const spread = currentPrice - strikePrice;
+                    vestValue = sharesVested * (spread > 0 ? spread : 0);
+                } else if (grantType === 'espp' && esppDiscount > 0) {
+                    // ESPP: tax on discount portion (ordinary income)
+                    const discountGain = sharesVested * currentPrice * esppDiscount;
+                    vestValue = discountGain;
+                } else {
+                    // RSUs/RSAs: full value is taxable as ordinary income
+                    vestValue = sharesVested * currentPrice;
+                }
+                
+                // Calculate withholding tax: federal + state + FICA (7.65%)
+                const ficaRate = 0.0765;
+                const estimatedWithholding = vestValue * (federalRate + stateRate + ficaRate);
+                
+                // Update the "Tax Paid at Vest" display
+                const withholdingCell = row.querySelector('.withholding-amount');
+                if (withholdingCell) {
+                    withholdingCell.textContent = estimatedWithholding.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+                }
+            }
+            
+            let eventTax;
+            // Calculate tax on unrealized gains (if you were to sell now)
+            // Short-term: taxed as ordinary income (federal + state)
+            // Long-term: taxed at capital gains rate + state
+            if (isLongTerm) {
+                eventTax = eventUnrealizedGain * (capitalGainsRate + stateRate);
+            } else {
+                eventTax = eventUnrealizedGain * (federalRate + stateRate);
+            }
+            
+            // Update the event tax display (tax on sale)
+            const eventTaxCell = row.querySelector('.event-tax-estimate');
+            if (eventTaxCell) {
+                eventTaxCell.textContent = '$' + eventTax.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+            }
+            
+            grantTax += eventTax;
+        });
+        
+        // Use unrealized gain for grant-level calculation (weighted average)
+        const estimatedTax = unrealizedGain * (capitalGainsRate + stateRate);
+        const netValue = currentValue - estimatedTax;
+        
+        // Update grant-level displays
+        const taxEstimate = card.querySelector('.grant-tax-estimate');
+        const netValueEl = card.querySelector('.grant-net-value');
+        
+        if (taxEstimate && netValueEl) {
+            taxEstimate.textContent = '$' + grantTax.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+            netValueEl.textContent = '$' + (currentValue - grantTax).toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+            
+            if (netValue > 0) {
+                netValueEl.classList.add('positive');
+                netValueEl.classList.remove('negative');
+            }
+        }
+        
+        totalTax += grantTax;
+        totalCurrentValue += currentValue;
+    });
+    
+    const netAfterTax = totalCurrentValue - totalTax;
+    
+    // Update summary cards
+    document.getElementById('totalTaxLiability').textContent = 
+        '$' + totalTax.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    document.getElementById('netAfterTax').textContent = 
+        'Net: $' + netAfterTax.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+}
+
+// Calculate on page load
+calculateTaxes();
+
+// Hide unvested rows initially
+document.querySelectorAll('.data-unvested').forEach(el => {
+    el.style.display = 'none';
+});
+
+// ==================== Column Customizer ====================
+
+const columnCustomizer = document.getElementById('columnCustomizer');
+const toggleCustomizer = document.getElementById('toggleCustomizer');
+const customizerToggleIcon = document.getElementById('customizerToggleIcon');
+const applyColumnsBtn = document.getElementById('applyColumns');
+const resetColumnsBtn = document.getElementById('resetColumns');
+
+// Toggle customizer visibility
+toggleCustomizer.addEventListener('click', () => {
+    const isHidden = columnCustomizer.style.display === 'none';
+    columnCustomizer.style.display = isHidden ? 'block' : 'none';
+    customizerToggleIcon.textContent = isHidden ? '▲' : '▼';
+});
+
+// Default column order
+const defaultColumns = [
+    'vest-date', 'status', 'shares-held', 'cost-at-vest', 
+    'tax-paid', 'current-value', 'holding-period', 
+    'unrealized-gain', 'est-tax'
+];
+
+// Load saved preferences from localStorage
+function loadColumnPreferences() {
+    const saved = localStorage.getItem('financeTableColumns');
+    if (saved) {
+        return JSON.parse(saved);
+    }
+    return {
+        order: [...defaultColumns],
+        visible: defaultColumns.reduce((acc, col) => ({ ...acc, [col]: true }), {})
+    };
+}
+
+// Save preferences to localStorage
+function saveColumnPreferences(prefs) {
+    localStorage.setItem('financeTableColumns', JSON.stringify(prefs));
+}
+
+// Apply column visibility and order to all tables
+function applyColumnSettings() {
+    const prefs = loadColumnPreferences();
+    
+    // Update checkboxes
+    document.querySelectorAll('.column-selector-item').forEach(item => {
+        const column = item.dataset.column;
+        const checkbox = item.querySelector('input[type="checkbox"]');
+        if (checkbox && !checkbox.disabled) {
+            checkbox.checked = prefs.visible[column] !== false;
+        }
+    });
+    
+    // Apply to all tables
+    document.querySelectorAll('.vest-events-table').forEach(table => {
+        const headerRow = table.querySelector('.table-header-row');
+        const headers = Array.from(headerRow.querySelectorAll('th'));
+        const bodyRows = Array.from(table.querySelectorAll('tbody tr'));
+        
+        // Hide/show columns based on preferences
+        prefs.order.forEach((column, index) => {
+            const visible = prefs.visible[column] !== false;
+            
+            // Find header and cells for this column
+            const header = headers.find(h => h.dataset.column === column);
+            
+            if (header) {
+                header.style.display = visible ? '' : 'none';
+                header.style.order = index;
+            }
+            
+            // Update all body cells
+            bodyRows.forEach(row => {
+                const cell = Array.from(row.querySelectorAll('td')).find(c => c.dataset.column === column);
+                if (cell) {
+                    cell.style.display = visible ? '' : 'none';
+                    cell.style.order = index;
+                }
+            });
+        });
+        
+        // Use flexbox for reordering
+        headerRow.style.display = 'flex';
+        bodyRows.forEach(row => {
+            // Check if row should be hidden (unvested rows when showing vested only)
+            const isUnvested = row.classList.contains('data-unvested');
+            const showAll = showAllToggle.checked;
+            
+            // Only set display to flex if row should be visible
+            if (!isUnvested || showAll) {
+                row.style.display = 'flex';
+            }
+            
+            row.querySelectorAll('td').forEach(cell => {
+                cell.style.flex = '1';
+                cell.style.minWidth = '100px';
+            });
+        });
+        headerRow.querySelectorAll('th').forEach(th => {
+            th.style.flex = '1';
+            th.style.minWidth = '100px';
+        });
+    });
+}
+
+// Apply button handler
+applyColumnsBtn.addEventListener('click', () => {
+    const prefs = {
+        order: [],
+        visible: {}
+    };
+    
+    // Get current order and visibility from selector items
+    document.querySelectorAll('.column-selector-item').forEach(item => {
+        const column = item.dataset.column;
+        const checkbox = item.querySelector('input[type="checkbox"]');
+        
+        prefs.order.push(column);
+        prefs.visible[column] = checkbox.checked;
+    });
+    
+    saveColumnPreferences(prefs);
+    applyColumnSettings();
+    
+    // Show feedback
+    const originalText = applyColumnsBtn.textContent;
+    applyColumnsBtn.textContent = '✓ Applied!';
+    applyColumnsBtn.style.background = 'var(--success)';
+    setTimeout(() => {
+        applyColumnsBtn.textContent = originalText;
+        applyColumnsBtn.style.background = '';
+    }, 1500);
+});
+
+// Reset button handler
+resetColumnsBtn.addEventListener('click', () => {
+    const prefs = {
+        order: [...defaultColumns],
+        visible: defaultColumns.reduce((acc, col) => ({ ...acc, [col]: true }), {})
+    };
+    
+    saveColumnPreferences(prefs);
+    applyColumnSettings();
+    
+    // Show feedback
+    const originalText = resetColumnsBtn.textContent;
+    resetColumnsBtn.textContent = '✓ Reset!';
+    setTimeout(() => {
+        resetColumnsBtn.textContent = originalText;
+    }, 1500);
+});
+
+// Drag and drop for reordering
+let draggedItem = null;
+
+document.querySelectorAll('.column-selector-item').forEach(item => {
+    item.draggable = true;
+    
+    item.addEventListener('dragstart', (e) => {
+        draggedItem = item;
+        item.style.opacity = '0.5';
+    });
+    
+    item.addEventListener('dragend', (e) => {
+        item.style.opacity = '';
+        draggedItem = null;
+    });
+    
+    item.addEventListener('dragover', (e) => {
+        e.preventDefault();
+        const afterElement = getDragAfterElement(item.parentElement, e.clientY);
+        if (afterElement == null) {
+            item.parentElement.appendChild(draggedItem);
+        } else {
+            item.parentElement.insertBefore(draggedItem, afterElement);
+        }
+    });
+});
+
+function getDragAfterElement(container, y) {
+    const draggableElements = [...container.querySelectorAll('.column-selector-item:not(.dragging)')];
+    
+    return draggableElements.reduce((closest, child) => {
+        const box = child.getBoundingClientRect();
+        const offset = y - box.top - box.height / 2;
+        
+        if (offset < 0 && offset > closest.offset) {
+            return { offset: offset, element: child };
+        } else {
+            return closest;
+        }
+    }, { offset: Number.NEGATIVE_INFINITY }).element;
+}
+
+// Apply settings on page load
+applyColumnSettings();
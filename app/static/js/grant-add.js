@@ -0,0 +1,12 @@
+function updateFormFields() {
+    const grantType = document.getElementById('grant_type').value;
+    const bonusRow = document.getElementById('bonus_type_row');
+    const esppRow = document.getElementById('espp_discount_row');
+    const vestRow = document.getElementById('vest_years_row');
+    
+    bonusRow.style.display = grantType === 'annual_performance' ? 'flex' : 'none';
+    esppRow.style.display = grantType === 'espp' ? 'flex' : 'none';
+    vestRow.style.display = grantType === 'kickass' ? 'flex' : 'none';
+}
+
+document.getElementById('grant_type').addEventListener('change', updateFormFields);
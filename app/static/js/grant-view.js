@@ -0,0 +1,112 @@
+// Handle "Fully Covered?" dropdown changes  
+document.querySelectorAll('.cash-covered-select').forEach(select => {
+    select.addEventListener('change', function() {
+        const vestId = this.dataset.vestId;
+        const row = document.querySelector(`tr[data-vest-id="${vestId}"]`);
+        const sharesSoldInput = row.querySelector('.shares-sold-input');
+        
+        if (this.value === 'no') {
+            sharesSoldInput.disabled = false;
+            sharesSoldInput.focus();
+        } else {
+            sharesSoldInput.disabled = true;
+            sharesSoldInput.value = '';
+        }
+    });
+});
+
+// Handle save button clicks
+document.querySelectorAll('.save-vest-btn').forEach(btn => {
+    btn.addEventListener('click', async function() {
+        const vestId = this.dataset.vestId;
+        const row = document.querySelector(`tr[data-vest-id="${vestId}"]`);
+        const cashPaidInput = row.querySelector('.cash-paid-input');
+        const cashCoveredSelect = row.querySelector('.cash-covered-select');
+        const sharesSoldInput = row.querySelector('.shares-sold-input');
+        const sharesReceivedCell = row.querySelector('.shares-received');
+        const netValueCell = row.querySelector('.net-value');
+        const statusCell = row.querySelector('.status-cell');
+        
+        const cashPaid = cashPaidInput.value || 0;
+        const cashCoveredAll = cashCoveredSelect.value === 'yes';
+        const sharesSold = sharesSoldInput.value || 0;
+        
+        console.log('Saving vest event:', vestId, 'Cash:', cashPaid, 'Covered:', cashCoveredAll, 'Sold:', sharesSold);
+        
+        const formData = new FormData();
+        formData.append('cash_paid', cashPaid);
+        formData.append('cash_covered_all', cashCoveredAll ? 'true' : 'false');
+        formData.append('shares_sold', sharesSold);
+        
+        try {
+            btn.textContent = 'Saving...';
+            btn.disabled = true;
+            
+            const response = await fetch(`/grants/vest-event/${vestId}/update`, {
+                method: 'POST',
+                body: formData
+            });
+            
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            
+            const data = await response.json();
+            console.log('Server response:', data);
+            
+            if (data.success) {
+                // Update inputs with saved values
+                if (data.cash_paid !== undefined) {
+                    cashPaidInput.value = parseFloat(data.cash_paid) > 0 ? parseFloat(data.cash_paid).toFixed(2) : '';
+                }
+                
+                cashCoveredSelect.value = data.cash_covered_all ? 'yes' : 'no';
+                
+                if (data.cash_covered_all) {
+                    sharesSoldInput.disabled = true;
+                    sharesSoldInput.value = '';
+                } else {
+                    sharesSoldInput.disabled = false;
+                    if (data.shares_sold !== undefined && parseFloat(data.shares_sold) > 0) {
+                        sharesSoldInput.value = parseFloat(data.shares_sold).toFixed(0);
+                    }
+                }
+                
+                // Update calculated fields
+                if (data.shares_received !== undefined) {
+                    sharesReceivedCell.textContent = parseFloat(data.shares_received).toLocaleString('en-US', {maximumFractionDigits: 0});
+                }
+                
+                if (data.net_value !== undefined) {
+                    netValueCell.textContent = '$' + parseFloat(data.net_value).toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+                }
+                
+                // Update status to "Vested" if tax info was provided
+                if (parseFloat(cashPaid) > 0 || parseFloat(sharesSold) > 0) {
+                    statusCell.innerHTML = '<span class="badge badge-success">✓ Vested</span>';
+                }
+                
+                // Show success
+                btn.textContent = '✓ Saved';
+                btn.classList.add('btn-success');
+                row.classList.add('vest-row-saved');
+                
+                setTimeout(() => {
+                    btn.textContent = 'Save';
+                    btn.classList.remove('btn-success');
+                    btn.disabled = false;
+                    row.classList.remove('vest-row-saved');
+                }, 2000);
+            } else {
+                alert('Error saving: ' + (data.error || 'Unknown error'));
+                btn.textContent = 'Save';
+                btn.disabled = false;
+            }
+        } catch (error) {
+            console.error('Save error:', error);
+            alert('Error saving vest event: ' + error.message);
+            btn.textContent = 'Save';
+            btn.disabled = false;
+        }
+    });
+});
@@ -0,0 +1,71 @@
+function setMode(mode) {
+    const useManual = mode === 'manual';
+    document.getElementById('useManualInput').value = useManual ? 'true' : 'false';
+    
+    // Update active state
+    document.querySelectorAll('.mode-card').forEach((card, index) => {
+        if ((index === 0 && !useManual) || (index === 1 && useManual)) {
+            card.classList.add('active');
+        } else {
+            card.classList.remove('active');
+        }
+    });
+    
+    // Show/hide sections
+    document.getElementById('automaticSection').style.display = useManual ? 'none' : 'block';
+    document.getElementById('manualSection').style.display = useManual ? 'block' : 'none';
+}
+
+async function previewRates() {
+    const state = document.getElementById('state').value;
+    const filingStatus = document.getElementById('filing_status').value;
+    const annualIncome = document.getElementById('annual_income').value;
+    
+    if (!annualIncome) {
+        return;
+    }
+    
+    try {
+        const response = await fetch(document.querySelector('.settings-page').dataset.previewUrl, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                state: state,
+                filing_status: filingStatus,
+                annual_income: parseFloat(annualIncome)
+            })
+        });
+        
+        const data = await response.json();
+        
+        if (data.error) {
+            console.error('Error calculating rates:', data.error);
+            return;
+        }
+        
+        // Update preview
+        document.getElementById('previewFederal').textContent = data.federal.toFixed(1) + '%';
+        document.getElementById('previewState').textContent = data.state.toFixed(1) + '%';
+        document.getElementById('previewLTCG').textContent = data.ltcg.toFixed(1) + '%';
+        
+    } catch (error) {
+        console.error('Error:', error);
+    }
+}
+
+document.querySelectorAll('.mode-card').forEach(card => {
+    card.addEventListener('click', () => setMode(card.dataset.mode));
+});
+
+['state', 'filing_status', 'annual_income'].forEach(id => {
+    document.getElementById(id).addEventListener('change', previewRates);
+});
+
+// Manual rate sliders show their value next to the label
+document.querySelectorAll('.tax-slider[data-output]').forEach(slider => {
+    slider.addEventListener('input', () => {
+        document.getElementById(slider.dataset.output).textContent = slider.value;
+    });
+});
@@ -0,0 +1,223 @@
+"""
+Static asset pipeline: fingerprinted, precompressed CSS/JS.
+
+Page scripts and styles live in app/static/css and app/static/js.
+``flask build-assets`` copies each file to ASSETS_BUILD_DIR (default
+app/static/dist) as ``<name>.<hash><ext>`` next to ``.gz`` and, when the
+optional ``brotli`` package is installed, ``.br`` siblings, then writes
+manifest.json mapping source names to fingerprinted ones. history.json
+accumulates every fingerprinted name ever built, so pages rendered before a
+deploy keep loading the assets they link to.
+
+Templates link assets with ``asset_url('js/dashboard.js')``. The
+fingerprinted URL changes whenever the content does, so /assets/ responses
+carry a one-year ``immutable`` Cache-Control and browsers never revalidate
+them. The best precompressed variant is picked from Accept-Encoding; nothing
+is compressed per request.
+
+Without a build (development) the sources are fingerprinted in memory and
+served uncompressed, so edits show up on the next page load.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from flask import current_app, url_for
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+SOURCE_DIRS = ('css', 'js')
+MANIFEST_FILE = 'manifest.json'
+HISTORY_FILE = 'history.json'  # fingerprinted name -> source, across builds
+HASH_LENGTH = 12
+
+# (encoding, file suffix) in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def fingerprinted_name(source: str, data: bytes) -> str:
+    """'js/dashboard.js' -> 'js/dashboard.<hash>.js'"""
+    stem, ext = os.path.splitext(source)
+    return f'{stem}.{fingerprint(data)}{ext}'
+
+
+def iter_sources(static_folder: str):
+    """Yield (source name, path) for every CSS/JS file under the static folder."""
+    for directory in SOURCE_DIRS:
+        root = os.path.join(static_folder, directory)
+        if not os.path.isdir(root):
+            continue
+        for name in sorted(os.listdir(root)):
+            if name.endswith(('.css', '.js')):
+                yield f'{directory}/{name}', os.path.join(root, name)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.tmp{os.getpid()}'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def build_assets(static_folder: str, build_dir: str) -> Dict[str, dict]:
+    """
+    Write fingerprinted and precompressed copies of every source asset.
+
+    Files from earlier builds are left in place and stay in history.json, so
+    pages rendered before a deploy can still load their assets.
+
+    Returns:
+        dict: {source: {'file', 'bytes', 'gzip_bytes', 'br_bytes'}}
+    """
+    built = {}
+    for source, path in iter_sources(static_folder):
+        with open(path, 'rb') as f:
+            data = f.read()
+        name = fingerprinted_name(source, data)
+        target = os.path.join(build_dir, name)
+
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        _write_atomic(target, data)
+        _write_atomic(target + '.gz', compressed)
+        br_bytes = None
+        if brotli is not None:
+            br_data = brotli.compress(data, quality=11)
+            _write_atomic(target + '.br', br_data)
+            br_bytes = len(br_data)
+
+        built[source] = {'file': name, 'bytes': len(data), 'gzip_bytes': len(compressed),
+                         'br_bytes': br_bytes}
+
+    manifest = {source: info['file'] for source, info in built.items()}
+    history = _read_json(os.path.join(build_dir, HISTORY_FILE))
+    history.update({name: source for source, name in manifest.items()})
+    # History first: the manifest marks the build as complete
+    _write_atomic(os.path.join(build_dir, HISTORY_FILE),
+                  json.dumps(history, indent=2, sort_keys=True).encode())
+    _write_atomic(os.path.join(build_dir, MANIFEST_FILE),
+                  json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return built
+
+
+class AssetManifest:
+    """Maps source names to fingerprinted names and back."""
+
+    def __init__(self, static_folder: str, build_dir: str):
+        self.static_folder = static_folder
+        self.build_dir = build_dir
+        self.built = False
+        self._files: Dict[str, str] = {}     # source -> fingerprinted
+        self._sources: Dict[str, str] = {}   # fingerprinted -> source
+        self._scanned: Dict[str, Tuple[int, str]] = {}  # source -> (mtime_ns, fingerprinted)
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        manifest_path = os.path.join(self.build_dir, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            files = _read_json(manifest_path)
+            # Earlier builds' names stay resolvable for pages that still link them
+            sources = _read_json(os.path.join(self.build_dir, HISTORY_FILE))
+            self.built = True
+        else:
+            files = {source: self._scan(source, path) for source, path in iter_sources(self.static_folder)}
+            sources = {}
+            self.built = False
+        sources.update({name: source for source, name in files.items()})
+        with self._lock:
+            self._files = files
+            self._sources = sources
+
+    def _scan(self, source: str, path: str) -> str:
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._scanned.get(source)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            name = fingerprinted_name(source, f.read())
+        self._scanned[source] = (mtime, name)
+        return name
+
+    def lookup(self, source: str) -> Optional[str]:
+        """The fingerprinted name for ``source``, re-fingerprinted if edited (unbuilt only)."""
+        if not self.built:
+            path = os.path.join(self.static_folder, source)
+            if os.path.isfile(path):
+                name = self._scan(source, path)
+                if self._files.get(source) != name:
+                    with self._lock:
+                        self._files[source] = name
+                        self._sources[name] = source
+                return name
+        return self._files.get(source)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Path of the file serving fingerprinted ``name``, or None if unknown."""
+        source = self._sources.get(name)
+        if source is None:
+            return None
+        if self.built:
+            return os.path.join(self.build_dir, name)
+        return os.path.join(self.static_folder, source)
+
+
+def build_dir_for(app) -> str:
+    return app.config.get('ASSETS_BUILD_DIR') or os.path.join(app.static_folder, 'dist')
+
+
+def get_manifest() -> AssetManifest:
+    manifest = current_app.extensions.get('asset_manifest')
+    if manifest is None:
+        manifest = current_app.extensions['asset_manifest'] = AssetManifest(
+            current_app.static_folder, build_dir_for(current_app))
+    return manifest
+
+
+def asset_url(source: str) -> str:
+    """URL of the fingerprinted asset, falling back to the plain static file."""
+    name = get_manifest().lookup(source)
+    if name is None:
+        return url_for('static', filename=source)
+    return url_for('assets.asset', filename=name)
+
+
+def pick_encoding(path: str, accept_encodings) -> Tuple[str, Optional[str]]:
+    """
+    Choose the precompressed sibling the client accepts.
+
+    Returns:
+        tuple: (path to send, Content-Encoding or None)
+    """
+    for encoding, suffix in ENCODINGS:
+        if accept_encodings[encoding] and os.path.exists(path + suffix):
+            return path + suffix, encoding
+    return path, None
+
+
+def mimetype_for(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+def init_assets(app) -> None:
+    """Expose asset_url() to templates."""
+    app.jinja_env.globals['asset_url'] = asset_url
@@ -4,37 +4,64 @@ Security and audit logging utilities.
 
 import logging
 import json
+import os
 from datetime import datetime
-from pathlib import Path
 from flask import request, has_request_context
 from flask_login import current_user
 from functools import wraps
 
 
-# Create logs directory if it doesn't exist
-Path('logs').mkdir(exist_ok=True)
-
-# Configure audit logger
+# Audit and security loggers. Handlers are attached by init_audit_logging(),
+# which puts a non-blocking queue between the request thread and the files.
 audit_logger = logging.getLogger('audit')
 audit_logger.setLevel(logging.INFO)
-audit_handler = logging.FileHandler('logs/audit.log')
-audit_formatter = logging.Formatter(
-    '%(asctime)s | %(levelname)s | %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-audit_handler.setFormatter(audit_formatter)
-audit_logger.addHandler(audit_handler)
-
-# Configure security logger
+
 security_logger = logging.getLogger('security')
 security_logger.setLevel(logging.WARNING)
-security_handler = logging.FileHandler('logs/security.log')
-security_formatter = logging.Formatter(
-    '%(asctime)s | %(levelname)s | %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-security_handler.setFormatter(security_formatter)
-security_logger.addHandler(security_handler)
+
+LOG_FORMAT = '%(asctime)s | %(levelname)s | %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def init_audit_logging(app):
+    """
+    Attach queue-backed, batching, size-rotated file handlers to the audit
+    and security loggers (see app/utils/log_pipeline.py), plus the audit
+    event store when AUDIT_DB_ENABLED.
+    """
+    from app.utils.audit_store import AuditStoreHandler, audit_db_path
+    from app.utils.log_pipeline import BatchingRotatingFileHandler, attach_pipeline
+
+    store_path = audit_db_path(app) if app.config.get('AUDIT_DB_ENABLED') else None
+
+    for logger, path in ((audit_logger, app.config['AUDIT_LOG_FILE']),
+                         (security_logger, app.config['SECURITY_LOG_FILE'])):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        file_handler = BatchingRotatingFileHandler(
+            path,
+            max_bytes=app.config['AUDIT_LOG_MAX_BYTES'],
+            backup_count=app.config['AUDIT_LOG_BACKUP_COUNT']
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+
+        handlers = [file_handler]
+        if store_path:
+            # Indexed, searchable copy of every event (admin audit search)
+            handlers.append(AuditStoreHandler(store_path))
+
+        attach_pipeline(
+            logger,
+            handlers,
+            queue_size=app.config['AUDIT_LOG_QUEUE_SIZE'],
+            overflow=app.config['AUDIT_LOG_OVERFLOW'],
+            batch_size=app.config['AUDIT_LOG_BATCH_SIZE']
+        )
+        # Records go to the files only; propagating to the root logger's
+        # console handler would put a synchronous write back on the request
+        logger.propagate = False
 
 
 class AuditLogger:
@@ -114,6 +141,16 @@ class AuditLogger:
         })
         audit_logger.info(log_msg)
     
+    @staticmethod
+    def log_grants_imported(user_id, grants_imported: int, rejected_count: int):
+        """Log a bulk grant import."""
+        log_msg = AuditLogger._format_log('GRANTS_IMPORTED', {
+            'owner_user_id': user_id,
+            'grants_imported': grants_imported,
+            'rejected_count': rejected_count
+        })
+        audit_logger.info(log_msg)
+    
     @staticmethod
     def log_grant_modified(grant_id: int, changes: dict):
         """Log grant modification."""
@@ -0,0 +1,200 @@
+"""
+Append-only, indexed audit event store.
+
+Audit and security records are also written to a separate SQLite database
+(AUDIT_DB_PATH, default <instance>/audit.db) by a handler on the log
+pipeline, so investigating one user or IP is an index lookup instead of a
+grep through the log files. Each pipeline batch becomes one executemany in
+one transaction. UPDATE and DELETE are rejected by triggers.
+
+Search uses keyset pagination on the event id (newest first): the next page
+is "id < last id seen", which stays fast however deep the page.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    level TEXT NOT NULL,
+    source TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    user_id INTEGER,
+    username TEXT,
+    ip_address TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_audit_events_timestamp ON audit_events (timestamp);
+CREATE INDEX IF NOT EXISTS ix_audit_events_event_type ON audit_events (event_type);
+CREATE INDEX IF NOT EXISTS ix_audit_events_user_id ON audit_events (user_id);
+CREATE INDEX IF NOT EXISTS ix_audit_events_username ON audit_events (username);
+CREATE INDEX IF NOT EXISTS ix_audit_events_ip_address ON audit_events (ip_address);
+CREATE TRIGGER IF NOT EXISTS audit_events_no_update BEFORE UPDATE ON audit_events
+BEGIN SELECT RAISE(ABORT, 'audit_events is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS audit_events_no_delete BEFORE DELETE ON audit_events
+BEGIN SELECT RAISE(ABORT, 'audit_events is append-only'); END;
+"""
+
+INSERT_SQL = """
+INSERT INTO audit_events (timestamp, level, source, event_type, user_id, username, ip_address, details)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Keys stored in their own columns rather than in details
+COLUMN_KEYS = ('timestamp', 'event_type', 'user_id', 'username', 'ip_address')
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def connect(path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open the audit database, creating the schema if needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=check_same_thread)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def record_to_row(record: logging.LogRecord) -> tuple:
+    """Map a record written by AuditLogger (JSON message) to an audit_events row."""
+    message = record.getMessage()
+    try:
+        entry = json.loads(message)
+        if not isinstance(entry, dict):
+            raise ValueError
+    except ValueError:
+        entry = {'event_type': 'UNSTRUCTURED', 'message': message}
+
+    details = {k: v for k, v in entry.items() if k not in COLUMN_KEYS}
+    user_id = entry.get('user_id')
+    return (
+        entry.get('timestamp') or datetime.utcfromtimestamp(record.created).isoformat(),
+        record.levelname,
+        record.name,
+        str(entry.get('event_type') or 'UNKNOWN'),
+        user_id if isinstance(user_id, int) else None,
+        entry.get('username'),
+        entry.get('ip_address'),
+        json.dumps(details, default=str) if details else None
+    )
+
+
+class AuditStoreHandler(logging.Handler):
+    """Log pipeline handler inserting each batch into the audit database."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._conn = None  # opened lazily on the listener thread, closed at shutdown
+
+    def emit_batch(self, records: List[logging.LogRecord]):
+        rows = [record_to_row(record) for record in records]
+        with self.lock:
+            if self._conn is None:
+                # Guarded by self.lock; close() runs on the shutdown thread
+                self._conn = connect(self.path, check_same_thread=False)
+            with self._conn:
+                self._conn.executemany(INSERT_SQL, rows)
+
+    def emit(self, record):
+        try:
+            self.emit_batch([record])
+        except Exception:
+            self.handleError(record)
+
+    def reset_after_fork(self):
+        # The parent's SQLite connection must not be used (or closed) here
+        self._conn = None
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        super().close()
+
+
+def search_events(path: str, event_type: Optional[str] = None, user_id: Optional[int] = None,
+                  username: Optional[str] = None, ip_address: Optional[str] = None,
+                  since: Optional[str] = None, until: Optional[str] = None,
+                  before_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> dict:
+    """
+    Newest-first page of audit events matching every given filter.
+
+    Args:
+        user_id, username: Events for one account. Given together they match
+            either column: security events (failed logins, lockouts) are
+            logged before login, so they carry only the username.
+        since, until: ISO timestamps (inclusive lower / exclusive upper bound)
+        before_id: Keyset cursor: only events with a smaller id (next page)
+        limit: Page size (capped at MAX_PAGE_SIZE)
+
+    Returns:
+        dict: {'events': [row dicts], 'next_before_id': int or None}
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    clauses, params = [], []
+    for column, value in (('event_type', event_type), ('ip_address', ip_address)):
+        if value not in (None, ''):
+            clauses.append(f'{column} = ?')
+            params.append(value)
+    account = [(column, value) for column, value in (('user_id', user_id), ('username', username))
+               if value not in (None, '')]
+    if account:
+        clauses.append('(' + ' OR '.join(f'{column} = ?' for column, _ in account) + ')')
+        params.extend(value for _, value in account)
+    if since:
+        clauses.append('timestamp >= ?')
+        params.append(since)
+    if until:
+        clauses.append('timestamp < ?')
+        params.append(until)
+    if before_id:
+        clauses.append('id < ?')
+        params.append(int(before_id))
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    sql = f'SELECT * FROM audit_events {where} ORDER BY id DESC LIMIT ?'
+
+    if not os.path.exists(path):
+        return {'events': [], 'next_before_id': None}
+    conn = connect(path)
+    try:
+        rows = conn.execute(sql, params + [limit + 1]).fetchall()
+    finally:
+        conn.close()
+
+    events = []
+    for row in rows[:limit]:
+        event = dict(row)
+        event['details'] = json.loads(event['details']) if event['details'] else {}
+        events.append(event)
+    next_before_id = events[-1]['id'] if len(rows) > limit else None
+    return {'events': events, 'next_before_id': next_before_id}
+
+
+def event_types(path: str) -> List[str]:
+    """Distinct event types in the store (for the search form)."""
+    if not os.path.exists(path):
+        return []
+    conn = connect(path)
+    try:
+        return [r[0] for r in conn.execute('SELECT DISTINCT event_type FROM audit_events ORDER BY event_type')]
+    finally:
+        conn.close()
+
+
+def audit_db_path(app) -> str:
+    """Configured audit database path (defaults to <instance>/audit.db)."""
+    return app.config.get('AUDIT_DB_PATH') or os.path.join(app.instance_path, 'audit.db')
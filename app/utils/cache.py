@@ -0,0 +1,271 @@
+"""
+Cache invalidation helpers shared across gunicorn workers.
+
+Each worker keeps its own in-memory caches. Named version counters stored as
+small files in the instance folder tell every worker when to drop them: a
+writer bumps the counter, and readers compare it with the version their cached
+data was built from.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+from flask import current_app, has_app_context
+
+from app import db
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development only
+    fcntl = None
+
+
+# Shared version counter names
+TAX_BRACKETS_VERSION = 'tax_brackets'
+STOCK_PRICES_VERSION = 'stock_prices'
+
+# Last observed (inode, mtime_ns) and value per version file, so unchanged
+# counters cost one stat() instead of a read.
+_seen: Dict[str, Tuple[Tuple[int, int], int]] = {}
+_created_dirs = set()
+_lock = threading.Lock()
+
+
+def _version_dir() -> str:
+    path = current_app.config.get('CACHE_VERSION_DIR') or os.path.join(current_app.instance_path, 'versions')
+    if path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+    return path
+
+
+def _version_path(name: str) -> str:
+    return os.path.join(_version_dir(), f'{name}.version')
+
+
+def get_version(name: str) -> int:
+    """Return the current value of a named version counter (0 if never bumped)."""
+    path = _version_path(name)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return 0
+
+    stamp = (st.st_ino, st.st_mtime_ns)
+    seen = _seen.get(path)
+    if seen and seen[0] == stamp:
+        return seen[1]
+
+    try:
+        with open(path) as f:
+            value = int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+    _seen[path] = (stamp, value)
+    return value
+
+
+def bump_version(name: str) -> int:
+    """
+    Increment a named version counter and return the new value.
+
+    The file is rewritten atomically under an exclusive lock, so concurrent
+    bumps from several workers never lose an increment.
+    """
+    path = _version_path(name)
+    with _lock, open(path + '.lock', 'w') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            with open(path) as f:
+                value = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            value = 0
+        value += 1
+
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(value))
+        os.replace(tmp_path, path)
+    return value
+
+
+def get_user_version(user_id: int) -> int:
+    """Version of one user's grants, vest events and tax profile."""
+    return get_version(f'user-{user_id}')
+
+
+def bump_user_version(user_id: int) -> int:
+    """Mark one user's cached data as stale in every worker."""
+    return bump_version(f'user-{user_id}')
+
+
+def get_account_version(user_id: int) -> int:
+    """Version of one user's account row (password, lockout, admin flag, ...)."""
+    return get_version(f'account-{user_id}')
+
+
+def bump_account_version(user_id: int) -> int:
+    """Mark one user's cached account fields as stale in every worker."""
+    return bump_version(f'account-{user_id}')
+
+
+def user_stamp(user_id: int) -> Tuple[int, int, int]:
+    """Stamp covering everything a per-user computation depends on."""
+    return (
+        get_user_version(user_id),
+        get_version(STOCK_PRICES_VERSION),
+        get_version(TAX_BRACKETS_VERSION)
+    )
+
+
+_MISSING = object()
+
+
+class VersionedCache:
+    """
+    Per-worker LRU cache whose entries are only valid for a version stamp.
+
+    Entries built from older data are treated as misses and replaced, so no
+    explicit purge is needed when a version counter moves.
+    """
+
+    def __init__(self, name: str, maxsize: int = 256):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[Hashable, Tuple[Any, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, stamp: Any, default: Any = None) -> Any:
+        """Return the cached value for ``key`` if it was stored with ``stamp``."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] == stamp:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, stamp: Any, value: Any) -> None:
+        """Store ``value`` for ``key`` at ``stamp``, evicting the least recently used entry."""
+        with self._lock:
+            self._data[key] = (stamp, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, stamp: Any, compute: Callable[[], Any]) -> Any:
+        """Return the cached value, computing and storing it on a miss."""
+        value = self.get(key, stamp, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, stamp, value)
+        return value
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss counters (cached entries are kept)."""
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drop one entry, or every entry when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+# All VersionedCache instances by name (used for statistics)
+_registry: Dict[str, VersionedCache] = {}
+
+
+def get_caches() -> Iterable[VersionedCache]:
+    """Return every registered VersionedCache."""
+    return list(_registry.values())
+
+
+# Model change tracking ----------------------------------------------------
+
+def _changed_user_ids(session) -> set:
+    """Collect user ids whose grants, vest events or tax profile are in this flush."""
+    from app.models.grant import Grant
+    from app.models.vest_event import VestEvent
+    from app.models.tax_rate import UserTaxProfile
+
+    user_ids = set()
+    grant_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Grant, UserTaxProfile)):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, VestEvent):
+            if obj.user_id is not None:
+                user_ids.add(obj.user_id)
+            else:
+                grant_ids.add(obj.grant_id)
+
+    grant_ids.discard(None)
+    if grant_ids:
+        # Use the flush connection directly: querying through the session
+        # here would trigger a nested autoflush.
+        rows = session.connection().execute(
+            db.select(Grant.user_id).where(Grant.id.in_(grant_ids))
+        )
+        user_ids.update(row[0] for row in rows)
+
+    user_ids.discard(None)
+    return user_ids
+
+
+def _changed_account_ids(session) -> set:
+    """Collect ids of users whose own row is in this flush."""
+    from app.models.user import User
+
+    return {obj.id for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+            if isinstance(obj, User) and obj.id is not None}
+
+
+def _after_flush(session, flush_context) -> None:
+    user_ids = _changed_user_ids(session)
+    if user_ids:
+        session.info.setdefault('changed_user_ids', set()).update(user_ids)
+    account_ids = _changed_account_ids(session)
+    if account_ids:
+        session.info.setdefault('changed_account_ids', set()).update(account_ids)
+
+
+def _after_commit(session) -> None:
+    if not has_app_context():
+        session.info.pop('changed_user_ids', None)
+        session.info.pop('changed_account_ids', None)
+        return
+    for user_id in session.info.pop('changed_user_ids', ()):
+        bump_user_version(user_id)
+    for user_id in session.info.pop('changed_account_ids', ()):
+        bump_account_version(user_id)
+
+
+def _after_rollback(session, previous_transaction) -> None:
+    session.info.pop('changed_user_ids', None)
+    session.info.pop('changed_account_ids', None)
+
+
+def register_model_events() -> None:
+    """Bump per-user data and account versions whenever a commit touches them."""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    if event.contains(Session, 'after_flush', _after_flush):
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_soft_rollback', _after_rollback)
@@ -0,0 +1,110 @@
+"""
+Response compression for HTML and JSON.
+
+An after_request hook compresses bodies with brotli (when the optional
+``brotli`` package is installed and the client accepts ``br``) or gzip. A
+response is left alone when it is:
+
+- not one of COMPRESS_MIMETYPES, or smaller than COMPRESS_MIN_SIZE bytes;
+- already encoded (precompressed /assets/ files) or marked no-transform;
+- streamed (CSV/NDJSON exports), a file passthrough, or a 1xx/204/304.
+
+A strong ETag becomes weak on the compressed representation, because the
+bytes differ from the identity body. If-None-Match uses weak comparison, so
+a revalidation still matches and returns 304.
+
+The hook is registered before any other after_request function, so it runs
+last and compresses the final body.
+"""
+
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    'text/html',
+    'text/plain',
+    'text/csv',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'image/svg+xml',
+)
+
+
+def choose_encoding(accept_encodings, allow_brotli: bool = True):
+    """The encoding to use for this client: 'br', 'gzip' or None."""
+    if allow_brotli and brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str, level: int, br_level: int) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=br_level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def should_compress(response, mimetypes, min_size: int) -> bool:
+    """Cheap checks that don't need the body."""
+    if response.status_code < 200 or response.status_code in (204, 304):
+        return False
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if 'Content-Encoding' in response.headers or response.cache_control.no_transform:
+        return False
+    if response.mimetype not in mimetypes:
+        return False
+    length = response.content_length
+    return length is None or length >= min_size
+
+
+def init_compression(app) -> bool:
+    """
+    Register the compression hook when COMPRESS_ENABLED.
+
+    Call before other after_request hooks are registered.
+
+    Returns:
+        bool: whether compression was enabled
+    """
+    if not app.config.get('COMPRESS_ENABLED'):
+        return False
+
+    mimetypes = frozenset(app.config.get('COMPRESS_MIMETYPES') or DEFAULT_MIMETYPES)
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+    level = app.config.get('COMPRESS_LEVEL', 6)
+    br_level = app.config.get('COMPRESS_BR_LEVEL', 4)
+    allow_brotli = app.config.get('COMPRESS_BROTLI', True)
+
+    @app.after_request
+    def compress_response(response):
+        if not should_compress(response, mimetypes, min_size):
+            return response
+
+        # The representation depends on Accept-Encoding even when not compressed
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings, allow_brotli)
+        if encoding is None or request.method == 'HEAD':
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        response.set_data(compress(data, encoding, level, br_level))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    return True
@@ -0,0 +1,235 @@
+"""
+Dashboard data shared by the dashboard page and the JSON API.
+
+Grants and their vest events are loaded with two queries (selectinload) and
+prices come from the in-memory price index, so building the dashboard costs
+two round trips however many grants a user has. The result is cached per
+user until their data, the stock prices or the date changes.
+"""
+
+import json
+from datetime import date
+from typing import Iterable, List
+
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models.grant import Grant
+from app.utils.cache import VersionedCache, user_stamp
+from app.utils.init_db import get_price_history
+
+# Bumped when the JSON layout changes incompatibly (/api/v<N>/dashboard)
+API_VERSION = 1
+
+SECTIONS = ('summary', 'upcoming_vests', 'timeline')
+
+UPCOMING_VESTS = 5
+
+TIMELINE_FIELDS = ('date', 'vested_shares', 'total_shares', 'vested_value', 'total_value',
+                   'is_vested', 'price_at_date', 'event_type')
+
+# Built dashboards by user id, and their JSON text by (user id, sections)
+dashboard_cache = VersionedCache('dashboard', maxsize=1024)
+
+
+def load_grants(user_id: int) -> List[Grant]:
+    """A user's grants with vest_events populated (two queries)."""
+    return db.session.scalars(
+        db.select(Grant)
+        .where(Grant.user_id == user_id)
+        .options(selectinload(Grant.vest_events))
+        .order_by(Grant.id)
+    ).all()
+
+
+def build_timeline(vest_events: list, prices: Iterable[tuple], today: date) -> List[dict]:
+    """
+    Cumulative vested/total shares and value at every vest and price change.
+
+    Args:
+        vest_events: The user's vest events in vest_date order
+        prices: (valuation_date, price) pairs in date order
+
+    Returns:
+        list: one dict per point with TIMELINE_FIELDS keys
+    """
+    timeline_events = [{'date': vest.vest_date, 'type': 'vest', 'vest': vest} for vest in vest_events]
+    timeline_events.extend({'date': d, 'type': 'price_update', 'price': p} for d, p in prices)
+    # Stable sort: on the same date, vests come before the price update
+    timeline_events.sort(key=lambda x: x['date'])
+
+    vesting_timeline = []
+    cumulative_vested_value = 0
+    cumulative_total_value = 0
+    cumulative_vested_shares = 0
+    cumulative_total_shares = 0
+    current_price = 0
+
+    for event in timeline_events:
+        event_date = event['date']
+
+        if event['type'] == 'price_update':
+            # Recalculate from scratch when price changes: ISOs use the
+            # spread (price - strike), so every vest's value moves
+            current_price = event['price']
+            cumulative_vested_value = 0
+            cumulative_total_value = 0
+
+            for vest in vest_events:
+                if vest.vest_date <= event_date:
+                    grant = vest.grant
+                    shares = vest.shares_vested
+
+                    if grant.share_type in ['iso_5y', 'iso_6y']:
+                        value = shares * (current_price - grant.share_price_at_grant)
+                    else:
+                        value = shares * current_price
+
+                    cumulative_total_value += value
+                    if vest.has_vested:
+                        cumulative_vested_value += value
+
+        elif event['type'] == 'vest':
+            vest = event['vest']
+            grant = vest.grant
+            shares = vest.shares_vested
+
+            # Use most recent price
+            if not current_price:
+                continue
+
+            if grant.share_type in ['iso_5y', 'iso_6y']:
+                value = shares * (current_price - grant.share_price_at_grant)
+            else:
+                value = shares * current_price
+
+            cumulative_total_value += value
+            cumulative_total_shares += shares
+
+            if vest.has_vested:
+                cumulative_vested_value += value
+                cumulative_vested_shares += shares
+
+        # Only add timeline point if we have data
+        if current_price > 0 and cumulative_total_shares > 0:
+            vesting_timeline.append({
+                'date': event_date.strftime('%Y-%m-%d'),
+                'vested_shares': cumulative_vested_shares,
+                'total_shares': cumulative_total_shares,
+                'vested_value': cumulative_vested_value,
+                'total_value': cumulative_total_value,
+                'is_vested': event_date <= today,
+                'price_at_date': current_price,
+                'event_type': event['type']
+            })
+
+    return vesting_timeline
+
+
+def build_dashboard(user_id: int, today: date) -> dict:
+    """
+    Compute every dashboard figure for one user.
+
+    Returns:
+        dict: {'summary': {...}, 'upcoming_vests': [vest dicts],
+               'timeline': [point dicts], 'current_price': float}
+    """
+    grants = load_grants(user_id)
+    vest_events = sorted((v for g in grants for v in g.vest_events), key=lambda v: v.vest_date)
+    prices = get_price_history()
+
+    # Vested values use the page's placeholder price (per-user prices are not wired up yet)
+    placeholder_price = 0
+    vested_events = [v for v in vest_events if v.has_vested]
+    vested_shares_gross = sum(v.shares_vested for v in vested_events)
+    vested_shares_net = sum(v.shares_received for v in vested_events)
+
+    # The latest price on record, as the timeline ends with it
+    current_price = prices[-1][1] if prices else 0
+
+    upcoming_vests = [
+        {
+            'id': v.id,
+            'grant_id': v.grant_id,
+            'vest_date': v.vest_date,
+            'shares_vested': v.shares_vested,
+            'value': v.shares_vested * current_price
+        }
+        for v in vest_events if v.vest_date >= today
+    ][:UPCOMING_VESTS]
+
+    return {
+        'summary': {
+            'total_grants': len(grants),
+            'total_shares': sum(g.share_quantity for g in grants),
+            'total_value': sum(g.current_value for g in grants),
+            'vested_shares_gross': vested_shares_gross,
+            'vested_shares_net': vested_shares_net,
+            'vested_value_gross': vested_shares_gross * placeholder_price,
+            'vested_value_net': vested_shares_net * placeholder_price,
+            'current_price': current_price
+        },
+        'upcoming_vests': upcoming_vests,
+        'timeline': build_timeline(vest_events, prices, today)
+    }
+
+
+def _stamp(user_id: int, today: date) -> tuple:
+    return user_stamp(user_id) + (today,)
+
+
+def get_dashboard(user_id: int) -> dict:
+    """Cached build_dashboard for today (rebuilt when the user's data or prices change)."""
+    today = date.today()
+    return dashboard_cache.get_or_compute(
+        user_id,
+        _stamp(user_id, today),
+        lambda: build_dashboard(user_id, today)
+    )
+
+
+def _rounded(value, places: int):
+    return round(value, places) if isinstance(value, float) else value
+
+
+def serialize_dashboard(data: dict, sections: Iterable[str] = SECTIONS) -> dict:
+    """
+    Compact JSON form of get_dashboard() output.
+
+    The timeline is columnar ({field: [values]}) so field names appear once,
+    and floats are rounded to cents (values) or 4 places (shares).
+
+    Returns:
+        dict: {'version', 'as_of', and each requested section}
+    """
+    result = {'version': API_VERSION, 'as_of': date.today().isoformat()}
+    if 'summary' in sections:
+        result['summary'] = {k: _rounded(v, 4 if 'shares' in k else 2) for k, v in data['summary'].items()}
+    if 'upcoming_vests' in sections:
+        result['upcoming_vests'] = [
+            {
+                'id': v['id'],
+                'grant_id': v['grant_id'],
+                'vest_date': v['vest_date'].isoformat(),
+                'shares_vested': _rounded(v['shares_vested'], 4),
+                'value': _rounded(v['value'], 2)
+            }
+            for v in data['upcoming_vests']
+        ]
+    if 'timeline' in sections:
+        result['timeline'] = {
+            field: [_rounded(point[field], 4 if 'shares' in field else 2) for point in data['timeline']]
+            for field in TIMELINE_FIELDS
+        }
+    return result
+
+
+def get_dashboard_json(user_id: int, sections: Iterable[str] = SECTIONS) -> str:
+    """Cached compact JSON text of serialize_dashboard() for the requested sections."""
+    sections = tuple(sections)
+    today = date.today()
+    return dashboard_cache.get_or_compute(
+        (user_id, sections),
+        _stamp(user_id, today),
+        lambda: json.dumps(serialize_dashboard(get_dashboard(user_id), sections), separators=(',', ':'))
+    )
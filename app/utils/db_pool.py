@@ -0,0 +1,240 @@
+"""
+Connection pool sizing and instrumentation.
+
+Each gunicorn worker owns its own engine and pool, so the settings below are
+per worker: the database sees up to workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+connections.
+
+Pre-ping strategies (DB_PRE_PING):
+- always  test every connection on checkout (one extra round trip per checkout)
+- idle    test only connections idle longer than DB_PRE_PING_IDLE seconds
+- never   rely on pool_recycle and disconnect detection on error
+
+Pool metrics (checkouts, waits, wait time, overflow, invalidations) are kept
+per worker and returned by pool_stats().
+"""
+
+import logging
+import os
+import threading
+import time
+import weakref
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+PRE_PING_STRATEGIES = ('always', 'idle', 'never')
+
+# SQLAlchemy names pool loggers after the pool class's module; keep this one at
+# SQLAlchemy's default WARN level so checkouts aren't logged at DEBUG
+logging.getLogger(__name__).setLevel(logging.WARNING)
+
+
+class PoolMetrics:
+    """Thread-safe counters for one worker's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset_after_fork(self):
+        # The inherited lock may have been held by a parent thread at fork time
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.waits = 0
+            self.wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+            self.timeouts = 0
+            self.overflow_connects = 0
+            self.peak_overflow = 0
+            self.invalidations = 0
+            self.pings = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def record_overflow(self, overflow: int):
+        with self._lock:
+            if overflow > 0:
+                self.overflow_connects += 1
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'wait_seconds': self.wait_seconds,
+                'max_wait_seconds': self.max_wait_seconds,
+                'timeouts': self.timeouts,
+                'overflow_connects': self.overflow_connects,
+                'peak_overflow': self.peak_overflow,
+                'invalidations': self.invalidations,
+                'pings': self.pings
+            }
+
+
+metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times checkouts which had to wait for a free connection."""
+
+    _depth = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outer call
+        if getattr(self._depth, 'active', False):
+            return super()._do_get()
+
+        # No idle connection and no overflow room left: this checkout queues
+        must_wait = (self._pool.empty() and self._max_overflow > -1
+                     and self._overflow >= self._max_overflow)
+        started = time.perf_counter()
+        self._depth.active = True
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            must_wait = False
+            raise
+        finally:
+            self._depth.active = False
+            if must_wait:
+                metrics.record_wait(time.perf_counter() - started)
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(config) -> dict:
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS from the DB_POOL_* settings.
+
+    Returns:
+        dict: keyword arguments for create_engine
+    """
+    strategy = (config.get('DB_PRE_PING') or 'always').lower()
+    if strategy not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DB_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}, got {strategy!r}")
+
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    options['pool_pre_ping'] = strategy == 'always'
+    options.setdefault('pool_recycle', config.get('DB_POOL_RECYCLE', 300))
+
+    # In-memory SQLite uses a single-connection pool that can't be sized
+    if _is_memory_sqlite(make_url(config['SQLALCHEMY_DATABASE_URI'])):
+        return options
+
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+    })
+    return options
+
+
+def instrument_engine(config, engine) -> None:
+    """Attach metrics listeners and the idle pre-ping check to ``engine``'s pool."""
+    pool = engine.pool
+    idle_ping = (config.get('DB_PRE_PING') or 'always').lower() == 'idle'
+    idle_seconds = config.get('DB_PRE_PING_IDLE', 30)
+
+    @event.listens_for(pool, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr('connects')
+        if isinstance(pool, QueuePool):
+            metrics.record_overflow(pool.overflow())
+
+    @event.listens_for(pool, 'checkout')
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr('checkouts')
+        if not idle_ping:
+            return
+        last_used = connection_record.info.get('last_checkin')
+        if last_used is not None and time.monotonic() - last_used > idle_seconds:
+            metrics.incr('pings')
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            except Exception:
+                # The pool discards this connection and retries with a new one
+                raise exc.DisconnectionError()
+            finally:
+                cursor.close()
+
+    @event.listens_for(pool, 'checkin')
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info['last_checkin'] = time.monotonic()
+
+    @event.listens_for(pool, 'invalidate')
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr('invalidations')
+
+    @event.listens_for(pool, 'soft_invalidate')
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr('invalidations')
+
+
+def pool_stats(engine) -> dict:
+    """
+    Current pool state plus this worker's cumulative metrics.
+
+    Returns:
+        dict: {'pool': class name, 'size', 'checked_out', 'overflow', 'idle',
+               'metrics': {...}}
+    """
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+            'idle': pool.checkedin()
+        })
+    stats['metrics'] = metrics.snapshot()
+    return stats
+
+
+# Engines whose pools must not be shared with forked children
+_fork_engines = weakref.WeakSet()
+
+
+def _dispose_in_child():
+    for engine in list(_fork_engines):
+        # close=False: the parent still owns those sockets/file handles
+        engine.dispose(close=False)
+    metrics.reset()
+
+
+def dispose_after_fork(engine) -> None:
+    """
+    Give each forked worker a fresh pool (gunicorn --preload).
+
+    Connections opened by the parent during startup are dropped, not closed,
+    in the child so the two processes never share a connection.
+    """
+    _fork_engines.add(engine)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_in_child)
@@ -3,7 +3,7 @@ Security decorators for route protection and access control.
 """
 
 from functools import wraps
-from flask import abort, redirect, url_for, flash
+from flask import abort, current_app, flash, make_response, redirect, request, url_for
 from flask_login import current_user
 from app.utils.audit_log import AuditLogger
 
@@ -134,12 +134,22 @@ def verified_email_required(f):
     return decorated_function
 
 
-def rate_limit_user(limit: str):
+def rate_limit_user(limit: str, ip_limit: str = None, scope: str = None, methods: tuple = None):
     """
     Per-user rate limiting decorator.
     
+    Token buckets are shared by all workers (see app/utils/rate_limit.py).
+    Authenticated requests draw from a bucket per user; anonymous requests
+    from a bucket per client IP. ``ip_limit`` adds a second bucket per client
+    IP that applies whether or not the user is logged in. Over the limit the
+    request is rejected with 429 and a Retry-After header.
+    
     Args:
-        limit: Rate limit string (e.g., "10 per minute")
+        limit: Rate limit string (e.g., "10 per minute") or the name of a
+            config key holding one (e.g., "RATELIMIT_HEAVY_USER")
+        ip_limit: Optional per-IP rate limit string or config key
+        scope: Bucket name shared by several routes (defaults to the route)
+        methods: Only limit these HTTP methods (e.g., ('POST',)); default all
         
     Usage:
         @rate_limit_user("5 per minute")
@@ -147,10 +157,80 @@ def rate_limit_user(limit: str):
             ...
     """
     def decorator(f):
+        bucket_scope = scope or f.__name__
+        
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # This would integrate with Flask-Limiter
-            # For now, just pass through
-            return f(*args, **kwargs)
+            if not current_app.config.get('RATELIMIT_ENABLED', True) or (
+                    methods and request.method not in methods):
+                return f(*args, **kwargs)
+            
+            from app.utils.rate_limit import check, most_restrictive, parse_limit
+            
+            client_ip = request.remote_addr or 'unknown'
+            user_limit = parse_limit(current_app.config.get(limit, limit))
+            if current_user.is_authenticated:
+                decisions = [check(f'{bucket_scope}:user', str(current_user.id), user_limit)]
+            else:
+                decisions = [check(f'{bucket_scope}:ip', client_ip, user_limit)]
+            if ip_limit:
+                decisions.append(check(f'{bucket_scope}:ip-all', client_ip,
+                                       parse_limit(current_app.config.get(ip_limit, ip_limit))))
+            decision = most_restrictive(decisions)
+            
+            if not decision.allowed:
+                from app.utils.metrics import incr
+                incr('vestx_rate_limited_total', scope=bucket_scope)
+                abort(429, description=f'Rate limit of {decision.limit} exceeded',
+                      retry_after=decision.retry_after)
+            
+            response = make_response(f(*args, **kwargs))
+            if current_app.config.get('RATELIMIT_HEADERS_ENABLED'):
+                response.headers['X-RateLimit-Limit'] = str(decision.limit)
+                response.headers['X-RateLimit-Remaining'] = str(decision.remaining)
+            return response
         return decorated_function
     return decorator
+
+
+def private_etag(f):
+    """
+    Conditional GET for pages built only from the current user's data.
+    
+    Responses carry ``Cache-Control: private, no-cache`` and an ETag from the
+    user's data version, the price and tax bracket versions, today's date and
+    the session (see app/utils/http_cache.py). A revisit with a matching
+    If-None-Match gets a 304 without running the view. Other methods, and
+    requests with flash messages pending, always run the view.
+    
+    Usage:
+        @login_required
+        @private_etag
+        def user_page():
+            ...
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if request.method != 'GET' or not current_user.is_authenticated:
+            return f(*args, **kwargs)
+        
+        from app.utils.http_cache import has_pending_flashes, user_page_etag
+        
+        if has_pending_flashes():
+            response = make_response(f(*args, **kwargs))
+            response.cache_control.private = True
+            response.cache_control.no_store = True
+            return response
+        
+        etag = user_page_etag()
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    return decorated_function
@@ -18,6 +18,8 @@ from cryptography.fernet import Fernet, InvalidToken
 import os
 from typing import Optional
 
+from app.utils.metrics import incr
+
 
 class EncryptionError(Exception):
     pass
@@ -69,6 +71,7 @@ def generate_user_key() -> bytes:
 def encrypt_with_master(plaintext: bytes) -> bytes:
     """Encrypt bytes using the master key. Returns ciphertext bytes."""
     f = get_master_fernet()
+    incr('vestx_fernet_operations_total', operation='encrypt', key='master')
     return f.encrypt(plaintext)
 
 
@@ -78,6 +81,7 @@ def decrypt_with_master(token: bytes) -> bytes:
     Raises EncryptionError for invalid token.
     """
     f = get_master_fernet()
+    incr('vestx_fernet_operations_total', operation='decrypt', key='master')
     try:
         return f.decrypt(token)
     except InvalidToken:
@@ -89,6 +93,7 @@ def encrypt_for_user(user_key: bytes, plaintext: str) -> bytes:
     if isinstance(user_key, str):
         user_key = user_key.encode()
     f = Fernet(user_key)
+    incr('vestx_fernet_operations_total', operation='encrypt', key='user')
     return f.encrypt(plaintext.encode())
 
 
@@ -100,6 +105,7 @@ def decrypt_for_user(user_key: bytes, token: bytes) -> str:
     if isinstance(user_key, str):
         user_key = user_key.encode()
     f = Fernet(user_key)
+    incr('vestx_fernet_operations_total', operation='decrypt', key='user')
     try:
         return f.decrypt(token).decode()
     except InvalidToken:
@@ -0,0 +1,185 @@
+"""
+Streaming CSV / NDJSON export of vest schedules and finance analyses.
+
+Rows are produced by a generator over a batched server-side query
+(``yield_per``), so memory stays flat however many events an export covers:
+only one batch of VestEvents is alive at a time and output is flushed to the
+client batch by batch.
+"""
+
+import csv
+import io
+import json
+from datetime import date
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from flask import Response, stream_with_context
+from sqlalchemy.orm import contains_eager
+
+from app import db
+from app.models.vest_event import VestEvent
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+# Rows fetched (and flushed to the client) per round trip
+BATCH_SIZE = 500
+
+SCHEDULE_FIELDS = [
+    'vest_event_id', 'grant_id', 'grant_date', 'grant_type', 'share_type',
+    'vest_date', 'has_vested', 'shares_vested', 'share_price_at_vest',
+    'value_at_vest', 'shares_withheld_for_taxes', 'shares_received',
+    'cash_paid', 'shares_sold', 'tax_withheld', 'net_value'
+]
+
+DEEP_DIVE_FIELDS = [
+    'vest_event_id', 'grant_id', 'grant_type', 'share_type', 'vest_date',
+    'has_vested', 'shares_held', 'cost_basis_per_share', 'cost_basis',
+    'current_value', 'unrealized_gain', 'days_held', 'is_long_term',
+    'tax_amount', 'tax_is_estimated', 'tax_rate'
+]
+
+# Extra leading columns for admin-wide exports
+ADMIN_FIELDS = ['user_id', 'username']
+
+
+def vest_event_analysis(ve: VestEvent, today: date, latest_stock_price: float) -> dict:
+    """
+    Holding, cost basis, gain and tax figures for one vest event.
+
+    Shared by the finance deep dive page and its export. For cash grants,
+    share amounts are USD and carry no gain.
+    """
+    has_vested = ve.vest_date <= today
+    tax_info = ve.estimate_tax_withholding(latest_stock_price)
+    shares_held = ve.shares_received if has_vested else ve.shares_vested
+
+    if ve.grant.share_type == 'cash':
+        cost_basis_per_share = 1.0  # $1 per $1 for cash
+        cost_basis = shares_held
+        current_value = shares_held
+        unrealized_gain = 0.0
+    else:
+        cost_basis_per_share = ve.share_price_at_vest
+        cost_basis = shares_held * cost_basis_per_share
+        current_value = shares_held * latest_stock_price
+        unrealized_gain = current_value - cost_basis
+
+    days_held = (today - ve.vest_date).days if has_vested else 0
+
+    return {
+        'has_vested': has_vested,
+        'shares_held': shares_held,
+        'cost_basis_per_share': cost_basis_per_share,
+        'cost_basis': cost_basis,
+        'current_value': current_value,
+        'unrealized_gain': unrealized_gain,
+        'days_held': days_held,
+        'is_long_term': days_held >= 365,
+        'tax_amount': tax_info['tax_amount'],
+        'tax_is_estimated': tax_info['is_estimated'],
+        'tax_rate': tax_info['tax_rate']
+    }
+
+
+def schedule_row(ve: VestEvent, today: date) -> dict:
+    """One vest schedule row, as shown on grants/schedule.html."""
+    grant = ve.grant
+    return {
+        'vest_event_id': ve.id,
+        'grant_id': grant.id,
+        'grant_date': grant.grant_date.isoformat(),
+        'grant_type': grant.grant_type,
+        'share_type': grant.share_type,
+        'vest_date': ve.vest_date.isoformat(),
+        'has_vested': ve.vest_date <= today,
+        'shares_vested': ve.shares_vested,
+        'share_price_at_vest': ve.share_price_at_vest,
+        'value_at_vest': ve.value_at_vest,
+        'shares_withheld_for_taxes': ve.shares_withheld_for_taxes,
+        'shares_received': ve.shares_received,
+        'cash_paid': ve.cash_paid or 0.0,
+        'shares_sold': ve.shares_sold or 0.0,
+        'tax_withheld': ve.tax_withheld,
+        'net_value': ve.net_value
+    }
+
+
+def deep_dive_row(ve: VestEvent, today: date, latest_stock_price: float) -> dict:
+    """One finance deep dive row."""
+    grant = ve.grant
+    row = {
+        'vest_event_id': ve.id,
+        'grant_id': grant.id,
+        'grant_type': grant.grant_type,
+        'share_type': grant.share_type,
+        'vest_date': ve.vest_date.isoformat()
+    }
+    row.update(vest_event_analysis(ve, today, latest_stock_price))
+    return row
+
+
+def iter_vest_events(user_id: Optional[int] = None, batch_size: int = BATCH_SIZE) -> Iterator[VestEvent]:
+    """
+    Stream VestEvents (with their grant) ordered by grant and vest date.
+
+    Args:
+        user_id: Only this user's events; None for every user (admin export)
+        batch_size: Rows fetched per round trip
+    """
+    query = (
+        db.select(VestEvent)
+        .join(VestEvent.grant)
+        .options(contains_eager(VestEvent.grant))
+        .order_by(VestEvent.grant_id, VestEvent.vest_date, VestEvent.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if user_id is not None:
+        query = query.where(VestEvent.user_id == user_id)
+    yield from db.session.scalars(query)
+
+
+def stream_export(rows: Iterable[dict], fields: List[str], fmt: str,
+                  batch_size: int = BATCH_SIZE) -> Iterator[str]:
+    """
+    Serialize ``rows`` as CSV (with header) or NDJSON, yielding one chunk per batch.
+
+    Raises:
+        ValueError: If ``fmt`` is not in EXPORT_FORMATS
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        write: Callable[[dict], None] = writer.writerow
+    else:
+        def write(row):
+            buffer.write(json.dumps({f: row.get(f) for f in fields}))
+            buffer.write('\n')
+
+    pending = 0
+    for row in rows:
+        write(row)
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    tail = buffer.getvalue()
+    if tail:
+        yield tail
+
+
+def export_response(rows: Iterable[dict], fields: List[str], fmt: str, filename: str) -> Response:
+    """Streamed attachment response for ``rows`` in ``fmt`` (csv or ndjson)."""
+    response = Response(stream_with_context(stream_export(rows, fields, fmt)),
+                        mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
@@ -0,0 +1,276 @@
+"""
+Bulk grant import from CSV.
+
+The file is parsed as a stream, one row at a time. Valid rows are collected
+into chunks; each chunk's vest schedules are computed together (grants with
+identical terms share one calculate_vest_schedule call) and the grants and
+their vest events are inserted with two executemany statements and committed
+as one transaction. Rejected rows are reported with their line number and do
+not stop the import.
+
+CSV columns (header required):
+    grant_date (YYYY-MM-DD), grant_type, share_type, share_quantity,
+    bonus_type, vest_years, espp_discount, notes, username
+
+Only the first four are required. ``username`` is used when no user is given
+for the whole file (admin CLI import).
+"""
+
+import csv
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app import db
+from app.models.grant import BonusType, Grant, GrantType, ShareType
+from app.models.user import User
+from app.models.vest_event import VestEvent
+from app.utils.cache import bump_user_version
+from app.utils.vest_calculator import calculate_vest_schedule, get_grant_configuration
+
+REQUIRED_COLUMNS = ('grant_date', 'grant_type', 'share_type', 'share_quantity')
+
+# Grants per transaction
+DEFAULT_CHUNK_SIZE = 1000
+
+# Rejected rows kept in the report (the count is always exact)
+MAX_REPORTED_ERRORS = 100
+
+GRANT_TYPES = {t.value for t in GrantType}
+SHARE_TYPES = {t.value for t in ShareType}
+BONUS_TYPES = {t.value for t in BonusType}
+
+
+class RowError(ValueError):
+    """A CSV row that can't be imported."""
+
+
+def _optional(row: dict, column: str) -> Optional[str]:
+    value = (row.get(column) or '').strip()
+    return value or None
+
+
+def parse_grant_row(row: dict, user_id: Optional[int], user_ids: Dict[str, int]) -> dict:
+    """
+    Validate one CSV row and return Grant column values.
+
+    Defaults mirror grants.add_grant: vesting terms from
+    get_grant_configuration unless vest_years is given, and a 15% ESPP discount.
+
+    Raises:
+        RowError: If the row is invalid
+    """
+    missing = [c for c in REQUIRED_COLUMNS if not _optional(row, c)]
+    if missing:
+        raise RowError(f"missing {', '.join(missing)}")
+
+    try:
+        grant_date = datetime.strptime(row['grant_date'].strip(), '%Y-%m-%d').date()
+    except ValueError:
+        raise RowError(f"invalid grant_date {row['grant_date']!r} (expected YYYY-MM-DD)")
+
+    grant_type = row['grant_type'].strip().lower()
+    if grant_type not in GRANT_TYPES:
+        raise RowError(f"unknown grant_type {grant_type!r}")
+    share_type = row['share_type'].strip().lower()
+    if share_type not in SHARE_TYPES:
+        raise RowError(f"unknown share_type {share_type!r}")
+
+    try:
+        share_quantity = float(row['share_quantity'])
+    except ValueError:
+        raise RowError(f"invalid share_quantity {row['share_quantity']!r}")
+    if share_quantity <= 0:
+        raise RowError("share_quantity must be positive")
+
+    bonus_type = _optional(row, 'bonus_type')
+    if bonus_type and bonus_type not in BONUS_TYPES:
+        raise RowError(f"unknown bonus_type {bonus_type!r}")
+
+    vest_years = _optional(row, 'vest_years')
+    if vest_years:
+        try:
+            vest_years = int(vest_years)
+        except ValueError:
+            raise RowError(f"invalid vest_years {vest_years!r}")
+        if not 1 <= vest_years <= 10:
+            raise RowError("vest_years must be between 1 and 10")
+        cliff_years = 1.0
+    else:
+        vest_years, cliff_years = get_grant_configuration(grant_type, share_type, bonus_type)
+
+    espp_discount = _optional(row, 'espp_discount')
+    if espp_discount:
+        try:
+            espp_discount = float(espp_discount)
+        except ValueError:
+            raise RowError(f"invalid espp_discount {espp_discount!r}")
+        if not 0 <= espp_discount < 1:
+            raise RowError("espp_discount must be a fraction between 0 and 1")
+    else:
+        espp_discount = 0.15 if grant_type == GrantType.ESPP.value else 0.0
+
+    if user_id is None:
+        username = _optional(row, 'username')
+        if not username:
+            raise RowError("missing username")
+        if username not in user_ids:
+            raise RowError(f"unknown username {username!r}")
+        row_user_id = user_ids[username]
+    else:
+        row_user_id = user_id
+
+    return {
+        'user_id': row_user_id,
+        'grant_date': grant_date,
+        'grant_type': grant_type,
+        'share_type': share_type,
+        'share_quantity': share_quantity,
+        'share_price_at_grant': 0,  # Same placeholder as grants.add_grant
+        'vest_years': vest_years,
+        'cliff_years': cliff_years,
+        'bonus_type': bonus_type,
+        'espp_discount': espp_discount,
+        'notes': _optional(row, 'notes') or ''
+    }
+
+
+def compute_schedules(grant_rows: List[dict], memo: Dict[tuple, list]) -> List[list]:
+    """
+    Vest schedules for ``grant_rows``, computed once per distinct set of terms.
+
+    Returns:
+        list: one calculate_vest_schedule result per row, in order
+    """
+    schedules = []
+    for values in grant_rows:
+        key = (values['grant_date'], values['grant_type'], values['share_type'],
+               values['share_quantity'], values['vest_years'], values['cliff_years'],
+               values['bonus_type'])
+        schedule = memo.get(key)
+        if schedule is None:
+            # Transient Grant, never added to the session
+            schedule = calculate_vest_schedule(Grant(**values))
+            memo[key] = schedule
+        schedules.append(schedule)
+    return schedules
+
+
+def _insert_chunk(grant_rows: List[dict], memo: Dict[tuple, list]) -> int:
+    """Insert one chunk of grants and their vest events in a single transaction."""
+    schedules = compute_schedules(grant_rows, memo)
+    created_at = datetime.utcnow()
+    for values in grant_rows:
+        values['created_at'] = created_at
+
+    # Core inserts on the session's connection: one executemany per table,
+    # without ORM bookkeeping for objects nobody will read back
+    conn = db.session.connection()
+    grant_ids = conn.execute(
+        Grant.__table__.insert().returning(Grant.__table__.c.id, sort_by_parameter_order=True),
+        grant_rows
+    ).scalars().all()
+
+    vest_rows = [
+        {
+            'grant_id': grant_id,
+            'user_id': values['user_id'],
+            'vest_date': vest['vest_date'],
+            'shares_vested': vest['shares'],
+            'created_at': created_at
+        }
+        for grant_id, values, schedule in zip(grant_ids, grant_rows, schedules)
+        for vest in schedule
+    ]
+    if vest_rows:
+        conn.execute(VestEvent.__table__.insert(), vest_rows)
+    db.session.commit()
+    return len(vest_rows)
+
+
+def iter_rows(lines: Iterable[str]) -> Iterator[Tuple[int, dict]]:
+    """
+    Yield (line number, row) from CSV text, lower-casing the header.
+
+    Raises:
+        RowError: If a required column is missing from the header
+    """
+    reader = csv.DictReader(lines)
+    fieldnames = [(f or '').strip().lower() for f in (reader.fieldnames or [])]
+    missing = [c for c in REQUIRED_COLUMNS if c not in fieldnames]
+    if missing:
+        raise RowError(f"CSV header is missing: {', '.join(missing)}")
+    reader.fieldnames = fieldnames
+    for row in reader:
+        if not any((v or '').strip() for v in row.values() if isinstance(v, str)):
+            continue  # blank line
+        yield reader.line_num, row
+
+
+def import_grants(lines: Iterable[str], user_id: Optional[int] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Import grants from CSV text.
+
+    Args:
+        lines: Iterable of CSV lines (an open text file or stream)
+        user_id: Owner of every grant; None to use each row's username column
+        chunk_size: Grants per transaction
+
+    Returns:
+        dict: {'rows_read', 'grants_imported', 'vest_events_created',
+               'rejected_count', 'rejected': [{'line', 'error'}], 'chunks',
+               'distinct_schedules', 'seconds', 'rows_per_second'}
+
+    Raises:
+        RowError: If the CSV header is missing a required column
+    """
+    started = time.perf_counter()
+    user_ids = {} if user_id is not None else dict(db.session.query(User.username, User.id).all())
+
+    report = {
+        'rows_read': 0,
+        'grants_imported': 0,
+        'vest_events_created': 0,
+        'rejected_count': 0,
+        'rejected': [],
+        'chunks': 0
+    }
+    memo: Dict[tuple, list] = {}
+    touched_users = set()
+    chunk: List[dict] = []
+
+    def flush():
+        report['vest_events_created'] += _insert_chunk(chunk, memo)
+        report['grants_imported'] += len(chunk)
+        report['chunks'] += 1
+        touched_users.update(values['user_id'] for values in chunk)
+        chunk.clear()
+
+    try:
+        for line_no, row in iter_rows(lines):
+            report['rows_read'] += 1
+            try:
+                chunk.append(parse_grant_row(row, user_id, user_ids))
+            except RowError as e:
+                report['rejected_count'] += 1
+                if len(report['rejected']) < MAX_REPORTED_ERRORS:
+                    report['rejected'].append({'line': line_no, 'error': str(e)})
+                continue
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        # Bulk inserts bypass the ORM flush hooks; invalidate per-user caches here
+        for uid in touched_users:
+            bump_user_version(uid)
+
+    seconds = time.perf_counter() - started
+    report['distinct_schedules'] = len(memo)
+    report['seconds'] = seconds
+    report['rows_per_second'] = report['rows_read'] / seconds if seconds > 0 else 0.0
+    return report
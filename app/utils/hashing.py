@@ -0,0 +1,186 @@
+"""
+Bounded executor for password hashing.
+
+PBKDF2 at 600,000 iterations takes hundreds of milliseconds of CPU. Every
+hash or check goes through one pool per worker process:
+
+- at most HASH_MAX_CONCURRENCY hashes run at once (hashlib releases the GIL,
+  so they run in parallel on threaded workers);
+- at most HASH_QUEUE_DEPTH more wait; beyond that the call fails at once
+  with HashingOverloaded (served as 503 with Retry-After) instead of piling
+  up behind a login burst;
+- a call that can't finish within HASH_TIMEOUT seconds also fails.
+
+With sync gunicorn workers each worker only hashes one password at a time,
+so the per-process cap can't protect the other workers. HASH_GLOBAL_SLOTS
+caps concurrent hashing across all workers with flock()ed slot files
+(default: half of WEB_CONCURRENCY), leaving workers and CPU for dashboard
+traffic during a credential-stuffing run.
+
+Queue wait, hash time and rejections are exported through app.utils.metrics.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Optional
+
+from flask import current_app, has_app_context
+
+from app.utils.metrics import incr, observe, timer
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development only
+    fcntl = None
+
+DEFAULTS = {
+    'HASH_MAX_CONCURRENCY': 2,
+    'HASH_QUEUE_DEPTH': 8,
+    'HASH_TIMEOUT': 10.0,
+    'HASH_GLOBAL_SLOTS': 0,
+    'HASH_SLOT_DIR': None,
+}
+
+# Seconds clients are asked to wait after an overload response
+RETRY_AFTER = 2
+
+# Poll interval while waiting for a cross-worker slot
+SLOT_POLL_INTERVAL = 0.01
+
+# Extra time the caller waits past HASH_TIMEOUT, so a slot wait that gives up
+# at the deadline is reported as 'no free slot' rather than as a timeout
+RESULT_GRACE = 0.1
+
+
+class HashingOverloaded(Exception):
+    """The hashing pool is saturated; the caller should retry later."""
+
+    def __init__(self, reason: str):
+        super().__init__(f'password hashing unavailable ({reason})')
+        self.reason = reason
+        self.retry_after = RETRY_AFTER
+
+
+class HashingPool:
+    """Thread pool with admission control for CPU-heavy hash calls."""
+
+    def __init__(self, max_concurrency: int = 2, queue_depth: int = 8, timeout: float = 10.0,
+                 global_slots: int = 0, slot_dir: Optional[str] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_depth = max(0, queue_depth)
+        self.timeout = timeout
+        self.global_slots = global_slots if (global_slots and slot_dir and fcntl) else 0
+        self.slot_dir = slot_dir
+        if self.global_slots:
+            os.makedirs(slot_dir, exist_ok=True)
+        self._admission = threading.BoundedSemaphore(self.max_concurrency + self.queue_depth)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix='password-hash')
+
+    def _acquire_slot(self, deadline: float):
+        """Lock one of the cross-worker slot files, waiting until ``deadline``."""
+        while True:
+            for i in range(self.global_slots):
+                slot = open(os.path.join(self.slot_dir, f'slot-{i}.lock'), 'w')
+                try:
+                    fcntl.flock(slot, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return slot
+                except BlockingIOError:
+                    slot.close()
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(SLOT_POLL_INTERVAL)
+
+    def _execute(self, operation: str, submitted: float, fn: Callable, args: tuple) -> Any:
+        slot = None
+        if self.global_slots:
+            slot = self._acquire_slot(submitted + self.timeout)
+            if slot is None:
+                raise HashingOverloaded('no free slot')
+        try:
+            observe('vestx_password_hash_queue_seconds', time.monotonic() - submitted,
+                    operation=operation)
+            with timer('vestx_password_hash_seconds', operation=operation):
+                return fn(*args)
+        finally:
+            if slot is not None:
+                slot.close()  # releases the flock
+
+    def run(self, operation: str, fn: Callable, *args) -> Any:
+        """
+        Run ``fn(*args)`` on the pool and return its result.
+
+        Raises:
+            HashingOverloaded: If the queue is full or the call timed out
+        """
+        if not self._admission.acquire(blocking=False):
+            incr('vestx_password_hash_rejected_total', operation=operation, reason='queue_full')
+            raise HashingOverloaded('queue full')
+
+        submitted = time.monotonic()
+        try:
+            future = self._executor.submit(self._execute, operation, submitted, fn, args)
+        except Exception:
+            self._admission.release()
+            raise
+        # Released when the hash really finishes, even if the caller gave up
+        future.add_done_callback(lambda f: self._admission.release())
+
+        try:
+            return future.result(timeout=self.timeout + RESULT_GRACE)
+        except FutureTimeout:
+            future.cancel()
+            incr('vestx_password_hash_rejected_total', operation=operation, reason='timeout')
+            raise HashingOverloaded('timeout')
+        except HashingOverloaded:
+            incr('vestx_password_hash_rejected_total', operation=operation, reason='no_slot')
+            raise
+
+
+_pool = {'instance': None}
+_pool_lock = threading.Lock()
+
+
+def _setting(name: str):
+    if has_app_context():
+        return current_app.config.get(name, DEFAULTS[name])
+    return DEFAULTS[name]
+
+
+def get_pool() -> HashingPool:
+    """This process's hashing pool, created on first use from the HASH_* settings."""
+    pool = _pool['instance']
+    if pool is None:
+        with _pool_lock:
+            pool = _pool['instance']
+            if pool is None:
+                slot_dir = _setting('HASH_SLOT_DIR')
+                if slot_dir is None and has_app_context():
+                    slot_dir = os.path.join(current_app.instance_path, 'hash_slots')
+                pool = _pool['instance'] = HashingPool(
+                    max_concurrency=_setting('HASH_MAX_CONCURRENCY'),
+                    queue_depth=_setting('HASH_QUEUE_DEPTH'),
+                    timeout=_setting('HASH_TIMEOUT'),
+                    global_slots=_setting('HASH_GLOBAL_SLOTS'),
+                    slot_dir=slot_dir
+                )
+    return pool
+
+
+def run_hash(operation: str, fn: Callable, *args) -> Any:
+    """Run a password hash/check through the bounded pool (see HashingPool.run)."""
+    return get_pool().run(operation, fn, *args)
+
+
+def _reset_after_fork():
+    # Executor threads don't survive fork; a preloaded parent may have hashed
+    # (admin bootstrap), so each child builds its own pool on first use
+    global _pool_lock
+    _pool_lock = threading.Lock()
+    _pool['instance'] = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,76 @@
+"""
+Private HTTP caching for per-user pages.
+
+A page built only from the current user's data gets an ETag derived from the
+shared version counters in app.utils.cache: the user's data version (bumped
+by model events on grants, vest events and tax profile), plus the stock
+price and tax bracket versions. When the browser revalidates with a matching
+If-None-Match, the view is skipped and a 304 is sent.
+
+The ETag also covers everything else that appears in the HTML:
+
+- the user id and admin flag (navigation);
+- today's date (vested/unvested status);
+- the session's CSRF token and its expiry window, so a reused page never
+  carries an expired token;
+- the deployed release (APP_RELEASE, or a fingerprint of the template and
+  static files), so a deploy invalidates every page.
+"""
+
+import hashlib
+import os
+import time
+from datetime import date
+from typing import Optional
+
+from flask import current_app, session
+from flask_login import current_user
+
+from app.utils.cache import user_stamp
+
+_release = {'id': None}
+
+
+def release_id() -> str:
+    """APP_RELEASE, or a fingerprint of template/static file names, sizes and mtimes."""
+    release = current_app.config.get('APP_RELEASE')
+    if release:
+        return release
+    if _release['id'] is None:
+        digest = hashlib.sha1()
+        for folder in (current_app.template_folder, current_app.static_folder):
+            root_dir = os.path.join(current_app.root_path, folder)
+            for root, dirs, files in os.walk(root_dir):
+                dirs.sort()
+                for name in sorted(files):
+                    st = os.stat(os.path.join(root, name))
+                    digest.update(f'{root}/{name}:{st.st_size}:{st.st_mtime_ns}\n'.encode())
+        _release['id'] = digest.hexdigest()[:12]
+    return _release['id']
+
+
+def _csrf_window() -> Optional[int]:
+    """Index of the half-lifetime window the CSRF tokens in a page were signed in."""
+    limit = current_app.config.get('WTF_CSRF_TIME_LIMIT')
+    if not limit:
+        return None
+    return int(time.time() // max(1, limit // 2))
+
+
+def user_page_etag() -> str:
+    """ETag for a page built from the current user's data."""
+    parts = (
+        current_user.id,
+        bool(getattr(current_user, 'is_admin', False)),
+        user_stamp(current_user.id),
+        date.today().isoformat(),
+        session.get('csrf_token'),
+        _csrf_window(),
+        release_id(),
+    )
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:24]
+
+
+def has_pending_flashes() -> bool:
+    """Flash messages waiting to be shown make the next page unique."""
+    return bool(session.get('_flashes'))
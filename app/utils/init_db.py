@@ -4,12 +4,13 @@ Database initialization utilities.
 
 from app import db
 from app.models.user import User
+from bisect import bisect_right
 from datetime import date
 import os
 
 
-def init_admin_user():
-    """Create admin user if it doesn't exist."""
+def init_admin_user() -> bool:
+    """Create admin user if it doesn't exist. Returns True if it was created."""
     admin_username = os.getenv('ADMIN_USERNAME', 'admin')
     admin_password = os.getenv('ADMIN_PASSWORD', 'admin')
     
@@ -24,3 +25,80 @@ def init_admin_user():
         db.session.add(admin)
         db.session.commit()
         print(f"Admin user created: {admin_username}")
+        return True
+    return False
+
+
+def bootstrap_database() -> dict:
+    """
+    Create missing tables and the admin user.
+
+    Run by create_app when BOOTSTRAP_ON_STARTUP is set, otherwise once per
+    deploy with ``flask bootstrap``.
+
+    Returns:
+        dict: {'tables_created': [table names], 'columns_added': [column names],
+               'admin_created': bool}
+    """
+    from sqlalchemy import inspect
+    from app.utils.migrate_vest_event_updated_at import upgrade_vest_event_updated_at
+    
+    existing = set(inspect(db.engine).get_table_names())
+    # Columns added since a table was first created (idempotent)
+    columns_added = []
+    if upgrade_vest_event_updated_at()['column_added']:
+        columns_added.append('vest_events.updated_at')
+    db.create_all()
+    created = [t for t in db.metadata.sorted_tables if t.name not in existing]
+    return {
+        'tables_created': [t.name for t in created],
+        'columns_added': columns_added,
+        'admin_created': init_admin_user()
+    }
+
+
+# Sorted (valuation_date, price) arrays for bisect lookups, rebuilt when the version changes
+_price_index = {'version': None, 'dates': [], 'prices': []}
+
+
+def _get_price_index() -> dict:
+    """Return the in-memory stock price index, reloading it if prices changed."""
+    from app.models.stock_price import StockPrice
+    from app.utils.cache import STOCK_PRICES_VERSION, get_version
+    
+    version = get_version(STOCK_PRICES_VERSION)
+    if _price_index['version'] != version:
+        rows = db.session.query(StockPrice.valuation_date, StockPrice.price_per_share).order_by(
+            StockPrice.valuation_date
+        ).all()
+        _price_index['dates'] = [r[0] for r in rows]
+        _price_index['prices'] = [r[1] for r in rows]
+        _price_index['version'] = version
+    return _price_index
+
+
+def get_stock_price_at_date(target_date: date):
+    """Get the most recent stock price on or before ``target_date`` (None if no price)."""
+    index = _get_price_index()
+    i = bisect_right(index['dates'], target_date) - 1
+    return index['prices'][i] if i >= 0 else None
+
+
+def get_latest_stock_price():
+    """Get the latest stock price (None if no price has been entered)."""
+    index = _get_price_index()
+    return index['prices'][-1] if index['prices'] else None
+
+
+def get_price_history() -> list:
+    """All (valuation_date, price) pairs in date order."""
+    index = _get_price_index()
+    return list(zip(index['dates'], index['prices']))
+
+
+def invalidate_stock_prices() -> None:
+    """Drop cached stock prices in every worker after stock_prices has changed."""
+    from app.utils.cache import STOCK_PRICES_VERSION, bump_version
+    
+    _price_index['version'] = None
+    bump_version(STOCK_PRICES_VERSION)
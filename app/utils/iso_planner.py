@@ -0,0 +1,191 @@
+"""
+ISO exercise planner: regular tax vs. Alternative Minimum Tax (AMT).
+
+Exercising ISOs adds no regular taxable income, but the spread (FMV - strike)
+is an AMT preference item. AMT is owed when the tentative minimum tax on
+AMT income exceeds the regular tax. This module evaluates both across a range
+of exercise quantities and finds the largest exercise that stays AMT-free.
+
+Simplifications:
+- Regular taxable income is the tax profile's annual income.
+- AMT income is regular income plus the ISO spread; other adjustments
+  (state tax add-back, etc.) are ignored.
+- Federal only; state AMT is not modelled.
+"""
+
+import math
+from bisect import bisect_left
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+from app.models.grant import ShareType
+from app.utils.tax_tables import BracketTable, get_bracket_table
+
+# 2025 federal AMT parameters (IRS Rev. Proc. 2024-40)
+AMT_PARAMETERS = {
+    2025: {
+        'single': {'exemption': 88100, 'phaseout': 626350, 'rate_break': 239100},
+        'head_of_household': {'exemption': 88100, 'phaseout': 626350, 'rate_break': 239100},
+        'married_joint': {'exemption': 137000, 'phaseout': 1252700, 'rate_break': 239100},
+        'married_separate': {'exemption': 68500, 'phaseout': 626350, 'rate_break': 119550},
+    }
+}
+
+# Exemption is reduced by 25 cents per dollar of AMT income over the phaseout threshold
+AMT_PHASEOUT_RATE = 0.25
+
+# Points evaluated along the exercise-quantity axis when none are requested
+DEFAULT_CURVE_POINTS = 41
+
+ISO_SHARE_TYPES = (ShareType.ISO_5Y.value, ShareType.ISO_6Y.value)
+
+_amt_tables: Dict[tuple, BracketTable] = {}
+
+
+def get_amt_table(tax_year: int, filing_status: str) -> BracketTable:
+    """26% / 28% tentative minimum tax schedule for a year and filing status."""
+    key = (tax_year, filing_status)
+    if key not in _amt_tables:
+        params = _amt_parameters(tax_year, filing_status)
+        _amt_tables[key] = BracketTable([(0, 0.26), (params['rate_break'], 0.28)])
+    return _amt_tables[key]
+
+
+def _amt_parameters(tax_year: int, filing_status: str) -> dict:
+    year_params = AMT_PARAMETERS.get(tax_year) or AMT_PARAMETERS[max(AMT_PARAMETERS)]
+    return year_params.get(filing_status, year_params['single'])
+
+
+def collect_iso_lots(vest_events, today: Optional[date] = None) -> List[dict]:
+    """Vested ISO shares available to exercise, one lot per vest event."""
+    today = today or date.today()
+    lots = []
+    for ve in vest_events:
+        if ve.vest_date > today or ve.grant.share_type not in ISO_SHARE_TYPES:
+            continue
+        shares = int(math.floor(ve.shares_received + 1e-9))
+        if shares > 0:
+            lots.append({
+                'vest_event_id': ve.id,
+                'grant_id': ve.grant_id,
+                'shares': shares,
+                'strike_price': ve.grant.share_price_at_grant or 0.0
+            })
+    return lots
+
+
+class ExercisePlanner:
+    """
+    Precomputed inputs for one user's ISO exercise analysis.
+
+    Lots are ordered by spread per share (smallest first), since exercising
+    low-spread shares first adds the least AMT income per share. Building the
+    planner is the only step that touches the database; every evaluation
+    afterwards is pure arithmetic, which keeps slider round-trips fast.
+    """
+
+    def __init__(self, lots: List[dict], price: float, income: float,
+                 filing_status: str = 'single', tax_year: int = 2025):
+        self.price = price
+        self.income = income or 0.0
+        self.filing_status = filing_status or 'single'
+        self.tax_year = tax_year
+
+        params = _amt_parameters(tax_year, self.filing_status)
+        self.exemption = params['exemption']
+        self.phaseout = params['phaseout']
+        self.amt_table = get_amt_table(tax_year, self.filing_status)
+
+        federal = get_bracket_table('federal', tax_year, self.filing_status, 'ordinary')
+        self.regular_tax = federal.tax(self.income) if federal else 0.0
+
+        self.lots = sorted(lots, key=lambda lot: price - lot['strike_price'])
+        self.spreads = [max(price - lot['strike_price'], 0.0) for lot in self.lots]
+        self.cum_shares = [0]
+        self.cum_spread = [0.0]
+        for lot, spread in zip(self.lots, self.spreads):
+            self.cum_shares.append(self.cum_shares[-1] + lot['shares'])
+            self.cum_spread.append(self.cum_spread[-1] + spread * lot['shares'])
+
+    @property
+    def total_shares(self) -> int:
+        return self.cum_shares[-1]
+
+    def spread_for(self, shares: int) -> float:
+        """Total bargain element of exercising the first ``shares`` shares."""
+        shares = min(max(shares, 0), self.total_shares)
+        if shares == 0:
+            return 0.0
+        i = bisect_left(self.cum_shares, shares) - 1
+        return self.cum_spread[i] + (shares - self.cum_shares[i]) * self.spreads[i]
+
+    def _amt_taxable(self, amti: float) -> float:
+        exemption = max(self.exemption - AMT_PHASEOUT_RATE * max(amti - self.phaseout, 0.0), 0.0)
+        return max(amti - exemption, 0.0)
+
+    def tentative_minimum_tax(self, shares: int) -> float:
+        """Tentative minimum tax after exercising ``shares`` shares."""
+        return self.amt_table.tax(self._amt_taxable(self.income + self.spread_for(shares)))
+
+    def evaluate(self, quantities: Sequence[int]) -> List[dict]:
+        """
+        Regular tax vs. AMT for each exercise quantity.
+
+        AMT taxable income is computed for the whole list first and the 26%/28%
+        schedule is applied in one vectorized sweep.
+        """
+        spreads = [self.spread_for(q) for q in quantities]
+        amti = [self.income + spread for spread in spreads]
+        taxable = [self._amt_taxable(value) for value in amti]
+        tmt = self.amt_table.tax_many(taxable)
+        return [
+            {
+                'shares': q,
+                'spread': spread,
+                'amt_income': income,
+                'tentative_minimum_tax': minimum_tax,
+                'regular_tax': self.regular_tax,
+                'amt': max(minimum_tax - self.regular_tax, 0.0)
+            }
+            for q, spread, income, minimum_tax in zip(quantities, spreads, amti, tmt)
+        ]
+
+    def curve(self, points: int = DEFAULT_CURVE_POINTS) -> List[dict]:
+        """Evenly spaced evaluation from 0 to every exercisable share."""
+        points = max(2, points)
+        total = self.total_shares
+        quantities = sorted({round(total * i / (points - 1)) for i in range(points)})
+        return self.evaluate(quantities)
+
+    def max_amt_free_shares(self) -> int:
+        """
+        Largest exercise that keeps tentative minimum tax at or below regular tax.
+
+        Tentative minimum tax never decreases as more shares are exercised, so
+        the crossover is found by binary search over the share count.
+        """
+        if self.tentative_minimum_tax(0) > self.regular_tax:
+            return 0
+        lo, hi = 0, self.total_shares
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.tentative_minimum_tax(mid) <= self.regular_tax:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def summary(self) -> dict:
+        """Headline numbers for the planner."""
+        amt_free = self.max_amt_free_shares()
+        return {
+            'price': self.price,
+            'income': self.income,
+            'filing_status': self.filing_status,
+            'tax_year': self.tax_year,
+            'exercisable_shares': self.total_shares,
+            'total_spread': self.spread_for(self.total_shares),
+            'regular_tax': self.regular_tax,
+            'max_amt_free_shares': amt_free,
+            'max_amt_free_spread': self.spread_for(amt_free)
+        }
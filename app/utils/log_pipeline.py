@@ -0,0 +1,290 @@
+"""
+Non-blocking log pipeline for the audit and security loggers.
+
+Request threads only put records on a bounded in-memory queue
+(BoundedQueueHandler); a background QueueListener per logger drains the
+queue in batches and hands each batch to its handlers, so a batch of records
+costs one write and one flush instead of one locked write per record.
+
+When the queue is full the overflow policy decides which record is lost
+('drop_new' keeps the backlog, 'drop_oldest' keeps the newest records) and
+the drop is counted; the request thread never waits on disk.
+
+Each gunicorn worker runs its own listener threads; pipelines attached in a
+pre-forking parent (--preload) are restarted in every child after fork. Workers appending to the
+same file coordinate size-based rotation through an flock()ed lock file.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development only
+    fcntl = None
+
+OVERFLOW_POLICIES = ('drop_new', 'drop_oldest')
+
+# Seconds stop() waits to hand the listener its sentinel on a full queue
+STOP_TIMEOUT = 5.0
+
+
+class PipelineStats:
+    """Thread-safe counters for one logger's pipeline."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'enqueued': self.enqueued,
+                'dropped': self.dropped,
+                'written': self.written,
+                'batches': self.batches,
+                'errors': self.errors
+            }
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: a full queue drops a record instead."""
+
+    def __init__(self, log_queue: queue.Queue, stats: PipelineStats, overflow: str = 'drop_new'):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}, got {overflow!r}")
+        super().__init__(log_queue)
+        self.stats = stats
+        self.overflow = overflow
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.stats.incr('dropped')
+            if self.overflow == 'drop_oldest':
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    return
+                self.stats.incr('enqueued')
+            return
+        self.stats.incr('enqueued')
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that drains up to ``batch_size`` waiting records at a time.
+
+    Handlers with an ``emit_batch(records)`` method receive the whole batch;
+    other handlers get the records one by one.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers, stats: PipelineStats, batch_size: int = 256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.stats = stats
+        self.batch_size = batch_size
+
+    def _drain(self, first) -> tuple:
+        """Collect ``first`` plus whatever is already queued. Returns (records, saw_sentinel)."""
+        records = [first]
+        while len(records) < self.batch_size:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is self._sentinel:
+                return records, True
+            records.append(record)
+        return records, False
+
+    def handle_batch(self, records: List[logging.LogRecord]):
+        records = [self.prepare(r) for r in records]
+        for handler in self.handlers:
+            accepted = [r for r in records if r.levelno >= handler.level]
+            if not accepted:
+                continue
+            try:
+                if hasattr(handler, 'emit_batch'):
+                    handler.emit_batch(accepted)
+                else:
+                    for record in accepted:
+                        handler.handle(record)
+            except Exception:
+                self.stats.incr('errors')
+        self.stats.incr('written', len(records))
+        self.stats.incr('batches')
+
+    def _monitor(self):
+        while True:
+            record = self.queue.get()
+            if record is self._sentinel:
+                break
+            records, stop = self._drain(record)
+            self.handle_batch(records)
+            if stop:
+                break
+
+    def enqueue_sentinel(self):
+        # The queue may be full; wait (bounded) for room rather than failing
+        try:
+            self.queue.put(self._sentinel, timeout=STOP_TIMEOUT)
+        except queue.Full:
+            pass
+
+
+class BatchingRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that writes a batch of records with one write.
+
+    Rotation is coordinated between processes: the size check, rollover and
+    write happen under an exclusive lock on ``<file>.lock``, and a worker
+    whose file was rotated by another worker reopens it before writing.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding='utf-8', delay=True)
+        self._lock_path = self.baseFilename + '.lock'
+
+    def _reopen_if_rotated(self):
+        if self.stream is None:
+            self.stream = self._open()
+            return
+        try:
+            on_disk = os.stat(self.baseFilename).st_ino
+        except FileNotFoundError:
+            on_disk = None
+        if on_disk != os.fstat(self.stream.fileno()).st_ino:
+            self.stream.close()
+            self.stream = self._open()
+
+    def emit_batch(self, records: List[logging.LogRecord]):
+        data = ''.join(self.format(record) + self.terminator for record in records)
+        with self.lock, open(self._lock_path, 'w') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._reopen_if_rotated()
+            if self.maxBytes > 0:
+                self.stream.seek(0, os.SEEK_END)
+                if self.stream.tell() > 0 and self.stream.tell() + len(data.encode('utf-8')) > self.maxBytes:
+                    self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+            self.stream.write(data)
+            self.stream.flush()
+
+    def emit(self, record):
+        try:
+            self.emit_batch([record])
+        except Exception:
+            self.handleError(record)
+
+
+_pipelines: Dict[str, dict] = {}
+
+
+def attach_pipeline(logger: logging.Logger, handlers: list, queue_size: int = 10000,
+                    overflow: str = 'drop_new', batch_size: int = 256) -> PipelineStats:
+    """
+    Route ``logger`` through a bounded queue to ``handlers`` on a background thread.
+
+    Replaces a pipeline previously attached to the same logger.
+
+    Returns:
+        PipelineStats: the pipeline's counters
+    """
+    detach_pipeline(logger.name)
+
+    stats = PipelineStats()
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, stats, overflow)
+    listener = BatchingQueueListener(log_queue, *handlers, stats=stats, batch_size=batch_size)
+    listener.start()
+    logger.addHandler(queue_handler)
+
+    _pipelines[logger.name] = {
+        'logger': logger,
+        'queue': log_queue,
+        'queue_handler': queue_handler,
+        'listener': listener,
+        'handlers': handlers,
+        'stats': stats
+    }
+    return stats
+
+
+def detach_pipeline(name: str) -> None:
+    """Flush and stop the pipeline attached to logger ``name`` (if any)."""
+    pipeline = _pipelines.pop(name, None)
+    if not pipeline:
+        return
+    pipeline['logger'].removeHandler(pipeline['queue_handler'])
+    pipeline['listener'].stop()
+    for handler in pipeline['handlers']:
+        handler.close()
+
+
+def stop_pipelines() -> None:
+    """Flush every pipeline; registered with atexit so queued records are written."""
+    for name in list(_pipelines):
+        detach_pipeline(name)
+
+
+def pipeline_stats() -> Dict[str, dict]:
+    """
+    Counters and queue depth for every attached pipeline.
+
+    Returns:
+        dict: {logger name: {'enqueued', 'dropped', 'written', 'batches',
+               'errors', 'queue_depth', 'queue_size'}}
+    """
+    result = {}
+    for name, pipeline in _pipelines.items():
+        stats = pipeline['stats'].snapshot()
+        stats['queue_depth'] = pipeline['queue'].qsize()
+        stats['queue_size'] = pipeline['queue'].maxsize
+        result[name] = stats
+    return result
+
+
+def _restart_after_fork() -> None:
+    """
+    Give a forked child its own queues and listener threads.
+
+    Threads don't survive fork, so inherited pipelines would queue records
+    nobody writes. Handlers are kept; those holding per-process resources
+    drop them through ``reset_after_fork()``.
+    """
+    for pipeline in _pipelines.values():
+        for handler in pipeline['handlers']:
+            if hasattr(handler, 'reset_after_fork'):
+                handler.reset_after_fork()
+
+        stats = PipelineStats()
+        log_queue = queue.Queue(maxsize=pipeline['queue'].maxsize)
+        listener = BatchingQueueListener(log_queue, *pipeline['handlers'], stats=stats,
+                                         batch_size=pipeline['listener'].batch_size)
+        pipeline['queue_handler'].queue = log_queue
+        pipeline['queue_handler'].stats = stats
+        listener.start()
+        pipeline.update(queue=log_queue, listener=listener, stats=stats)
+
+
+atexit.register(stop_pipelines)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,415 @@
+"""
+Prometheus metrics aggregated across gunicorn workers.
+
+Each worker records counters and histograms in memory and periodically writes
+a snapshot to its own file in METRICS_DIR (default <instance>/metrics).
+/metrics sums every worker's file and renders the Prometheus text format, so
+a scrape sees the whole server whichever worker answers it. Snapshots of
+workers that have exited are folded into archive.json, which keeps counters
+monotonic across worker restarts without the file count growing.
+
+Recorded here:
+- vestx_http_request_duration_seconds  per blueprint/endpoint histogram
+- vestx_db_query_duration_seconds      histogram of every cursor execute
+- vestx_password_hash_seconds          password hash/check time (app.utils.hashing)
+- vestx_fernet_operations_total        Fernet encrypt/decrypt counts
+Collected from other modules at snapshot time: VersionedCache hits/misses,
+connection pool counters and audit log pipeline counters.
+
+/metrics is served to METRICS_TOKEN bearer-token holders, or, without a
+token, to direct (unproxied) connections from METRICS_ALLOWED_IPS.
+"""
+
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Tuple
+
+from flask import request
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development only
+    fcntl = None
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+HASH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+HISTOGRAMS = {
+    'vestx_http_request_duration_seconds': ('Request latency by blueprint and endpoint', HTTP_BUCKETS),
+    'vestx_db_query_duration_seconds': ('Database cursor execute latency', DB_BUCKETS),
+    'vestx_password_hash_seconds': ('Password hashing and verification time', HASH_BUCKETS),
+    'vestx_password_hash_queue_seconds': ('Time hash calls waited for the hashing pool', HASH_BUCKETS),
+}
+
+COUNTERS = {
+    'vestx_http_requests_total': 'Requests by blueprint, endpoint and status',
+    'vestx_fernet_operations_total': 'Fernet encrypt/decrypt operations',
+    'vestx_password_hash_rejected_total': 'Hash calls rejected by the hashing pool',
+    'vestx_rate_limited_total': 'Requests rejected by rate limiting',
+    'vestx_rate_limit_errors_total': 'Rate limit checks allowed because the bucket store failed',
+    'vestx_cache_hits_total': 'VersionedCache hits',
+    'vestx_cache_misses_total': 'VersionedCache misses',
+    'vestx_db_pool_events_total': 'Connection pool events',
+    'vestx_db_pool_wait_seconds_total': 'Time spent waiting for a pooled connection',
+    'vestx_log_pipeline_records_total': 'Audit log pipeline records by outcome',
+}
+
+ARCHIVE_FILE = 'archive.json'
+_WORKER_FILE = re.compile(r'^worker-(\d+)-\d+\.json$')
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Registry:
+    """One process's counters and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters: Dict[Tuple[str, Labels], float] = {}
+            # (name, labels) -> [bucket counts..., +Inf count, sum]
+            self.histograms: Dict[Tuple[str, Labels], list] = {}
+
+    def incr(self, name: str, amount: float = 1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        buckets = HISTOGRAMS[name][1]
+        key = (name, _labels(labels))
+        with self._lock:
+            data = self.histograms.get(key)
+            if data is None:
+                data = self.histograms[key] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            else:
+                data[len(buckets)] += 1
+            data[-1] += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), list(data)] for (name, labels), data in self.histograms.items()]
+            }
+
+
+registry = Registry()
+
+
+def incr(name: str, amount: float = 1, **labels) -> None:
+    """Increment a counter in this worker."""
+    registry.incr(name, amount, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record one histogram observation in this worker."""
+    registry.observe(name, value, **labels)
+
+
+@contextmanager
+def timer(name: str, **labels):
+    """Observe the duration of the ``with`` block in histogram ``name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(name, time.perf_counter() - started, **labels)
+
+
+# Per-worker snapshot files --------------------------------------------------
+
+_store = {'dir': None, 'flush_interval': 5.0, 'last_flush': 0.0, 'file': None}
+_started_ns = time.time_ns()
+
+
+def _collected_counters() -> list:
+    """Counters owned by other modules, read at snapshot time."""
+    from app.utils.cache import get_caches
+    from app.utils.db_pool import metrics as pool_metrics
+    from app.utils.log_pipeline import pipeline_stats
+
+    counters = []
+    for cache in get_caches():
+        counters.append(['vestx_cache_hits_total', [['cache', cache.name]], cache.hits])
+        counters.append(['vestx_cache_misses_total', [['cache', cache.name]], cache.misses])
+
+    pool = pool_metrics.snapshot()
+    for event_name in ('connects', 'checkouts', 'waits', 'timeouts', 'overflow_connects',
+                       'invalidations', 'pings'):
+        counters.append(['vestx_db_pool_events_total', [['event', event_name]], pool[event_name]])
+    counters.append(['vestx_db_pool_wait_seconds_total', [], pool['wait_seconds']])
+
+    for logger_name, stats in pipeline_stats().items():
+        for outcome in ('enqueued', 'dropped', 'written', 'errors'):
+            counters.append(['vestx_log_pipeline_records_total',
+                             [['logger', logger_name], ['outcome', outcome]], stats[outcome]])
+    return counters
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'counters': [], 'histograms': []}
+
+
+def _merge(total: dict, snapshot: dict) -> None:
+    """Add ``snapshot`` into ``total`` ({'counters': {key: v}, 'histograms': {key: data}})."""
+    for name, labels, value in snapshot.get('counters', []):
+        key = (name, tuple(tuple(pair) for pair in labels))
+        total['counters'][key] = total['counters'].get(key, 0) + value
+    for name, labels, data in snapshot.get('histograms', []):
+        key = (name, tuple(tuple(pair) for pair in labels))
+        current = total['histograms'].get(key)
+        if current is None or len(current) != len(data):
+            total['histograms'][key] = list(data)
+        else:
+            total['histograms'][key] = [a + b for a, b in zip(current, data)]
+
+
+def _as_snapshot(total: dict) -> dict:
+    return {
+        'counters': [[name, list(labels), value] for (name, labels), value in total['counters'].items()],
+        'histograms': [[name, list(labels), data] for (name, labels), data in total['histograms'].items()]
+    }
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _dir_lock(directory: str):
+    with open(os.path.join(directory, '.lock'), 'w') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def _archive_dead_workers(directory: str) -> None:
+    """Fold snapshots of exited workers into archive.json and delete them."""
+    with _dir_lock(directory):
+        dead = [name for name in os.listdir(directory)
+                if (m := _WORKER_FILE.match(name)) and not _pid_alive(int(m.group(1)))]
+        if not dead:
+            return
+        archive_path = os.path.join(directory, ARCHIVE_FILE)
+        total = {'counters': {}, 'histograms': {}}
+        _merge(total, _read_json(archive_path))
+        for name in dead:
+            _merge(total, _read_json(os.path.join(directory, name)))
+        _write_json(archive_path, _as_snapshot(total))
+        for name in dead:
+            os.remove(os.path.join(directory, name))
+
+
+def flush(force: bool = False) -> None:
+    """Write this worker's snapshot if the flush interval has passed (or ``force``)."""
+    directory = _store['dir']
+    if directory is None:
+        return
+    now = time.monotonic()
+    if not force and now - _store['last_flush'] < _store['flush_interval']:
+        return
+    _store['last_flush'] = now
+
+    if _store['file'] is None:
+        # First flush in this process: tidy up after workers that have exited
+        _archive_dead_workers(directory)
+        _store['file'] = os.path.join(directory, f'worker-{os.getpid()}-{_started_ns}.json')
+
+    snapshot = registry.snapshot()
+    snapshot['counters'].extend(_collected_counters())
+    _write_json(_store['file'], snapshot)
+
+
+def _after_fork_in_child():
+    # Counts recorded by the parent before fork (app startup) belong to the parent
+    global _started_ns
+    _started_ns = time.time_ns()
+    registry.reset()
+    _store['file'] = None
+    _store['last_flush'] = 0.0
+    # Counters owned by other modules are snapshotted too; zero the copies
+    # inherited from a preloaded master so the aggregate doesn't count them
+    # once per worker. (Look the modules up instead of importing in a fork hook.)
+    db_pool = sys.modules.get('app.utils.db_pool')
+    if db_pool is not None:
+        db_pool.metrics.reset_after_fork()
+    cache = sys.modules.get('app.utils.cache')
+    if cache is not None:
+        for versioned_cache in cache.get_caches():
+            versioned_cache.reset_stats()
+
+
+# Aggregation and exposition ---------------------------------------------------
+
+def collect(directory: str) -> dict:
+    """Sum the archive and every worker snapshot in ``directory``."""
+    total = {'counters': {}, 'histograms': {}}
+    for name in sorted(os.listdir(directory)):
+        if name == ARCHIVE_FILE or _WORKER_FILE.match(name):
+            _merge(total, _read_json(os.path.join(directory, name)))
+    return total
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = ','.join(f'{k}="{_escape(str(v))}"' for k, v in labels)
+    return f'{{{pairs}}}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render(total: dict) -> str:
+    """Prometheus text exposition (version 0.0.4) for collected metrics."""
+    lines = []
+
+    by_name: Dict[str, list] = {}
+    for (name, labels), value in total['counters'].items():
+        by_name.setdefault(name, []).append((labels, value))
+    for name in sorted(by_name):
+        lines.append(f'# HELP {name} {COUNTERS.get(name, name)}')
+        lines.append(f'# TYPE {name} counter')
+        for labels, value in sorted(by_name[name]):
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+
+    # Hit ratio per cache, derived from the summed counters
+    ratios = []
+    for (name, labels), hits in total['counters'].items():
+        if name == 'vestx_cache_hits_total':
+            misses = total['counters'].get(('vestx_cache_misses_total', labels), 0)
+            lookups = hits + misses
+            ratios.append((labels, hits / lookups if lookups else 0.0))
+    if ratios:
+        lines.append('# HELP vestx_cache_hit_ratio VersionedCache hits / lookups')
+        lines.append('# TYPE vestx_cache_hit_ratio gauge')
+        for labels, ratio in sorted(ratios):
+            lines.append(f'vestx_cache_hit_ratio{_format_labels(labels)} {ratio:.6f}')
+
+    hist_by_name: Dict[str, list] = {}
+    for (name, labels), data in total['histograms'].items():
+        hist_by_name.setdefault(name, []).append((labels, data))
+    for name in sorted(hist_by_name):
+        help_text, buckets = HISTOGRAMS.get(name, (name, ()))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for labels, data in sorted(hist_by_name[name]):
+            if len(data) != len(buckets) + 2:
+                continue  # written with different buckets by an older release
+            cumulative = 0
+            for bound, count in zip(buckets, data):
+                cumulative += count
+                le = labels + (('le', repr(bound)),)
+                lines.append(f'{name}_bucket{_format_labels(le)} {cumulative}')
+            cumulative += data[len(buckets)]
+            lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(data[-1])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_text() -> str:
+    """Flush this worker and render metrics for every worker."""
+    flush(force=True)
+    return render(collect(_store['dir']))
+
+
+# Hooks ----------------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_metrics_query_start')
+    if starts:
+        registry.observe('vestx_db_query_duration_seconds', time.perf_counter() - starts.pop())
+
+
+def _start_timer():
+    request.environ['vestx.metrics_start'] = time.perf_counter()
+
+
+def _record_request(response):
+    started = request.environ.get('vestx.metrics_start')
+    if started is not None:
+        endpoint = request.endpoint or '<unmatched>'
+        blueprint = request.blueprint or ''
+        registry.observe('vestx_http_request_duration_seconds', time.perf_counter() - started,
+                         blueprint=blueprint, endpoint=endpoint)
+        registry.incr('vestx_http_requests_total', blueprint=blueprint, endpoint=endpoint,
+                      status=response.status_code)
+    flush()
+    return response
+
+
+def init_metrics(app, engine) -> bool:
+    """
+    Register request/DB hooks and the snapshot store when METRICS_ENABLED.
+
+    Call inside an app context after the engine is created.
+
+    Returns:
+        bool: whether metrics were enabled
+    """
+    from sqlalchemy import event
+
+    if not app.config.get('METRICS_ENABLED'):
+        return False
+
+    directory = app.config.get('METRICS_DIR') or os.path.join(app.instance_path, 'metrics')
+    os.makedirs(directory, exist_ok=True)
+    _store['dir'] = directory
+    _store['flush_interval'] = app.config.get('METRICS_FLUSH_INTERVAL', 5.0)
+
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    return True
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(lambda: flush(force=True))
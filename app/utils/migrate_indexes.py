@@ -0,0 +1,58 @@
+"""
+Database migration: composite indexes for the hot per-user queries.
+
+- vest_events (grant_id, vest_date): schedules filtered by grant, ordered by date
+- user_prices (user_id, valuation_date): per-user price history lookups
+- tax_brackets (jurisdiction, tax_year, filing_status, tax_type, income_min):
+  bracket schedule loads
+
+New databases get these from db.create_all(). Run this once against existing
+databases; it is idempotent and only creates indexes that are missing:
+
+    python -m app.utils.migrate_indexes      (or: flask migrate-indexes)
+"""
+
+from sqlalchemy import inspect
+
+from app import create_app, db
+
+
+def _model_tables():
+    from app.models.vest_event import VestEvent
+    from app.models.user_price import UserPrice
+    from app.models.tax_rate import TaxBracket
+    return [VestEvent.__table__, UserPrice.__table__, TaxBracket.__table__]
+
+
+def upgrade_indexes() -> list:
+    """Create any model-declared index missing from the database. Returns created names."""
+    inspector = inspect(db.engine)
+    created = []
+    for table in _model_tables():
+        if not inspector.has_table(table.name):
+            continue
+        existing = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        columns = {col['name'] for col in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            # Indexes on columns added by a later migration wait for that migration
+            if index.name not in existing and all(col.name in columns for col in index.columns):
+                index.create(bind=db.engine)
+                created.append(index.name)
+    return created
+
+
+def run_migration():
+    """Apply the index migration inside an application context."""
+    app = create_app()
+
+    with app.app_context():
+        created = upgrade_indexes()
+        if created:
+            for name in created:
+                print(f"✓ Created index {name}")
+        else:
+            print("✓ All indexes already exist")
+
+
+if __name__ == '__main__':
+    run_migration()
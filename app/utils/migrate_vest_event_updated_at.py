@@ -0,0 +1,56 @@
+"""
+Database migration: vest_events.updated_at row version.
+
+Adds vest_events.updated_at (used to key cached table rows) and backfills it
+from created_at. Idempotent; ``flask bootstrap`` applies it automatically, or
+run it directly against an existing database:
+
+    python -m app.utils.migrate_vest_event_updated_at      (or: flask migrate-vest-event-updated-at)
+"""
+
+from sqlalchemy import inspect
+
+from app import create_app, db
+
+
+def upgrade_vest_event_updated_at() -> dict:
+    """
+    Add and backfill vest_events.updated_at.
+
+    Returns:
+        dict: {'column_added': bool, 'rows_backfilled': int}
+    """
+    inspector = inspect(db.engine)
+    if 'vest_events' not in inspector.get_table_names():
+        return {'column_added': False, 'rows_backfilled': 0}
+    columns = {col['name'] for col in inspector.get_columns('vest_events')}
+    column_added = 'updated_at' not in columns
+
+    with db.engine.begin() as conn:
+        if column_added:
+            conn.exec_driver_sql('ALTER TABLE vest_events ADD COLUMN updated_at DATETIME')
+        result = conn.exec_driver_sql("""
+            UPDATE vest_events
+            SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)
+            WHERE updated_at IS NULL
+        """)
+        rows_backfilled = result.rowcount
+
+    return {'column_added': column_added, 'rows_backfilled': rows_backfilled}
+
+
+def run_migration():
+    """Apply the migration inside an application context."""
+    app = create_app()
+
+    with app.app_context():
+        result = upgrade_vest_event_updated_at()
+        if result['column_added']:
+            print("✓ Added vest_events.updated_at column")
+        else:
+            print("✓ vest_events.updated_at column already exists")
+        print(f"✓ Backfilled updated_at on {result['rows_backfilled']} vest events")
+
+
+if __name__ == '__main__':
+    run_migration()
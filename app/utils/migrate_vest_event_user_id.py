@@ -0,0 +1,63 @@
+"""
+Database migration: denormalized user_id on vest_events.
+
+Adds vest_events.user_id, backfills it from the owning grant and creates the
+(user_id, vest_date) index so per-user schedules are a single-table range scan.
+Idempotent; run once against existing databases before deploying:
+
+    python -m app.utils.migrate_vest_event_user_id      (or: flask migrate-vest-event-user-id)
+"""
+
+from sqlalchemy import inspect
+
+from app import create_app, db
+from app.utils.migrate_indexes import upgrade_indexes
+
+
+def upgrade_vest_event_user_id() -> dict:
+    """
+    Add and backfill vest_events.user_id, then create missing indexes.
+
+    Returns:
+        dict: {'column_added': bool, 'rows_backfilled': int, 'indexes_created': list}
+    """
+    inspector = inspect(db.engine)
+    columns = {col['name'] for col in inspector.get_columns('vest_events')}
+    column_added = 'user_id' not in columns
+
+    with db.engine.begin() as conn:
+        if column_added:
+            conn.exec_driver_sql(
+                'ALTER TABLE vest_events ADD COLUMN user_id INTEGER REFERENCES users (id)'
+            )
+        result = conn.exec_driver_sql("""
+            UPDATE vest_events
+            SET user_id = (SELECT grants.user_id FROM grants WHERE grants.id = vest_events.grant_id)
+            WHERE user_id IS NULL
+        """)
+        rows_backfilled = result.rowcount
+
+    return {
+        'column_added': column_added,
+        'rows_backfilled': rows_backfilled,
+        'indexes_created': upgrade_indexes()
+    }
+
+
+def run_migration():
+    """Apply the migration inside an application context."""
+    app = create_app()
+
+    with app.app_context():
+        result = upgrade_vest_event_user_id()
+        if result['column_added']:
+            print("✓ Added vest_events.user_id column")
+        else:
+            print("✓ vest_events.user_id column already exists")
+        print(f"✓ Backfilled user_id on {result['rows_backfilled']} vest events")
+        for name in result['indexes_created']:
+            print(f"✓ Created index {name}")
+
+
+if __name__ == '__main__':
+    run_migration()
@@ -4,6 +4,7 @@ Populate tax brackets with 2025 federal and state tax rates.
 
 from app import create_app, db
 from app.models.tax_rate import TaxBracket
+from app.utils.tax_tables import invalidate_bracket_tables
 
 
 def populate_2025_tax_brackets():
@@ -187,6 +188,9 @@ def populate_2025_tax_brackets():
         
         db.session.commit()
         
+        # Tell every running worker to reload its cached bracket tables
+        invalidate_bracket_tables()
+        
         count = TaxBracket.query.filter_by(tax_year=2025).count()
         print(f"✅ Successfully populated {count} tax brackets for 2025!")
 
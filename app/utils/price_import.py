@@ -0,0 +1,167 @@
+"""
+Bulk stock price import with upsert.
+
+Parses a CSV or JSON price history and writes it in one transaction with
+INSERT ... ON CONFLICT (valuation_date) DO UPDATE, so re-importing a history
+corrects existing prices instead of failing on the unique date. Price caches
+are invalidated once after the commit rather than once per row.
+
+CSV: header with valuation_date (or date), price_per_share (or price) and
+optional notes.
+JSON: a list of objects with the same keys, or {"prices": [...]}.
+"""
+
+import csv
+import json
+from datetime import datetime
+from typing import Iterable, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app import db
+from app.models.stock_price import StockPrice
+from app.utils.init_db import invalidate_stock_prices
+
+DATE_KEYS = ('valuation_date', 'date')
+PRICE_KEYS = ('price_per_share', 'price')
+
+# Rejected rows kept in the report (the count is always exact)
+MAX_REPORTED_ERRORS = 100
+
+
+def _first(record: dict, keys: Tuple[str, ...]):
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def parse_price_record(record: dict) -> dict:
+    """
+    Validate one price record and return StockPrice column values.
+
+    Raises:
+        ValueError: If the date or price is missing or invalid
+    """
+    raw_date = _first(record, DATE_KEYS)
+    raw_price = _first(record, PRICE_KEYS)
+    if raw_date is None or raw_price is None:
+        raise ValueError('valuation_date and price_per_share are required')
+
+    try:
+        valuation_date = datetime.strptime(str(raw_date).strip(), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'invalid valuation_date {raw_date!r} (expected YYYY-MM-DD)')
+    try:
+        price = float(raw_price)
+    except (TypeError, ValueError):
+        raise ValueError(f'invalid price {raw_price!r}')
+    if price <= 0:
+        raise ValueError('price must be positive')
+
+    notes = record.get('notes')
+    return {
+        'valuation_date': valuation_date,
+        'price_per_share': price,
+        'notes': str(notes).strip() if notes else None
+    }
+
+
+def read_price_records(text: str, fmt: str) -> Iterable[Tuple[int, dict]]:
+    """
+    Yield (row number, raw record) from CSV or JSON text.
+
+    Raises:
+        ValueError: If the text is not valid for ``fmt``
+    """
+    if fmt == 'json':
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f'invalid JSON: {e}')
+        if isinstance(data, dict):
+            data = data.get('prices')
+        if not isinstance(data, list):
+            raise ValueError('JSON must be a list of prices or {"prices": [...]}')
+        for i, record in enumerate(data, start=1):
+            yield i, record if isinstance(record, dict) else {}
+    elif fmt == 'csv':
+        reader = csv.DictReader(text.splitlines())
+        reader.fieldnames = [(f or '').strip().lower() for f in (reader.fieldnames or [])]
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        raise ValueError(f'unsupported format {fmt!r}')
+
+
+def _upsert_statement():
+    """INSERT ... ON CONFLICT (valuation_date) DO UPDATE for the current dialect."""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        insert = sqlite_insert
+    elif dialect == 'postgresql':
+        insert = postgresql_insert
+    else:
+        raise RuntimeError(f'Price upsert is not supported on {dialect}')
+
+    stmt = insert(StockPrice.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[StockPrice.__table__.c.valuation_date],
+        set_={
+            'price_per_share': stmt.excluded.price_per_share,
+            'notes': stmt.excluded.notes
+        }
+    )
+
+
+def import_stock_prices(text: str, fmt: str, user_id: int = None) -> dict:
+    """
+    Upsert a price history from CSV or JSON text in a single transaction.
+
+    Later rows for the same date win. Nothing is written if the file has no
+    valid rows.
+
+    Returns:
+        dict: {'rows_read', 'inserted', 'updated', 'rejected_count',
+               'rejected': [{'row', 'error'}]}
+
+    Raises:
+        ValueError: If the text can't be parsed as ``fmt``
+    """
+    by_date = {}
+    report = {'rows_read': 0, 'inserted': 0, 'updated': 0, 'rejected_count': 0, 'rejected': []}
+
+    for row_no, record in read_price_records(text, fmt):
+        report['rows_read'] += 1
+        try:
+            values = parse_price_record(record)
+        except ValueError as e:
+            report['rejected_count'] += 1
+            if len(report['rejected']) < MAX_REPORTED_ERRORS:
+                report['rejected'].append({'row': row_no, 'error': str(e)})
+            continue
+        by_date[values['valuation_date']] = values
+
+    if not by_date:
+        return report
+
+    # One lookup to split the report into inserted vs updated dates
+    existing = set(db.session.scalars(
+        db.select(StockPrice.valuation_date).where(StockPrice.valuation_date.in_(list(by_date)))
+    ))
+    created_at = datetime.utcnow()
+    rows = [dict(values, created_at=created_at, created_by=user_id) for values in by_date.values()]
+
+    try:
+        db.session.execute(_upsert_statement(), rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    invalidate_stock_prices()
+    report['updated'] = len(existing)
+    report['inserted'] = len(rows) - len(existing)
+    return report
@@ -0,0 +1,152 @@
+"""
+Query-plan audit: replay routes, capture their SQL and EXPLAIN every statement.
+
+Used by the `flask explain-queries` command to catch index regressions before
+deploy. Each parameterless GET route (plus routes taking a grant_id, using the
+user's first grant) is requested as the given user through the test client.
+Every statement the route issues is recorded with its parameters and
+explained; plans that read a whole table are flagged.
+
+Routes run for real, so point the command at a development or staging copy
+of the database: a few GET pages create defaults (e.g. an empty tax profile).
+"""
+
+import re
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app import db
+
+# Endpoints never replayed (side effects or not meaningful without a browser)
+SKIP_ENDPOINTS = {'static', 'auth.logout', 'auth.login', 'auth.register'}
+
+# Statements that are transaction control, not queries
+_CONTROL_STATEMENT = re.compile(r'^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|PRAGMA)\b', re.IGNORECASE)
+
+# SQLite: "SCAN table", "SCAN table USING INDEX ix", "SCAN table USING COVERING INDEX ix"
+_SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)')
+# PostgreSQL: "Seq Scan on table"
+_POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+@contextmanager
+def capture_statements(engine):
+    """Record (statement, parameters) for every cursor execution on ``engine``."""
+    captured: List[Tuple[str, object]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and not _CONTROL_STATEMENT.match(statement):
+            captured.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _route_urls(app, user) -> Iterable[Tuple[str, str]]:
+    """Yield (endpoint, url) for every GET route that can be replayed."""
+    from flask import url_for
+    from app.models.grant import Grant
+
+    first_grant = Grant.query.filter_by(user_id=user.id).order_by(Grant.id).first()
+
+    with app.test_request_context():
+        for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+            if rule.endpoint in SKIP_ENDPOINTS or 'GET' not in rule.methods:
+                continue
+            if not rule.arguments:
+                yield rule.endpoint, url_for(rule.endpoint)
+            elif rule.arguments == {'grant_id'} and first_grant:
+                yield rule.endpoint, url_for(rule.endpoint, grant_id=first_grant.id)
+
+
+def explain(statement: str, parameters) -> List[str]:
+    """Return the plan lines for one statement on the current engine."""
+    dialect = db.engine.dialect.name
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters or ()).fetchall()
+    if dialect == 'sqlite':
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Tables read in full according to ``plan``."""
+    pattern = _SQLITE_SCAN if db.engine.dialect.name == 'sqlite' else _POSTGRES_SCAN
+    tables = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match:
+            tables.append(match.group(1))
+    return tables
+
+
+def audit_routes(app, user, endpoints: Optional[Iterable[str]] = None) -> List[dict]:
+    """
+    Replay routes as ``user`` and explain every distinct statement they issue.
+
+    Returns:
+        list: one dict per route: {'endpoint', 'url', 'status', 'query_count',
+              'statements': [{'sql', 'plan', 'full_scans'}]}
+    """
+    from flask_login.utils import _create_identifier
+
+    wanted = set(endpoints) if endpoints else None
+    client = app.test_client()
+
+    # Log in by writing the Flask-Login session directly (no password needed).
+    # session_protection='strong' also requires the client identifier hash,
+    # computed from the same address and user agent the client sends.
+    with app.test_request_context(environ_base=client.environ_base):
+        identifier = _create_identifier()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user.id)
+        sess['_fresh'] = True
+        sess['_id'] = identifier
+
+    report = []
+    for endpoint, url in list(_route_urls(app, user)):
+        if wanted and endpoint not in wanted:
+            continue
+
+        with capture_statements(db.engine) as captured:
+            response = client.get(url)
+
+        statements = []
+        seen = set()
+        for sql, parameters in captured:
+            if sql in seen:
+                continue
+            seen.add(sql)
+            try:
+                plan = explain(sql, parameters)
+            except Exception as e:  # e.g. statement references rolled-back state
+                plan = [f'(explain failed: {e})']
+            statements.append({'sql': sql, 'plan': plan, 'full_scans': full_scans(plan)})
+
+        report.append({
+            'endpoint': endpoint,
+            'url': url,
+            'status': response.status_code,
+            'query_count': len(captured),
+            'statements': statements
+        })
+    return report
+
+
+def flagged_scans(report: List[dict], allowed_tables: Iterable[str] = ()) -> List[Tuple[str, str, str]]:
+    """(endpoint, table, sql) for every full scan not in ``allowed_tables``."""
+    allowed = set(allowed_tables)
+    flagged = []
+    for route in report:
+        for statement in route['statements']:
+            for table in statement['full_scans']:
+                if table not in allowed:
+                    flagged.append((route['endpoint'], table, statement['sql']))
+    return flagged
@@ -0,0 +1,174 @@
+"""
+Token-bucket rate limiting shared by every gunicorn worker.
+
+Bucket state lives in a small SQLite database (RATELIMIT_DB_PATH, default
+<instance>/ratelimit.db), so a client is limited by the same bucket whichever
+worker serves it. Each check is one short write transaction: the bucket is
+refilled for the time elapsed since its last update, then one token is taken
+if available.
+
+Limits use the "N per second|minute|hour|day" form: a bucket holds N tokens
+and refills N tokens per period, so short bursts are allowed while the
+sustained rate stays at N per period.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Tuple
+
+from flask import current_app
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Buckets untouched this long are full again and can be dropped
+PRUNE_AFTER = PERIODS['day']
+PRUNE_EVERY = 1000  # checks per process between prunes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+_LIMIT_RE = re.compile(r'^\s*(\d+)\s*(?:per|/)\s*(second|minute|hour|day)s?\s*$', re.IGNORECASE)
+
+
+class Limit(NamedTuple):
+    capacity: int
+    period: int  # seconds
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+    def __str__(self) -> str:
+        name = next(k for k, v in PERIODS.items() if v == self.period)
+        return f'{self.capacity} per {name}'
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    limit: Limit
+    remaining: int
+    retry_after: int  # seconds until a token is available (0 when allowed)
+
+
+def parse_limit(text: str) -> Limit:
+    """
+    Parse "10 per minute" (or "10/minute").
+
+    Raises:
+        ValueError: If the string isn't a valid limit
+    """
+    match = _LIMIT_RE.match(text or '')
+    if not match or int(match.group(1)) < 1:
+        raise ValueError(f'invalid rate limit {text!r} (expected e.g. "10 per minute")')
+    return Limit(int(match.group(1)), PERIODS[match.group(2).lower()])
+
+
+class BucketStore:
+    """SQLite-backed token buckets; safe across threads and processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._checks = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # A connection must not cross fork: reopen in a new process
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')  # buckets are disposable state
+            conn.execute(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def take(self, key: str, limit: Limit, cost: float = 1.0, now: float = None) -> Decision:
+        """Refill ``key``'s bucket and take ``cost`` tokens if it has them."""
+        now = time.time() if now is None else now
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                tokens = float(limit.capacity)
+            else:
+                elapsed = max(0.0, now - row[1])
+                tokens = min(float(limit.capacity), row[0] + elapsed * limit.refill_rate)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute(
+                'INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                (key, tokens, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+
+        self._checks += 1
+        if self._checks % PRUNE_EVERY == 0:
+            self.prune(now)
+
+        retry_after = 0 if allowed else int((cost - tokens) / limit.refill_rate) + 1
+        return Decision(allowed, limit, int(tokens), retry_after)
+
+    def prune(self, now: float = None) -> int:
+        """Delete buckets idle for PRUNE_AFTER seconds. Returns the number deleted."""
+        now = time.time() if now is None else now
+        cursor = self._connection().execute('DELETE FROM buckets WHERE updated < ?', (now - PRUNE_AFTER,))
+        return cursor.rowcount
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store() -> BucketStore:
+    """The bucket store for the current app's RATELIMIT_DB_PATH."""
+    path = current_app.config.get('RATELIMIT_DB_PATH') or os.path.join(current_app.instance_path, 'ratelimit.db')
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(path, BucketStore(path))
+    return store
+
+
+def check(scope: str, identity: str, limit: Limit) -> Decision:
+    """
+    Take one token from the ``scope``/``identity`` bucket.
+
+    Fails open: if the bucket store can't be used (locked past its timeout,
+    read-only or missing directory, full disk) the error is logged and the
+    request is allowed rather than turned into a 500.
+    """
+    try:
+        return get_store().take(f'{scope}:{identity}', limit)
+    except (sqlite3.Error, OSError) as e:
+        from app.utils.metrics import incr
+        current_app.logger.warning('Rate limit store unavailable, allowing request: %s', e)
+        incr('vestx_rate_limit_errors_total', scope=scope)
+        return Decision(True, limit, limit.capacity, 0)
+
+
+def most_restrictive(decisions: Tuple[Decision, ...]) -> Decision:
+    """The denied decision with the longest wait, else the one with fewest tokens left."""
+    denied = [d for d in decisions if not d.allowed]
+    if denied:
+        return max(denied, key=lambda d: d.retry_after)
+    return min(decisions, key=lambda d: d.remaining)
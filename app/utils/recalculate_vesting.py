@@ -32,6 +32,7 @@ def recalculate_all_vesting_schedules():
             for vest_info in vest_schedule:
                 vest_event = VestEvent(
                     grant_id=grant.id,
+                    user_id=grant.user_id,
                     vest_date=vest_info['vest_date'],
                     shares_vested=vest_info['shares']
                 )
@@ -0,0 +1,220 @@
+"""
+Opt-in per-request SQL and template profiling (PROFILE_REQUESTS).
+
+For each request this records:
+- query count and total DB time (SQLAlchemy before/after_cursor_execute)
+- how often each distinct SQL statement ran, so N+1 patterns such as one
+  share_price_at_vest or vest.grant lookup per vest event show up as a
+  statement executed dozens of times
+- template render time (Flask's before_render_template/template_rendered)
+
+The figures are returned in a Server-Timing header (visible in the browser's
+network panel) and aggregated per route for /admin/slow-routes. Aggregates
+are kept in memory per worker.
+"""
+
+import heapq
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+
+# Statement text kept in reports
+MAX_STATEMENT_LENGTH = 300
+
+# Duplicate statements kept per slow request
+MAX_DUPLICATES = 5
+
+
+class RouteStats:
+    """Per-route aggregates plus the slowest individual requests for one worker."""
+
+    def __init__(self, slow_requests: int = 50):
+        self._lock = threading.Lock()
+        self.slow_requests = slow_requests
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.routes: Dict[str, dict] = {}
+            self._slowest: List[tuple] = []  # min-heap of (total_ms, seq, request dict)
+            self._seq = 0
+
+    def record(self, route: str, profile: dict):
+        with self._lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = {
+                    'route': route,
+                    'requests': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'db_ms': 0.0,
+                    'queries': 0,
+                    'max_queries': 0,
+                    'template_ms': 0.0,
+                    'duplicate_queries': 0
+                }
+            stats['requests'] += 1
+            stats['total_ms'] += profile['total_ms']
+            stats['max_ms'] = max(stats['max_ms'], profile['total_ms'])
+            stats['db_ms'] += profile['db_ms']
+            stats['queries'] += profile['queries']
+            stats['max_queries'] = max(stats['max_queries'], profile['queries'])
+            stats['template_ms'] += profile['template_ms']
+            stats['duplicate_queries'] += profile['duplicate_queries']
+
+            self._seq += 1
+            entry = (profile['total_ms'], self._seq, dict(profile, route=route))
+            if len(self._slowest) < self.slow_requests:
+                heapq.heappush(self._slowest, entry)
+            elif entry[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def report(self, limit: int = 20) -> dict:
+        """
+        Slowest routes by mean time and the slowest individual requests.
+
+        Returns:
+            dict: {'routes': [route dicts with averages], 'slowest_requests': [...]}
+        """
+        with self._lock:
+            routes = []
+            for stats in self.routes.values():
+                n = stats['requests']
+                routes.append(dict(
+                    stats,
+                    avg_ms=stats['total_ms'] / n,
+                    avg_db_ms=stats['db_ms'] / n,
+                    avg_queries=stats['queries'] / n,
+                    avg_template_ms=stats['template_ms'] / n
+                ))
+            slowest = [entry[2] for entry in sorted(self._slowest, reverse=True)]
+
+        routes.sort(key=lambda r: r['avg_ms'], reverse=True)
+        return {'routes': routes[:limit], 'slowest_requests': slowest[:limit]}
+
+
+route_stats = RouteStats()
+
+
+def _current_profile():
+    if has_request_context():
+        return g.get('_profile')
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile() is not None:
+        conn.info.setdefault('_profile_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile()
+    starts = conn.info.get('_profile_query_start')
+    if profile is None or not starts:
+        return
+    profile['db_seconds'] += time.perf_counter() - starts.pop()
+    profile['queries'] += 1
+    profile['statements'][statement] += 1
+
+
+def _before_render_template(app, template, context, **extra):
+    profile = _current_profile()
+    if profile is not None:
+        profile['template_starts'].append(time.perf_counter())
+
+
+def _template_rendered(app, template, context, **extra):
+    profile = _current_profile()
+    if profile is None or not profile['template_starts']:
+        return
+    started = profile['template_starts'].pop()
+    if not profile['template_starts']:
+        # Only outermost renders count; nested render_template calls are included
+        profile['template_seconds'] += time.perf_counter() - started
+
+
+def _start_profile():
+    g._profile = {
+        'started': time.perf_counter(),
+        'queries': 0,
+        'db_seconds': 0.0,
+        'statements': Counter(),
+        'template_starts': [],
+        'template_seconds': 0.0
+    }
+
+
+def summarize(profile: dict) -> dict:
+    """
+    Millisecond figures for a finished request profile.
+
+    Returns:
+        dict: {'total_ms', 'db_ms', 'queries', 'template_ms',
+               'duplicate_queries', 'duplicates': [{'statement', 'count'}]}
+    """
+    duplicates = [(stmt, n) for stmt, n in profile['statements'].most_common() if n > 1]
+    return {
+        'total_ms': (time.perf_counter() - profile['started']) * 1000,
+        'db_ms': profile['db_seconds'] * 1000,
+        'queries': profile['queries'],
+        'template_ms': profile['template_seconds'] * 1000,
+        # Executions beyond the first of each repeated statement
+        'duplicate_queries': sum(n - 1 for _, n in duplicates),
+        'duplicates': [
+            {'statement': stmt[:MAX_STATEMENT_LENGTH], 'count': n}
+            for stmt, n in duplicates[:MAX_DUPLICATES]
+        ]
+    }
+
+
+def server_timing(summary: dict) -> str:
+    """Server-Timing header value for a request summary."""
+    return ', '.join([
+        f"db;dur={summary['db_ms']:.1f};desc=\"{summary['queries']} queries, "
+        f"{summary['duplicate_queries']} repeated\"",
+        f"tpl;dur={summary['template_ms']:.1f};desc=\"templates\"",
+        f"app;dur={summary['total_ms']:.1f};desc=\"total\""
+    ])
+
+
+def _finish_profile(response):
+    profile = g.pop('_profile', None)
+    if profile is None:
+        return response
+
+    summary = summarize(profile)
+    if request.url_rule is not None:
+        route = f'{request.method} {request.url_rule.rule}'
+    else:
+        route = f'{request.method} <unmatched>'
+    route_stats.record(route, summary)
+    response.headers['Server-Timing'] = server_timing(summary)
+    return response
+
+
+def init_request_profiling(app, engine) -> bool:
+    """
+    Register the profiling hooks when PROFILE_REQUESTS is set.
+
+    Call inside an app context after the engine is created.
+
+    Returns:
+        bool: whether profiling was enabled
+    """
+    if not app.config.get('PROFILE_REQUESTS'):
+        return False
+
+    route_stats.slow_requests = app.config.get('PROFILE_SLOW_REQUESTS', 50)
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    before_render_template.connect(_before_render_template, app)
+    template_rendered.connect(_template_rendered, app)
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    return True
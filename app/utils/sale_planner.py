@@ -0,0 +1,227 @@
+"""
+Tax-minimizing share-sale planner.
+
+Given the user's vested lots, picks which shares to sell to raise a cash target
+at the lowest estimated tax.
+
+Every lot sells at the same market price, so the fewest shares that meet the
+target is fixed: N = ceil(target / price). What remains is choosing which N
+shares to sell:
+
+1. Within each holding class (short-term / long-term) the cheapest shares to
+   sell are always the ones with the smallest gain per share, so each class is
+   sorted once and consumed greedily.
+2. The only real decision is the split k short-term + (N - k) long-term shares.
+   Estimated tax is convex in k (sorted gains stacked onto convex progressive
+   brackets), so the best split is found by binary search on the discrete
+   slope instead of trying every combination.
+
+Total cost is O(L log L) for L lots plus O(log N) tax evaluations, which keeps
+portfolios with thousands of lots well inside the request latency budget. An
+optional deadline caps the search anyway: callers start it when the request
+starts, so time spent loading lots counts too. Once it passes, the cheapest
+split evaluated so far is returned with ``truncated`` set.
+"""
+
+import math
+import time
+from bisect import bisect_left
+from datetime import date
+from typing import Callable, List, Optional
+
+from app.models.grant import ShareType
+
+# Holding period (days) treated as long-term, matching finance_deep_dive
+LONG_TERM_DAYS = 365
+
+# Flat rates used when the user has no tax profile (same as finance_deep_dive)
+DEFAULT_TAX_RATES = {'federal': 0.24, 'state': 0.093, 'ltcg': 0.15}
+
+TaxFunction = Callable[[float, float], float]
+
+
+def collect_sale_lots(vest_events, today: Optional[date] = None) -> List[dict]:
+    """
+    Build sellable lots from vest events.
+
+    Only vested stock lots (RSU/ESPP) are sellable: cash bonuses have no shares
+    and ISOs are options that must be exercised first. Shares are whole shares
+    actually received after tax withholding.
+    """
+    today = today or date.today()
+    lots = []
+    for ve in vest_events:
+        if ve.vest_date > today:
+            continue
+        if ve.grant.share_type in (ShareType.CASH.value, ShareType.ISO_5Y.value, ShareType.ISO_6Y.value):
+            continue
+
+        shares = int(math.floor(ve.shares_received + 1e-9))
+        if shares <= 0:
+            continue
+
+        days_held = (today - ve.vest_date).days
+        lots.append({
+            'vest_event_id': ve.id,
+            'grant_id': ve.grant_id,
+            'vest_date': ve.vest_date,
+            'shares': shares,
+            'cost_basis_per_share': ve.share_price_at_vest,
+            'days_held': days_held,
+            'is_long_term': days_held >= LONG_TERM_DAYS
+        })
+    return lots
+
+
+def build_tax_function(tax_profile=None, tax_year: int = 2025) -> TaxFunction:
+    """
+    Return f(short_term_gain, long_term_gain) -> estimated incremental tax.
+
+    With automatic rates and a known income, gains are stacked on top of the
+    profile's annual income using the progressive brackets: short-term gains in
+    the federal ordinary schedule, long-term gains in the federal LTCG schedule
+    and both in the state ordinary schedule. Otherwise the profile's flat
+    (manual or default) rates are applied.
+    """
+    if tax_profile is not None and not tax_profile.use_manual_rates and tax_profile.annual_income:
+        from app.utils.tax_tables import get_bracket_table
+
+        income = tax_profile.annual_income
+        status = tax_profile.filing_status
+        federal = get_bracket_table('federal', tax_year, status, 'ordinary')
+        ltcg = get_bracket_table('federal', tax_year, status, 'capital_gains_long')
+        state = get_bracket_table(tax_profile.state, tax_year, status, 'ordinary') if tax_profile.state else None
+
+        if federal and ltcg:
+            federal_base = federal.tax(income)
+            ltcg_base = ltcg.tax(income)
+            state_base = state.tax(income) if state else 0.0
+
+            def progressive_tax(short_term_gain: float, long_term_gain: float) -> float:
+                tax = federal.tax(income + short_term_gain) - federal_base
+                tax += ltcg.tax(income + long_term_gain) - ltcg_base
+                if state:
+                    tax += state.tax(income + short_term_gain + long_term_gain) - state_base
+                return tax
+
+            return progressive_tax
+
+    rates = tax_profile.get_tax_rates(tax_year) if tax_profile is not None else DEFAULT_TAX_RATES
+    short_term_rate = rates['federal'] + rates['state']
+    long_term_rate = rates['ltcg'] + rates['state']
+
+    def flat_tax(short_term_gain: float, long_term_gain: float) -> float:
+        return short_term_gain * short_term_rate + long_term_gain * long_term_rate
+
+    return flat_tax
+
+
+class _HoldingClass:
+    """Lots of one holding class sorted by gain per share, with prefix sums."""
+
+    def __init__(self, lots: List[dict], price: float):
+        self.lots = sorted(lots, key=lambda lot: price - lot['cost_basis_per_share'])
+        self.gains = [price - lot['cost_basis_per_share'] for lot in self.lots]
+        self.cum_shares = [0]
+        self.cum_gain = [0.0]
+        for lot, gain in zip(self.lots, self.gains):
+            self.cum_shares.append(self.cum_shares[-1] + lot['shares'])
+            self.cum_gain.append(self.cum_gain[-1] + gain * lot['shares'])
+
+    @property
+    def total_shares(self) -> int:
+        return self.cum_shares[-1]
+
+    def gain_for(self, k: int) -> float:
+        """Total gain from selling the k lowest-gain shares."""
+        if k <= 0:
+            return 0.0
+        i = bisect_left(self.cum_shares, k) - 1
+        return self.cum_gain[i] + (k - self.cum_shares[i]) * self.gains[i]
+
+    def take(self, k: int) -> List[dict]:
+        """Per-lot allocation for selling the k lowest-gain shares."""
+        picks = []
+        for lot, gain in zip(self.lots, self.gains):
+            if k <= 0:
+                break
+            shares = min(k, lot['shares'])
+            picks.append({**lot, 'shares_to_sell': shares, 'gain': gain * shares})
+            k -= shares
+        return picks
+
+
+def plan_sale(lots: List[dict], target_cash: float, price: float, tax_fn: TaxFunction,
+              deadline: Optional[float] = None) -> dict:
+    """
+    Choose shares to sell so gross proceeds reach ``target_cash`` with minimal tax.
+
+    Args:
+        lots: Sellable lots from collect_sale_lots()
+        target_cash: Gross proceeds required (USD)
+        price: Sale price per share
+        tax_fn: Incremental tax function from build_tax_function()
+        deadline: time.perf_counter() value after which the split search
+            stops (None = unlimited)
+
+    Returns:
+        dict describing the chosen lots, proceeds, gains and estimated tax. If
+        the lots cannot cover the target, every share is sold and
+        ``shortfall`` reports the remaining amount. ``truncated`` is True when
+        the deadline passed and the plan is the best split found until then.
+    """
+    if price <= 0:
+        raise ValueError('A positive share price is required')
+    if target_cash <= 0:
+        raise ValueError('Target cash must be positive')
+
+    short_term = _HoldingClass([lot for lot in lots if not lot['is_long_term']], price)
+    long_term = _HoldingClass([lot for lot in lots if lot['is_long_term']], price)
+    available = short_term.total_shares + long_term.total_shares
+
+    shares_needed = min(math.ceil(target_cash / price - 1e-9), available)
+
+    best = [math.inf, 0]  # [tax, k] of the cheapest split evaluated
+
+    def total_tax(k: int) -> float:
+        tax = tax_fn(short_term.gain_for(k), long_term.gain_for(shares_needed - k))
+        if tax < best[0]:
+            best[:] = [tax, k]
+        return tax
+
+    # Feasible short-term share counts; tax is convex in k, so binary search
+    # for the first k where selling one more short-term share stops helping.
+    lo = max(0, shares_needed - long_term.total_shares)
+    hi = min(shares_needed, short_term.total_shares)
+    total_tax(lo)
+    truncated = False
+    while lo < hi:
+        if deadline is not None and time.perf_counter() > deadline:
+            truncated = True
+            break
+        mid = (lo + hi) // 2
+        if total_tax(mid + 1) - total_tax(mid) >= 0:
+            hi = mid
+        else:
+            lo = mid + 1
+    k = best[1] if truncated else lo
+
+    picks = short_term.take(k) + long_term.take(shares_needed - k)
+    short_term_gain = short_term.gain_for(k)
+    long_term_gain = long_term.gain_for(shares_needed - k)
+    estimated_tax = tax_fn(short_term_gain, long_term_gain) if shares_needed else 0.0
+    gross_proceeds = shares_needed * price
+
+    return {
+        'price': price,
+        'target_cash': target_cash,
+        'shares_to_sell': shares_needed,
+        'gross_proceeds': gross_proceeds,
+        'short_term_gain': short_term_gain,
+        'long_term_gain': long_term_gain,
+        'estimated_tax': estimated_tax,
+        'net_proceeds': gross_proceeds - estimated_tax,
+        'shortfall': max(target_cash - gross_proceeds, 0.0),
+        'truncated': truncated,
+        'lots': sorted(picks, key=lambda pick: pick['vest_date'])
+    }
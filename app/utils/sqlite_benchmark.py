@@ -0,0 +1,157 @@
+"""
+Reader/writer concurrency benchmark for the SQLite connection profiles.
+
+Simulates gunicorn workers sharing one database file: reader processes run
+the per-user vest schedule query in a loop while writer processes insert vest
+events in small transactions. The same workload is run with the default
+rollback journal and with the concurrent profile (WAL + pragmas), and
+throughput for both is printed side by side.
+
+    python -m app.utils.sqlite_benchmark [--readers 4] [--writers 1] [--seconds 5]
+
+Uses a throwaway database in a temp directory; the app database is untouched.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+from app.utils.sqlite_tuning import apply_pragmas, concurrent_pragmas
+
+USERS = 50
+EVENTS_PER_USER = 200
+
+SCHEMA = """
+CREATE TABLE vest_events (
+    id INTEGER PRIMARY KEY,
+    grant_id INTEGER NOT NULL,
+    user_id INTEGER,
+    vest_date DATE NOT NULL,
+    shares_vested FLOAT NOT NULL,
+    share_price_at_vest FLOAT
+);
+CREATE INDEX ix_vest_events_user_id_vest_date ON vest_events (user_id, vest_date);
+"""
+
+READ_QUERY = 'SELECT * FROM vest_events WHERE user_id = ? ORDER BY vest_date'
+WRITE_QUERY = ('INSERT INTO vest_events (grant_id, user_id, vest_date, shares_vested, share_price_at_vest) '
+               'VALUES (?, ?, ?, ?, ?)')
+
+
+def _connect(path: str, profile: str) -> sqlite3.Connection:
+    # timeout=5 matches pysqlite's default under SQLAlchemy
+    conn = sqlite3.connect(path, timeout=5)
+    if profile == 'concurrent':
+        apply_pragmas(conn, concurrent_pragmas())
+    return conn
+
+
+def _seed(path: str, profile: str) -> None:
+    conn = _connect(path, profile)
+    conn.executescript(SCHEMA)
+    start = date(2020, 1, 1)
+    rows = [
+        (user_id, user_id, (start + timedelta(days=30 * i)).isoformat(), 100.0, 10.0)
+        for user_id in range(1, USERS + 1)
+        for i in range(EVENTS_PER_USER)
+    ]
+    conn.executemany(WRITE_QUERY, rows)
+    conn.commit()
+    conn.close()
+
+
+def _reader(path, profile, deadline, results):
+    conn = _connect(path, profile)
+    rng = random.Random(os.getpid())
+    count = errors = 0
+    while time.time() < deadline:
+        try:
+            conn.execute(READ_QUERY, (rng.randint(1, USERS),)).fetchall()
+            count += 1
+        except sqlite3.OperationalError:
+            errors += 1
+    conn.close()
+    results.put(('read', count, errors, []))
+
+
+def _writer(path, profile, deadline, results):
+    conn = _connect(path, profile)
+    rng = random.Random(os.getpid())
+    count = errors = 0
+    latencies = []
+    while time.time() < deadline:
+        user_id = rng.randint(1, USERS)
+        started = time.perf_counter()
+        try:
+            conn.execute(WRITE_QUERY, (user_id, user_id, date.today().isoformat(), 10.0, 10.0))
+            conn.commit()
+            count += 1
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError:
+            conn.rollback()
+            errors += 1
+    conn.close()
+    results.put(('write', count, errors, latencies))
+
+
+def run_benchmark(profile: str, readers: int = 4, writers: int = 1, seconds: float = 5.0) -> dict:
+    """
+    Run the mixed workload against a fresh database with ``profile``.
+
+    Returns:
+        dict: {'profile', 'reads_per_sec', 'writes_per_sec', 'read_errors',
+               'write_errors', 'write_p95_ms'}
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        _seed(path, profile)
+
+        results = multiprocessing.Queue()
+        deadline = time.time() + seconds
+        procs = [multiprocessing.Process(target=_reader, args=(path, profile, deadline, results))
+                 for _ in range(readers)]
+        procs += [multiprocessing.Process(target=_writer, args=(path, profile, deadline, results))
+                  for _ in range(writers)]
+        for proc in procs:
+            proc.start()
+        collected = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+
+    reads = sum(c for kind, c, _, _ in collected if kind == 'read')
+    writes = sum(c for kind, c, _, _ in collected if kind == 'write')
+    latencies = sorted(latency for kind, _, _, lats in collected if kind == 'write' for latency in lats)
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+
+    return {
+        'profile': profile,
+        'reads_per_sec': reads / seconds,
+        'writes_per_sec': writes / seconds,
+        'read_errors': sum(e for kind, _, e, _ in collected if kind == 'read'),
+        'write_errors': sum(e for kind, _, e, _ in collected if kind == 'write'),
+        'write_p95_ms': p95
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=1)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"\n{args.readers} readers, {args.writers} writers, {args.seconds:g}s per profile\n")
+    print(f"{'profile':<12} {'reads/s':>10} {'writes/s':>10} {'write p95':>11} {'errors':>8}")
+    for profile in ('default', 'concurrent'):
+        r = run_benchmark(profile, args.readers, args.writers, args.seconds)
+        print(f"{r['profile']:<12} {r['reads_per_sec']:>10.0f} {r['writes_per_sec']:>10.0f} "
+              f"{r['write_p95_ms']:>9.1f}ms {r['read_errors'] + r['write_errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Startup phase timing for create_app.
+
+Each phase of the application factory is timed; the report is kept in
+app.extensions['startup_timing'] and printed to stderr when STARTUP_REPORT
+is set, which shows where worker boot time goes.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+class StartupTimer:
+    """Collects (phase, seconds) pairs in the order they ran."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> dict:
+        """
+        Returns:
+            dict: {'phases': [{'phase', 'seconds'}], 'total_seconds'}
+        """
+        return {
+            'phases': [{'phase': name, 'seconds': seconds} for name, seconds in self.phases],
+            'total_seconds': self.total
+        }
+
+    def report(self) -> str:
+        total = self.total
+        lines = ['Startup timing:']
+        for name, seconds in self.phases:
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f'  {name:<24} {seconds * 1000:8.1f} ms  {share:5.1f}%')
+        lines.append(f"  {'total':<24} {total * 1000:8.1f} ms")
+        return '\n'.join(lines)
+
+    def print_report(self) -> None:
+        print(self.report(), file=sys.stderr, flush=True)
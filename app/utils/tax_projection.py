@@ -0,0 +1,135 @@
+"""
+Multi-year ordinary-income tax projection.
+
+VestEvent.estimate_tax_withholding applies flat rates to each event on its
+own, which ignores that every vest in a calendar year stacks into the same
+taxable income. This engine buckets all past and future vests by tax year in
+a single pass, applies the progressive brackets to each year's total and
+spreads the year's tax back onto its events in proportion to their income.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional
+
+from app.models.grant import GrantType, ShareType
+from app.utils.tax_tables import get_bracket_table
+
+# Flat FICA rate, as used by VestEvent.estimate_tax_withholding
+FICA_RATE = 0.0765
+
+# Bracket year used when a projected year has no brackets loaded
+DEFAULT_TAX_YEAR = 2025
+
+
+def vest_income(vest_event, price: float) -> float:
+    """
+    Ordinary income recognised at vest, valued at ``price`` per share.
+
+    Mirrors VestEvent.estimate_tax_withholding: cash bonuses are their USD
+    amount, ISOs the spread over strike, ESPP the discount and RSUs the full
+    share value.
+    """
+    grant = vest_event.grant
+    if grant.share_type == ShareType.CASH.value:
+        return vest_event.shares_vested
+    if grant.share_type in (ShareType.ISO_5Y.value, ShareType.ISO_6Y.value):
+        spread = price - grant.share_price_at_grant
+        return vest_event.shares_vested * spread if spread > 0 else 0.0
+    if grant.grant_type == GrantType.ESPP.value and grant.espp_discount:
+        return vest_event.shares_vested * price * grant.espp_discount
+    return vest_event.shares_vested * price
+
+
+def _year_tables(year: int, filing_status: str, state: Optional[str]):
+    """Federal and state ordinary tables for ``year``, falling back to DEFAULT_TAX_YEAR."""
+    federal = get_bracket_table('federal', year, filing_status, 'ordinary')
+    if federal is None and year != DEFAULT_TAX_YEAR:
+        return _year_tables(DEFAULT_TAX_YEAR, filing_status, state)
+    state_table = get_bracket_table(state, year, filing_status, 'ordinary') if state else None
+    return federal, state_table
+
+
+def project_taxes(vest_events, tax_profile=None, latest_price: float = 0.0,
+                  price_at=None, today: Optional[date] = None) -> dict:
+    """
+    Project ordinary-income tax on vests, grouped by calendar year.
+
+    Args:
+        vest_events: All of the user's VestEvents (any order)
+        tax_profile: The user's UserTaxProfile, or None for default flat rates
+        latest_price: Price used for vests that have not happened yet
+        price_at: Callable(date) -> price for past vests (defaults to the vest's
+            share_price_at_vest)
+        today: Date separating past from future vests
+
+    Returns:
+        dict: {'years': [per-year totals, ascending],
+               'events': {vest_event_id: {'year', 'income', 'tax', 'is_estimated'}}}
+    """
+    today = today or date.today()
+
+    # Single pass: income per event, bucketed by year
+    buckets: Dict[int, List[tuple]] = {}
+    for ve in vest_events:
+        if ve.vest_date <= today:
+            price = price_at(ve.vest_date) if price_at else ve.share_price_at_vest
+        else:
+            price = latest_price
+        income = vest_income(ve, price or 0.0)
+        buckets.setdefault(ve.vest_date.year, []).append((ve, income))
+
+    progressive = (tax_profile is not None and not tax_profile.use_manual_rates
+                   and tax_profile.annual_income)
+    if progressive:
+        base_income = tax_profile.annual_income
+        filing_status = tax_profile.filing_status or 'single'
+        state = tax_profile.state
+    else:
+        base_income = tax_profile.annual_income if tax_profile and tax_profile.annual_income else 0.0
+        rates = tax_profile.get_tax_rates() if tax_profile is not None else {'federal': 0.22, 'state': 0.093}
+
+    years = []
+    events = {}
+    for year in sorted(buckets):
+        entries = buckets[year]
+        equity_income = sum(income for _, income in entries)
+
+        if progressive:
+            federal, state_table = _year_tables(year, filing_status, state)
+            total_income = base_income + equity_income
+            federal_tax = (federal.tax(total_income) - federal.tax(base_income)) if federal else 0.0
+            state_tax = (state_table.tax(total_income) - state_table.tax(base_income)) if state_table else 0.0
+            marginal_rate = ((federal.marginal_rate(total_income) if federal else 0.0)
+                             + (state_table.marginal_rate(total_income) if state_table else 0.0))
+        else:
+            federal_tax = equity_income * rates['federal']
+            state_tax = equity_income * rates['state']
+            marginal_rate = rates['federal'] + rates['state']
+
+        fica_tax = equity_income * FICA_RATE
+        total_tax = federal_tax + state_tax + fica_tax
+
+        years.append({
+            'year': year,
+            'event_count': len(entries),
+            'base_income': base_income,
+            'equity_income': equity_income,
+            'federal_tax': federal_tax,
+            'state_tax': state_tax,
+            'fica_tax': fica_tax,
+            'total_tax': total_tax,
+            'effective_rate': total_tax / equity_income if equity_income > 0 else 0.0,
+            'marginal_rate': marginal_rate + FICA_RATE
+        })
+
+        # Spread the year's tax back onto its events by share of income
+        for ve, income in entries:
+            share = income / equity_income if equity_income > 0 else 0.0
+            events[ve.id] = {
+                'year': year,
+                'income': income,
+                'tax': total_tax * share,
+                'is_estimated': ve.vest_date > today
+            }
+
+    return {'years': years, 'events': events}
@@ -0,0 +1,232 @@
+"""
+Compiled progressive tax-bracket tables.
+
+The brackets for one (jurisdiction, tax_year, filing_status, tax_type) are loaded
+once and compiled into parallel arrays of thresholds, rates and the cumulative
+tax owed at each threshold. Marginal rate, total tax and effective rate for any
+income then cost a single bisect instead of a filtered SQL query.
+
+Tables are cached per worker for a whole tax year and invalidated through the
+shared 'tax_brackets' version counter (see app.utils.cache).
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app import db
+from app.utils.cache import TAX_BRACKETS_VERSION, bump_version, get_version
+
+
+class BracketTable:
+    """A progressive tax schedule compiled for O(log n) evaluation."""
+
+    __slots__ = ('thresholds', 'rates', 'cumulative_tax')
+
+    def __init__(self, brackets: Iterable[Tuple[float, float]]):
+        """
+        Compile a schedule from (income_min, rate) pairs.
+
+        Args:
+            brackets: Bracket floors and rates, in any order. Brackets are
+                assumed contiguous (each bracket ends where the next begins).
+        """
+        ordered = sorted((float(floor), float(rate)) for floor, rate in brackets)
+        self.thresholds: List[float] = [floor for floor, _ in ordered]
+        self.rates: List[float] = [rate for _, rate in ordered]
+
+        # cumulative_tax[i] = tax owed on income exactly equal to thresholds[i]
+        self.cumulative_tax: List[float] = []
+        running = 0.0
+        for i, threshold in enumerate(self.thresholds):
+            if i:
+                running += (threshold - self.thresholds[i - 1]) * self.rates[i - 1]
+            self.cumulative_tax.append(running)
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+    def __repr__(self) -> str:
+        return f'<BracketTable {len(self)} brackets>'
+
+    def _marginal_index(self, income: float) -> int:
+        """Bracket index for the marginal rate (-1 if below the first floor).
+
+        An income sitting exactly on a threshold stays in the lower bracket,
+        matching the inclusive ``income_min <= x <= income_max`` lookup this
+        table replaces.
+        """
+        if not self.thresholds or income < self.thresholds[0]:
+            return -1
+        return max(bisect_left(self.thresholds, income) - 1, 0)
+
+    def marginal_rate(self, income: float) -> float:
+        """Rate applied to the last dollar of ``income``."""
+        i = self._marginal_index(income)
+        return self.rates[i] if i >= 0 else 0.0
+
+    def tax(self, income: float) -> float:
+        """Total progressive tax owed on ``income``."""
+        i = bisect_right(self.thresholds, income) - 1
+        if i < 0:
+            return 0.0
+        return self.cumulative_tax[i] + (income - self.thresholds[i]) * self.rates[i]
+
+    def effective_rate(self, income: float) -> float:
+        """Total tax divided by income (0.0 for non-positive income)."""
+        if income <= 0:
+            return 0.0
+        return self.tax(income) / income
+
+    def evaluate(self, income: float) -> dict:
+        """
+        Evaluate the schedule for one income.
+
+        Returns:
+            dict: {'marginal_rate': float, 'tax': float, 'effective_rate': float}
+        """
+        tax = self.tax(income)
+        return {
+            'marginal_rate': self.marginal_rate(income),
+            'tax': tax,
+            'effective_rate': tax / income if income > 0 else 0.0
+        }
+
+    # Vectorized evaluation -------------------------------------------------
+
+    def _sweep(self, incomes: Sequence[float]) -> List[int]:
+        """
+        Map each income to its bracket index (bisect_right semantics) with one
+        merge-style pass over the sorted incomes: O(n log n + m) overall.
+        """
+        order = sorted(range(len(incomes)), key=incomes.__getitem__)
+        indices = [-1] * len(incomes)
+        thresholds = self.thresholds
+        last = len(thresholds) - 1
+        bracket = -1
+        for pos in order:
+            income = incomes[pos]
+            while bracket < last and thresholds[bracket + 1] <= income:
+                bracket += 1
+            indices[pos] = bracket
+        return indices
+
+    def tax_many(self, incomes: Sequence[float]) -> List[float]:
+        """Total tax for every income in ``incomes`` (same order)."""
+        result = []
+        for income, i in zip(incomes, self._sweep(incomes)):
+            if i < 0:
+                result.append(0.0)
+            else:
+                result.append(self.cumulative_tax[i] + (income - self.thresholds[i]) * self.rates[i])
+        return result
+
+    def marginal_rates(self, incomes: Sequence[float]) -> List[float]:
+        """Marginal rate for every income in ``incomes`` (same order)."""
+        result = []
+        for income, i in zip(incomes, self._sweep(incomes)):
+            # Step back onto the lower bracket for incomes sitting on a threshold
+            if i > 0 and self.thresholds[i] == income:
+                i -= 1
+            result.append(self.rates[i] if i >= 0 else 0.0)
+        return result
+
+    def effective_rates(self, incomes: Sequence[float]) -> List[float]:
+        """Effective rate for every income in ``incomes`` (same order)."""
+        return [
+            tax / income if income > 0 else 0.0
+            for income, tax in zip(incomes, self.tax_many(incomes))
+        ]
+
+
+# Per tax year: {'version': int, 'tables': {(jurisdiction, filing_status, tax_type): BracketTable},
+#                'jurisdictions': [str, ...]}
+_years: Dict[int, dict] = {}
+
+
+def _load_year(tax_year: int) -> dict:
+    """Return every compiled table for a tax year, reloading if the data changed."""
+    version = get_version(TAX_BRACKETS_VERSION)
+    cached = _years.get(tax_year)
+    if cached is not None and cached['version'] == version:
+        return cached
+
+    from app.models.tax_rate import TaxBracket
+
+    rows = db.session.query(
+        TaxBracket.jurisdiction,
+        TaxBracket.filing_status,
+        TaxBracket.tax_type,
+        TaxBracket.income_min,
+        TaxBracket.rate
+    ).filter(TaxBracket.tax_year == tax_year).all()
+
+    grouped: Dict[Tuple[str, str, str], List[Tuple[float, float]]] = {}
+    for jurisdiction, filing_status, tax_type, income_min, rate in rows:
+        grouped.setdefault((jurisdiction, filing_status, tax_type), []).append((income_min, rate))
+
+    entry = {
+        'version': version,
+        'tables': {key: BracketTable(brackets) for key, brackets in grouped.items()},
+        'jurisdictions': sorted({key[0] for key in grouped})
+    }
+    _years[tax_year] = entry
+    return entry
+
+
+def get_bracket_table(jurisdiction: str, tax_year: int, filing_status: str,
+                      tax_type: str) -> Optional[BracketTable]:
+    """
+    Return the compiled table for a schedule.
+
+    The whole tax year is loaded in one query on first use and kept in memory
+    until invalidate_bracket_tables() is called (in any worker).
+
+    Returns:
+        BracketTable, or None if no brackets exist for the key.
+    """
+    return _load_year(tax_year)['tables'].get((jurisdiction, filing_status, tax_type))
+
+
+def get_available_states(tax_year: int) -> List[str]:
+    """Sorted state jurisdictions that have brackets for ``tax_year``."""
+    return [j for j in _load_year(tax_year)['jurisdictions'] if j != 'federal']
+
+
+def invalidate_bracket_tables() -> None:
+    """Drop compiled tables in every worker after tax_brackets has changed."""
+    _years.clear()
+    bump_version(TAX_BRACKETS_VERSION)
+
+
+def preview_rates(items: Iterable[Tuple[Optional[str], str, float]],
+                  tax_year: int = 2025) -> List[dict]:
+    """
+    Calculate automatic tax rates for many (state, filing_status, income) tuples.
+
+    Incomes sharing a (state, filing_status) are evaluated together with the
+    vectorized table helpers, so a large batch costs one sweep per schedule.
+
+    Returns:
+        list: {'federal': float, 'state': float, 'ltcg': float} per item, in order
+    """
+    items = list(items)
+    results: List[dict] = [{'federal': 0.0, 'state': 0.0, 'ltcg': 0.0} for _ in items]
+
+    groups: Dict[Tuple[Optional[str], str], List[int]] = {}
+    for pos, (state, filing_status, _) in enumerate(items):
+        groups.setdefault((state, filing_status), []).append(pos)
+
+    for (state, filing_status), positions in groups.items():
+        incomes = [items[pos][2] for pos in positions]
+        schedules = [('federal', 'federal', 'ordinary'), ('ltcg', 'federal', 'capital_gains_long')]
+        if state:
+            schedules.append(('state', state, 'ordinary'))
+
+        for field, jurisdiction, tax_type in schedules:
+            table = get_bracket_table(jurisdiction, tax_year, filing_status, tax_type)
+            if table is None:
+                continue
+            for pos, rate in zip(positions, table.marginal_rates(incomes)):
+                results[pos][field] = rate
+
+    return results
@@ -0,0 +1,73 @@
+"""
+Cached user loader for Flask-Login.
+
+Flask-Login loads the user on every authenticated request. Instead of a
+users-table query each time, each worker keeps the hot fields (id,
+username, admin flag, ...) for USER_CACHE_TTL seconds. The loader returns a
+CachedUser built from them.
+
+Entries are stamped with the user's account version from app.utils.cache.
+Model events bump it on every commit that touches the user's row: password
+change, lockout, failed login, admin toggle. Every worker therefore reloads
+on its next request after such a change, and the TTL bounds staleness for
+changes made outside the ORM.
+
+Attributes outside HOT_FIELDS (and methods such as get_decrypted_user_key)
+load the full User row, at most once per request.
+"""
+
+import time
+from typing import Optional
+
+from flask_login import UserMixin
+
+from app import db
+from app.utils.cache import VersionedCache, get_account_version
+
+HOT_FIELDS = ('id', 'username', 'email', 'is_admin', 'email_verified', 'is_locked')
+
+user_cache = VersionedCache('users', 10000)
+
+
+class CachedUser(UserMixin):
+    """Read-only view of a user's hot fields; other attributes come from the User row."""
+
+    def __init__(self, fields: dict):
+        self.__dict__.update(fields)
+
+    def _load(self):
+        user = self.__dict__.get('_user')
+        if user is None:
+            from app.models.user import User
+            user = self.__dict__['_user'] = db.session.get(User, self.id)
+        return user
+
+    def __getattr__(self, name):
+        # Only called for attributes that aren't hot fields
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __repr__(self) -> str:
+        return f'<User {self.username}>'
+
+
+def _load_fields(user_id: int) -> Optional[dict]:
+    from app.models.user import User
+
+    row = db.session.execute(
+        db.select(*(getattr(User, name) for name in HOT_FIELDS)).where(User.id == user_id)
+    ).first()
+    return dict(zip(HOT_FIELDS, row)) if row else None
+
+
+def load_cached_user(user_id: int, ttl: float) -> Optional[CachedUser]:
+    """The user for a session's user id, from the per-worker cache when fresh."""
+    stamp = get_account_version(user_id)
+    entry = user_cache.get(user_id, stamp)
+    now = time.monotonic()
+    if entry is None or now - entry[0] > ttl:
+        entry = (now, _load_fields(user_id))
+        user_cache.set(user_id, stamp, entry)
+    fields = entry[1]
+    return CachedUser(fields) if fields else None
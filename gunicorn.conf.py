@@ -0,0 +1,18 @@
+"""
+Gunicorn settings (read automatically from the working directory).
+
+The app is imported once in the master (preload_app) and workers fork from
+it, so a recycled worker starts in milliseconds instead of re-running
+create_app. Run `flask --app main bootstrap` once per deploy and set
+BOOTSTRAP_ON_STARTUP=False so the master does no schema work either.
+"""
+
+import os
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# Recycle workers to bound memory growth; cheap with preload
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+"""
+Test script to verify assets from earlier builds stay resolvable after a rebuild.
+"""
+
+from app.utils.assets import AssetManifest, build_assets
+
+
+def test_previous_build_still_resolves(tmp_path):
+    static, build = tmp_path / 'static', tmp_path / 'dist'
+    (static / 'js').mkdir(parents=True)
+    source = static / 'js' / 'app.js'
+
+    source.write_text('console.log(1);\n')
+    old = build_assets(str(static), str(build))['js/app.js']['file']
+    source.write_text('console.log(2);\n')
+    new = build_assets(str(static), str(build))['js/app.js']['file']
+
+    manifest = AssetManifest(str(static), str(build))
+    assert old != new
+    assert manifest.lookup('js/app.js') == new
+    assert manifest.resolve(new) == str(build / new)
+    assert manifest.resolve(old) == str(build / old)
+    assert manifest.resolve('history.json') is None
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Test script to verify audit event search finds pre-login security events by username.
+"""
+
+import json
+import logging
+
+from flask import Flask
+from flask_login import LoginManager
+
+from app.utils.audit_log import AuditLogger
+from app.utils.audit_store import AuditStoreHandler, search_events
+
+
+def make_record(message):
+    return logging.LogRecord('security', logging.WARNING, __file__, 0, message, None, None)
+
+
+def test_username_search_includes_auth_failures(tmp_path):
+    app = Flask(__name__)
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: None)
+    path = str(tmp_path / 'audit.db')
+
+    # Failed logins are logged anonymously: no user_id, only the username tried
+    with app.test_request_context('/auth/login', method='POST'):
+        failure = AuditLogger._format_log('AUTH_FAILURE', {'username': 'alice', 'reason': 'invalid_credentials'})
+        other = AuditLogger._format_log('AUTH_FAILURE', {'username': 'bob', 'reason': 'invalid_credentials'})
+    update = json.dumps({'event_type': 'GRANT_UPDATED', 'user_id': 7, 'username': 'alice'})
+
+    handler = AuditStoreHandler(path)
+    handler.emit_batch([make_record(failure), make_record(other), make_record(update)])
+    handler.close()
+
+    assert json.loads(failure)['user_id'] is None
+    page = search_events(path, user_id=7, username='alice')
+    assert [e['event_type'] for e in page['events']] == ['GRANT_UPDATED', 'AUTH_FAILURE']
+
+    # A username with no account still finds the attempts against it
+    page = search_events(path, username='bob')
+    assert [(e['event_type'], e['username']) for e in page['events']] == [('AUTH_FAILURE', 'bob')]
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Test script to verify the password hashing pool rejects work it can't admit.
+"""
+
+import fcntl
+import threading
+
+import pytest
+
+from app.utils.hashing import HashingOverloaded, HashingPool
+
+
+def test_rejects_when_queue_full():
+    pool = HashingPool(max_concurrency=1, queue_depth=0, timeout=5)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash():
+        started.set()
+        release.wait(5)
+        return 'hashed'
+
+    results = []
+    worker = threading.Thread(target=lambda: results.append(pool.run('hash', slow_hash)))
+    worker.start()
+    assert started.wait(5)
+    try:
+        with pytest.raises(HashingOverloaded) as excinfo:
+            pool.run('hash', lambda: 'second')
+        assert excinfo.value.reason == 'queue full'
+        assert excinfo.value.retry_after > 0
+    finally:
+        release.set()
+        worker.join(5)
+    assert results == ['hashed']
+    assert pool.run('hash', lambda: 'after') == 'after'
+
+
+def test_rejects_when_no_global_slot(tmp_path):
+    pool = HashingPool(max_concurrency=2, queue_depth=2, timeout=0.1,
+                       global_slots=1, slot_dir=str(tmp_path))
+
+    # Another worker holds the only slot
+    with open(tmp_path / 'slot-0.lock', 'w') as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        with pytest.raises(HashingOverloaded) as excinfo:
+            pool.run('check', lambda: True)
+        assert excinfo.value.reason == 'no free slot'
+
+    assert pool.run('check', lambda: True) is True
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Test script to verify the token-bucket rate limiter and the rate_limit_user decorator.
+"""
+
+from flask import Flask
+from flask_login import LoginManager
+
+from app.utils.decorators import rate_limit_user
+from app.utils.rate_limit import BucketStore, parse_limit
+
+
+def make_app(db_path):
+    app = Flask(__name__)
+    app.config.update(RATELIMIT_ENABLED=True, RATELIMIT_DB_PATH=str(db_path),
+                      RATELIMIT_HEADERS_ENABLED=True, METRICS_ENABLED=False)
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: None)
+
+    @app.route('/expensive')
+    @rate_limit_user('2 per minute')
+    def expensive():
+        return 'ok'
+
+    return app
+
+
+def test_parse_limit():
+    limit = parse_limit('10 per minute')
+    assert (limit.capacity, limit.period) == (10, 60)
+    assert parse_limit('5/second').refill_rate == 5.0
+
+
+def test_bucket_refills_over_time(tmp_path):
+    store = BucketStore(str(tmp_path / 'buckets.db'))
+    limit = parse_limit('2 per minute')  # one token every 30 s
+
+    assert store.take('k', limit, now=1000.0).allowed
+    assert store.take('k', limit, now=1000.0).allowed
+    denied = store.take('k', limit, now=1000.0)
+    assert not denied.allowed
+    assert denied.retry_after == 31
+
+    assert not store.take('k', limit, now=1029.0).allowed
+    refilled = store.take('k', limit, now=1031.0)
+    assert refilled.allowed and refilled.remaining == 0
+
+
+def test_decorator_returns_429_with_retry_after(tmp_path):
+    client = make_app(tmp_path / 'buckets.db').test_client()
+
+    first = client.get('/expensive')
+    assert first.status_code == 200
+    assert first.headers['X-RateLimit-Remaining'] == '1'
+    assert client.get('/expensive').status_code == 200
+
+    limited = client.get('/expensive')
+    assert limited.status_code == 429
+    assert 1 <= int(limited.headers['Retry-After']) <= 31
+
+    # A different client IP has its own bucket
+    other = client.get('/expensive', environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert other.status_code == 200
+
+
+def test_store_failure_fails_open(tmp_path):
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    client = make_app(blocker / 'buckets.db').test_client()
+
+    for _ in range(5):
+        assert client.get('/expensive').status_code == 200
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Test script to verify the share-sale planner picks the cheapest lots to sell.
+"""
+
+import time
+from datetime import date
+from app.utils.sale_planner import plan_sale
+
+
+def make_lot(event_id, shares, cost_basis, is_long_term):
+    return {
+        'vest_event_id': event_id,
+        'grant_id': 1,
+        'vest_date': date(2023, 5, 15),
+        'shares': shares,
+        'cost_basis_per_share': cost_basis,
+        'days_held': 400 if is_long_term else 100,
+        'is_long_term': is_long_term
+    }
+
+
+def flat_tax(short_term_gain, long_term_gain):
+    return short_term_gain * 0.40 + long_term_gain * 0.25
+
+
+def test_prefers_lowest_tax_lots():
+    """High-basis short-term shares beat low-basis long-term shares here."""
+    lots = [
+        make_lot(1, 10, 20.0, True),    # $80 gain/share at 25% -> $20 tax/share
+        make_lot(2, 10, 95.0, False),   # $5 gain/share at 40% -> $2 tax/share
+        make_lot(3, 10, 60.0, True),    # $40 gain/share at 25% -> $10 tax/share
+    ]
+    plan = plan_sale(lots, 1500, 100.0, flat_tax)
+
+    assert plan['shares_to_sell'] == 15
+    assert plan['shortfall'] == 0.0
+    sold = {lot['vest_event_id']: lot['shares_to_sell'] for lot in plan['lots']}
+    assert sold == {2: 10, 3: 5}
+    assert abs(plan['estimated_tax'] - (10 * 2 + 5 * 10)) < 1e-9
+
+
+def test_shortfall_sells_everything():
+    """A target above the portfolio value sells every share and reports the gap."""
+    lots = [make_lot(1, 3, 50.0, False), make_lot(2, 2, 50.0, True)]
+    plan = plan_sale(lots, 1000, 100.0, flat_tax)
+
+    assert plan['shares_to_sell'] == 5
+    assert plan['shortfall'] == 500.0
+
+
+def test_deadline_returns_best_plan_so_far():
+    """A passed deadline still returns a complete plan, flagged as truncated."""
+    lots = [make_lot(i, 10, 20.0 + i, i % 2 == 0) for i in range(1, 200)]
+    full = plan_sale(lots, 50000, 100.0, flat_tax)
+    capped = plan_sale(lots, 50000, 100.0, flat_tax, deadline=time.perf_counter())
+
+    assert not full['truncated']
+    assert capped['truncated']
+    assert capped['shares_to_sell'] == full['shares_to_sell'] == 500
+    assert sum(lot['shares_to_sell'] for lot in capped['lots']) == 500
+    assert capped['estimated_tax'] >= full['estimated_tax']
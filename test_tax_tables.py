@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""
+Test script to verify compiled tax-bracket tables match hand-computed taxes.
+Uses the 2025 federal single ordinary-income brackets from populate_tax_brackets.
+"""
+
+from app.utils.tax_tables import BracketTable
+
+FEDERAL_SINGLE_2025 = [
+    (0, 0.10),
+    (11600, 0.12),
+    (47150, 0.22),
+    (100525, 0.24),
+    (191950, 0.32),
+    (243725, 0.35),
+    (609350, 0.37),
+]
+
+
+def test_progressive_tax():
+    """Total tax accumulates each bracket up to the income."""
+    table = BracketTable(FEDERAL_SINGLE_2025)
+
+    assert table.tax(0) == 0.0
+    assert abs(table.tax(11600) - 1160.0) < 0.01
+    # 1160 + (47150 - 11600) * 0.12 + (60000 - 47150) * 0.22
+    assert abs(table.tax(60000) - 8253.0) < 0.01
+    assert abs(table.effective_rate(60000) - 8253.0 / 60000) < 1e-9
+
+
+def test_marginal_rate_boundaries():
+    """Incomes on a threshold stay in the lower bracket, like the old SQL lookup."""
+    table = BracketTable(FEDERAL_SINGLE_2025)
+
+    assert table.marginal_rate(0) == 0.10
+    assert table.marginal_rate(47150) == 0.12
+    assert table.marginal_rate(47151) == 0.22
+    assert table.marginal_rate(1_000_000) == 0.37
+
+
+def test_vectorized_matches_scalar():
+    """Batch evaluation returns the same values, in input order."""
+    table = BracketTable(reversed(FEDERAL_SINGLE_2025))
+    incomes = [250000, 0, 47150, 11600.5, 5_000_000, 100525, 75000]
+
+    assert table.tax_many(incomes) == [table.tax(i) for i in incomes]
+    assert table.marginal_rates(incomes) == [table.marginal_rate(i) for i in incomes]
+    assert table.effective_rates(incomes) == [table.effective_rate(i) for i in incomes]
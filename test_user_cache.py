@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Test script to verify cached session users are invalidated when their account row changes.
+"""
+
+import pytest
+from flask import Flask
+
+from app import db, load_user
+from app.models import User
+from app.models.user_price import UserPrice  # noqa: F401 (User.prices relationship)
+from app.utils.cache import get_account_version, register_model_events
+from app.utils.user_cache import CachedUser, user_cache
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'users.db'}",
+                      CACHE_VERSION_DIR=str(tmp_path / 'versions'), USER_CACHE_TTL=300)
+    db.init_app(app)
+    register_model_events()
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username='alice', email='alice@example.com', password_hash='x'))
+        db.session.commit()
+        user_cache.invalidate()
+        yield app
+        db.session.remove()
+
+
+def update_user(**fields):
+    user = User.query.filter_by(username='alice').one()
+    for name, value in fields.items():
+        setattr(user, name, value)
+    db.session.commit()
+    user_id = user.id
+    db.session.remove()  # next load starts from a fresh session, like a new request
+    return user_id
+
+
+@pytest.mark.parametrize('field', ['is_admin', 'is_locked'])
+def test_commit_bumps_account_version_and_reloads(app, field):
+    user_id = User.query.filter_by(username='alice').one().id
+    cached = load_user(str(user_id))
+    assert isinstance(cached, CachedUser) and getattr(cached, field) is False
+    version = get_account_version(user_id)
+
+    update_user(**{field: True})
+
+    assert get_account_version(user_id) > version
+    assert getattr(load_user(str(user_id)), field) is True
+
+
+def test_unrelated_fields_load_full_row(app):
+    user_id = update_user(totp_enabled=True)
+    cached = load_user(str(user_id))
+
+    assert 'totp_enabled' not in cached.__dict__
+    assert cached.totp_enabled is True  # not a hot field: read from the User row
+    assert cached.email == 'alice@example.com'
+    assert isinstance(cached.__dict__['_user'], User)